@@ -0,0 +1,38 @@
+"""
+Vincula los caballos importados antes del catálogo (caballos, jockeys,
+entrenadores y caballerizas) con sus entradas, en lotes por id.
+
+Se puede cortar y volver a correr: solo procesa los caballos sin
+catalog_horse_id. Usa la base configurada para la app (ver .env.sample).
+
+Uso:
+  python scripts/backfill_catalog.py
+  python scripts/backfill_catalog.py --batch-size 10000
+"""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from turf_backend.database.database import database
+from turf_backend.services.catalog import backfill_catalog
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+logger = logging.getLogger("backfill_catalog")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--batch-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    with database.get_session() as session:
+        linked = backfill_catalog(session, args.batch_size)
+    logger.info("%d caballos vinculados al catálogo", linked)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""
+Micro-benchmark del parseo de tablas de caballos de San Isidro.
+
+Compara el parseo fila por fila anterior (closure get_text por fila y re.search /
+re.match con el patrón inline) contra parse_horses_from_table, que arma un
+HorseRowDecoder por tabla con los patrones compilados a nivel de módulo.
+Importa turf_backend, así que necesita las mismas variables de entorno que la app
+(ver .env.sample).
+
+Uso:
+  python scripts/bench_horse_rows.py
+  python scripts/bench_horse_rows.py --rows 1000 100000 --repeat 5
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from turf_backend.services.san_isidro.scraper import (
+    HorseInfo,
+    parse_horses_from_table,
+)
+
+HEADER = [
+    "EJEMP",
+    "Caballo",
+    "Sexo",
+    "Kg",
+    "Stud",
+    "Jockey",
+    "Entrenador",
+    "Padre - Madre",
+    "Últimas",
+    "Edad",
+    "L.Cuida",
+]
+
+
+def synthetic_rows(count: int, seed: int = 1) -> list[list[str]]:
+    rnd = random.Random(seed)
+    return [HEADER] + [
+        [
+            str(i % 20 + 1),
+            f"CABALLO {i}",
+            rnd.choice("MH"),
+            f"{rnd.randint(52, 60)}.0",
+            f"STUD {i % 50}",
+            f"JOCKEY {i % 30} {rnd.randint(52, 60)}.5",
+            f"ENTRENADOR {i % 40}",
+            "PADRE - MADRE",
+            "1A 2S 3S",
+            str(rnd.randint(2, 7)),
+            "HIPSI",
+        ]
+        for i in range(count)
+    ]
+
+
+def legacy_parse(rows: list[list[str]]) -> list[HorseInfo]:
+    """Parseo anterior: closure por fila y patrones inline en el loop."""
+    col_map = {}
+    for i, h in enumerate(c.lower() for c in rows[0]):
+        for key, word in (
+            ("num", "ejemp"),
+            ("nombre", "caballo"),
+            ("sexo", "sexo"),
+            ("peso", "kg"),
+            ("stud", "stud"),
+            ("jockey", "jockey"),
+            ("entrenador", "entrenador"),
+            ("padre", "padre"),
+            ("ultimas", "últimas"),
+            ("edad", "edad"),
+            ("cuidado", "cuida"),
+        ):
+            if word in h:
+                col_map[key] = i
+                break
+
+    horses = []
+    for cells in rows[1:]:
+        if len(cells) < 3:
+            continue
+
+        def get_text(c):
+            return c
+
+        def col(key, cells=cells, get_text=get_text):
+            if key in col_map and col_map[key] < len(cells):
+                return get_text(cells[col_map[key]])
+            return ""
+
+        numero = col("num")
+        if not numero.isdigit():
+            continue
+        peso = 0.0
+        peso_match = re.search(r"([\d\.]+)", col("peso"))
+        if peso_match:
+            peso = float(peso_match.group(1))
+        jockey = col("jockey")
+        peso_jockey = 0.0
+        jmatch = re.match(r"(.+?)\s*([\d\.]+)\s*$", jockey)
+        if jmatch:
+            jockey = jmatch.group(1).strip()
+            peso_jockey = float(jmatch.group(2))
+        horses.append(
+            HorseInfo(
+                numero=numero,
+                nombre=col("nombre"),
+                sexo=col("sexo"),
+                peso=peso,
+                herraje="",
+                stud=col("stud"),
+                jockey=jockey,
+                peso_jockey=peso_jockey,
+                entrenador=col("entrenador"),
+                padre_madre=col("padre"),
+                ultimas=col("ultimas"),
+                edad=col("edad"),
+                cuidado=col("cuidado"),
+            )
+        )
+    return horses
+
+
+def best_of(func, rows: list[list[str]], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(rows)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for count in args.rows:
+        rows = synthetic_rows(count)
+        assert legacy_parse(rows) == parse_horses_from_table(rows)
+        old = best_of(legacy_parse, rows, args.repeat)
+        new = best_of(parse_horses_from_table, rows, args.repeat)
+        print(  # noqa: T201
+            f"{count:>7} filas | anterior {old * 1000:8.1f} ms "
+            f"({old / count * 1e6:.2f} us/fila), decoder {new * 1000:8.1f} ms "
+            f"({new / count * 1e6:.2f} us/fila) | {old / new:.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
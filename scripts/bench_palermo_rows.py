@@ -0,0 +1,204 @@
+"""
+Benchmark del parseo de filas de caballos de los programas de Palermo.
+
+Compara el parseo anterior, que recorría la fila una vez por columna (últimas,
+número, nombre, peso, jockey, padre-madre, entrenador) con un regex propio en
+cada pasada, contra _parse_horse_row, que reparte las palabras de la fila en
+columnas con bisect en una sola pasada. Usa un programa sintético, sin PDF.
+Los tiempos no incluyen la construcción de los Horse (igual en los dos parseos
+y mucho más cara que decodificar la fila): se miden con un dict en su lugar.
+Importa turf_backend, así que necesita las mismas variables de entorno que la app
+(ver .env.sample).
+
+Uso:
+  python scripts/bench_palermo_rows.py
+  python scripts/bench_palermo_rows.py --races 50 200 --horses 14 --repeat 5
+"""
+
+import argparse
+import contextlib
+import random
+import re
+import sys
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from turf_backend.models.turf import Horse
+from turf_backend.services.palermo import palermo_processing
+from turf_backend.services.palermo.palermo_processing import (
+    _ENTRENADOR_X,
+    _JOCKEY_X,
+    _LINE_HEIGHT_PT,
+    _NOMBRE_X,
+    _NUMERO_X,
+    _PELO_X,
+    _PM_X,
+    _ULTIMAS_X_START,
+    _parse_horse_row,
+)
+from turf_backend.services.pdf.pages import PdfPage
+from turf_backend.services.pdf.rows import iter_rows
+
+ROWS_PER_PAGE = 40
+# Campos de Horse que cambian en cada instancia
+GENERATED = {"id", "created_at"}
+
+
+def synthetic_pages(races: int, horses: int, seed: int = 1) -> list[PdfPage]:
+    """Programa con `races` carreras de `horses` caballos, como palabras con x0/top."""
+    rnd = random.Random(seed)
+    rows = []
+    for r in range(races):
+        rows.append([(20, "1400"), (50, "mts."), (80, f"C{r}")])
+        for n in range(1, horses + 1):
+            rows.append([(20, "STUD"), (50, f"S{n}")])
+            ultimas = [f"{rnd.randint(1, 9)}{rnd.choice('ASPC')}" for _ in range(3)]
+            rows.append([
+                *((112 + 16 * i, u) for i, u in enumerate(ultimas)),
+                (170, str(n)),
+                (190, "CABALLO"),
+                (230, f"R{r}N{n}"),
+                (265, f"{rnd.randint(52, 60)}.5"),
+                (300, "J."),
+                (320, f"JOCKEY{n}"),
+                (385, "Z"),
+                (396, "4"),
+                (405, "PADRE"),
+                (450, "MADRE"),
+                (500, "E."),
+                (520, f"ENTRENADOR{n}"),
+            ])
+
+    pages = []
+    for start in range(0, len(rows), ROWS_PER_PAGE):
+        words = [
+            {"text": text, "x0": float(x0), "top": 30.0 + 14 * i}
+            for i, row in enumerate(rows[start : start + ROWS_PER_PAGE])
+            for x0, text in row
+        ]
+        pages.append(PdfPage(index=len(pages), words=words))
+    return pages
+
+
+def legacy_parse_row(row: list[dict], race_id, page_idx: int, caballeriza):
+    """Parseo anterior: una pasada sobre la fila por cada columna."""
+    if not row:
+        return None
+    ultimas_words = [
+        w
+        for w in row
+        if _ULTIMAS_X_START <= w["x0"] < _NUMERO_X
+        and (re.match(r"^\d[A-Z]", w["text"]) or w["text"] == "DEBUTA")
+    ]
+    if not ultimas_words:
+        return None
+    ultimas = (
+        "DEBUTA"
+        if ultimas_words[0]["text"] == "DEBUTA"
+        else " ".join(w["text"] for w in ultimas_words)
+    )
+    num_words = [w for w in row if _NUMERO_X <= w["x0"] < _NOMBRE_X]
+    if not num_words:
+        return None
+    try:
+        numero = int(num_words[0]["text"])
+    except ValueError:
+        return None
+    nombre = " ".join(
+        w["text"]
+        for w in row
+        if _NOMBRE_X <= w["x0"] < _JOCKEY_X
+        and re.match(r"^[A-ZÁÉÍÓÚÑ'\-]", w["text"])
+        and not re.match(r"^\d", w["text"])
+    )
+    if not nombre:
+        return None
+    peso_words = [
+        w
+        for w in row
+        if _NOMBRE_X <= w["x0"] < _JOCKEY_X and re.match(r"^\d+\.?\d*$", w["text"])
+    ]
+    if not peso_words:
+        return None
+    try:
+        peso = int(float(peso_words[0]["text"]))
+    except ValueError:
+        return None
+    return Horse(
+        race_id=race_id,
+        page=page_idx,
+        line_index=int(row[0]["top"] / _LINE_HEIGHT_PT),
+        ultimas=ultimas,
+        numero=str(numero),
+        nombre=nombre,
+        peso=peso,
+        jockey=" ".join(w["text"] for w in row if _JOCKEY_X <= w["x0"] < _PELO_X),
+        padre_madre=" ".join(
+            w["text"] for w in row if _PM_X <= w["x0"] < _ENTRENADOR_X
+        ),
+        entrenador=" ".join(w["text"] for w in row if w["x0"] >= _ENTRENADOR_X),
+        raw_rest="",
+        caballeriza=caballeriza or "",
+    )
+
+
+def parse_rows(parse_row, rows: list[tuple[int, list[dict]]]) -> list[Horse]:
+    race_id = uuid.UUID(int=0)
+    horses = [parse_row(row, race_id, page, None) for page, row in rows]
+    return [h for h in horses if h is not None]
+
+
+@contextlib.contextmanager
+def rows_as_dicts():
+    """Los dos parseos devuelven un dict con los campos en vez de un Horse."""
+    global Horse
+    model = Horse
+    Horse = palermo_processing.Horse = dict
+    try:
+        yield
+    finally:
+        Horse = palermo_processing.Horse = model
+
+
+def best_of(parse_row, rows: list[tuple[int, list[dict]]], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parse_rows(parse_row, rows)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--races", type=int, nargs="+", default=[50, 200])
+    parser.add_argument("--horses", type=int, default=14)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for races in args.races:
+        pages = synthetic_pages(races, args.horses)
+        rows = [(p.index, row) for p in pages for row in iter_rows(p.words)]
+        words = sum(len(p.words) for p in pages)
+        old_horses = parse_rows(legacy_parse_row, rows)
+        new_horses = parse_rows(_parse_horse_row, rows)
+        assert len(new_horses) == races * args.horses
+        assert [h.model_dump(exclude=GENERATED) for h in old_horses] == [
+            h.model_dump(exclude=GENERATED) for h in new_horses
+        ]
+
+        with rows_as_dicts():
+            old = best_of(legacy_parse_row, rows, args.repeat)
+            new = best_of(_parse_horse_row, rows, args.repeat)
+        print(  # noqa: T201
+            f"{races:>4} carreras, {words} palabras | anterior {old * 1000:7.1f} ms "
+            f"({old / words * 1e6:.2f} us/palabra), columnas {new * 1000:7.1f} ms "
+            f"({new / words * 1e6:.2f} us/palabra) | {old / new:.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
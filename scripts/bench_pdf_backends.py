@@ -0,0 +1,123 @@
+"""
+Benchmark de los backends que leen las palabras de los PDF de programa.
+
+Compara pdfplumber (que arma con pdfminer todos los objetos de cada página)
+contra pdfium (que sólo lee los caracteres de las páginas pedidas): tiempo hasta
+la primera página, extracción de todas las páginas, importación completa de un
+programa de Palermo (parse_pdf_program) y lectura de la fecha de la primera
+página, que antes hacía pypdf. Sin argumentos usa un programa sintético de
+Palermo (ver bench_palermo_rows). Importa turf_backend, así que necesita las
+mismas variables de entorno que la app (ver .env.sample).
+
+Uso:
+  python scripts/bench_pdf_backends.py
+  python scripts/bench_pdf_backends.py programa1.pdf programa2.pdf --repeat 3
+"""
+
+import argparse
+import io
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from pypdf import PdfReader
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bench_palermo_rows import synthetic_pages
+
+from tests.services.pdf.conftest import build_pdf
+from turf_backend.core.config.settings import settings
+from turf_backend.services.palermo.palermo_processing import parse_pdf_program
+from turf_backend.services.pdf.pages import iter_pdf_pages
+from turf_backend.utils.date import extract_date
+
+BACKENDS = ("pdfplumber", "pdfium")
+
+
+def synthetic_program(races: int, horses: int) -> bytes:
+    """PDF con las palabras del programa sintético, una por objeto de texto."""
+    header = [(20, 10, "REUNION Nº 52 Sábado, 1 de Noviembre de 2025.")]
+    return build_pdf([
+        header + [(w["x0"], w["top"], w["text"]) for w in page.words]
+        for page in synthetic_pages(races, horses)
+    ])
+
+
+def best_of(func, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def pypdf_first_page(content: bytes) -> str:
+    """Lectura anterior de la fecha: pypdf con el documento completo."""
+    return PdfReader(io.BytesIO(content)).pages[0].extract_text()
+
+
+def bench(name: str, path: str, repeat: int) -> None:
+    content = Path(path).read_bytes()
+    timings = {}
+    horses = {}
+    for backend in BACKENDS:
+        settings.pdf_backend = backend
+        horses[backend] = [
+            (h.page, h.numero, h.nombre, h.peso, h.jockey, h.entrenador)
+            for h in parse_pdf_program(path).horses
+        ]
+        timings[backend] = (
+            best_of(lambda b=backend: next(iter_pdf_pages(path, backend=b)), repeat),
+            best_of(lambda b=backend: list(iter_pdf_pages(path, backend=b)), repeat),
+            best_of(lambda: parse_pdf_program(path), repeat),
+        )
+    assert horses["pdfium"] == horses["pdfplumber"]
+    date_old = best_of(lambda: pypdf_first_page(content), repeat)
+    # extract_date lee con PDF_BACKEND
+    settings.pdf_backend = "pdfium"
+    date_new = best_of(lambda: extract_date(content), repeat)
+
+    pages = sum(1 for _ in iter_pdf_pages(path, backend="pdfium"))
+    print(  # noqa: T201
+        f"{name}: {pages} páginas, {len(content) / 1024:.0f} KiB, "
+        f"{len(horses['pdfium'])} caballos"
+    )
+    labels = ("primera página", "todas las páginas", "importación")
+    for i, label in enumerate(labels):
+        old, new = timings["pdfplumber"][i], timings["pdfium"][i]
+        print(  # noqa: T201
+            f"  {label:<18} pdfplumber {old * 1000:8.1f} ms | "
+            f"pdfium {new * 1000:8.1f} ms | {old / new:.1f}x"
+        )
+    print(  # noqa: T201
+        f"  {'fecha':<18} pypdf      {date_old * 1000:8.1f} ms | "
+        f"pdfium {date_new * 1000:8.1f} ms | {date_old / date_new:.1f}x"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("pdfs", nargs="*", help="Programas en PDF")
+    parser.add_argument("--races", type=int, default=50)
+    parser.add_argument("--horses", type=int, default=14)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    settings.pdf_parse_workers = 0
+
+    if args.pdfs:
+        for path in args.pdfs:
+            bench(path, path, args.repeat)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "programa.pdf"
+        path.write_bytes(synthetic_program(args.races, args.horses))
+        name = f"sintético ({args.races} carreras, {args.horses} caballos)"
+        bench(name, str(path), args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Benchmark de la extracción de carreras de una página de programa de San Isidro.
+
+Compara el recorrido anterior con BeautifulSoup (find_all + get_text sobre cada
+div/table, cuadrático en el tamaño de la página) contra extract_race_day, que
+recorre el HTML una sola vez. Importa turf_backend, así que necesita las mismas
+variables de entorno que la app (ver .env.sample).
+
+Uso:
+  python scripts/bench_program_page.py pagina1.html pagina2.html
+  python scripts/bench_program_page.py --races 15 --horses 16 --nesting 4
+"""
+
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from turf_backend.services.san_isidro.scraper import extract_race_day
+
+
+def synthetic_page(races: int, horses: int, nesting: int) -> str:
+    """Página con la misma forma que el programa oficial, envuelta en `nesting` divs."""
+    parts = ["<h4>Sábado, 1 de Noviembre de 2025</h4>"]
+    for r in range(1, races + 1):
+        rows = "".join(
+            f"<tr><td>{i}</td><td>CABALLO {r}-{i}</td><td>M</td><td>5{i % 10}</td>"
+            f"<td>STUD {i}</td><td>JOCKEY {i} 5{i % 10}</td><td>ENTRENADOR {i}</td>"
+            f"<td>PADRE - MADRE</td><td>1A 2S 3S</td></tr>"
+            for i in range(1, horses + 1)
+        )
+        parts.append(
+            '<div class="carrera">'
+            f"<div><b>{r}ª</b> - Premio CARRERA {r} - {12 + r % 10}:30 hs.</div>"
+            f"<div>{1000 + 100 * r} mts. <span>Pista Arena</span></div>"
+            "<div>Bolsa Total: $4.500.000</div>"
+            "<table><tr><th>EJEMP</th><th>Caballo</th><th>Sexo</th><th>Kg</th>"
+            "<th>Stud</th><th>Jockey</th><th>Entrenador</th><th>Padre - Madre</th>"
+            f"<th>Últimas</th></tr>{rows}</table></div>"
+        )
+    body = "".join(parts)
+    for _ in range(nesting):
+        body = f"<div>{body}</div>"
+    return f"<html><body>{body}</body></html>"
+
+
+def legacy_scan(html: str) -> int:
+    """Recorrido anterior de scrape_race_day, sin el parseo de caballos."""
+    soup = BeautifulSoup(html, "html.parser")
+    all_elements = soup.find_all(["div", "table"])
+    race_divs = [
+        elem
+        for elem in all_elements
+        if re.search(r"\d+\s*ª\s*[-–]\s*Premio", elem.get_text(strip=True))  # noqa: RUF001
+    ]
+    for i, div in enumerate(race_divs):
+        div.get_text(strip=True)
+        for j in range(i, min(i + 10, len(all_elements))):
+            all_elements[j].get_text(strip=True)
+    for table in soup.find_all("table"):
+        for row in table.find_all("tr"):
+            for cell in row.find_all(["td", "th"]):
+                cell.get_text(strip=True)
+    return len(race_divs)
+
+
+def best_of(func, html: str, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(html)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("pages", nargs="*", help="Páginas de programa guardadas")
+    parser.add_argument("--races", type=int, default=15)
+    parser.add_argument("--horses", type=int, default=16)
+    parser.add_argument("--nesting", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    if args.pages:
+        pages = {p: Path(p).read_text(encoding="utf-8") for p in args.pages}
+    else:
+        name = f"sintética ({args.races} carreras, {args.horses} caballos)"
+        pages = {name: synthetic_page(args.races, args.horses, args.nesting)}
+
+    for name, html in pages.items():
+        day = extract_race_day(html, "bench")
+        horses = sum(len(h) for h in day.horses_by_race.values())
+        old = best_of(legacy_scan, html, args.repeat)
+        new = best_of(lambda h: extract_race_day(h, "bench"), html, args.repeat)
+        print(  # noqa: T201
+            f"{name}: {len(html) / 1024:.0f} KiB, {len(day.races)} carreras, "
+            f"{horses} caballos | anterior {old * 1000:.1f} ms, "
+            f"una pasada {new * 1000:.1f} ms ({old / new:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
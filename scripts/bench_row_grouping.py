@@ -0,0 +1,96 @@
+"""
+Benchmark del agrupado de palabras en filas de una página de programa.
+
+Compara el _group_by_row anterior de Palermo y San Isidro (ordena las palabras
+de la página por (top, x0) y después cada fila por x0, devolviendo todas las
+filas en una lista) contra iter_rows, que recorre las palabras en el orden de
+lectura de pdfplumber y va generando cada fila sin ordenar nada. Mide tiempo y
+pico de memoria sobre un programa sintético de Palermo (ver bench_palermo_rows).
+Importa turf_backend, así que necesita las mismas variables de entorno que la app
+(ver .env.sample).
+
+Uso:
+  python scripts/bench_row_grouping.py
+  python scripts/bench_row_grouping.py --pages 40 200 --repeat 5
+"""
+
+import argparse
+import sys
+import time
+import tracemalloc
+from operator import itemgetter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bench_palermo_rows import ROWS_PER_PAGE, synthetic_pages
+
+from turf_backend.services.pdf.pages import PdfPage
+from turf_backend.services.pdf.rows import iter_rows
+
+HORSES = 14
+
+
+def legacy_group_by_row(words: list[dict], y_tol: float = 3.0) -> list[list[dict]]:
+    """Agrupado anterior: dos ordenamientos y la lista completa de filas."""
+    if not words:
+        return []
+    sorted_w = sorted(words, key=itemgetter("top", "x0"))
+    rows: list[list[dict]] = []
+    cur = [sorted_w[0]]
+    for w in sorted_w[1:]:
+        if abs(w["top"] - cur[0]["top"]) <= y_tol:
+            cur.append(w)
+        else:
+            rows.append(sorted(cur, key=itemgetter("x0")))
+            cur = [w]
+    rows.append(sorted(cur, key=itemgetter("x0")))
+    return rows
+
+
+def walk(group, pages: list[PdfPage]) -> int:
+    """Recorre las filas de cada página como lo hacen los parsers."""
+    count = 0
+    for page in pages:
+        for _row in group(page.words):
+            count += 1
+    return count
+
+
+def measure(group, pages: list[PdfPage], repeat: int) -> tuple[float, int]:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        walk(group, pages)
+        timings.append(time.perf_counter() - start)
+    tracemalloc.start()
+    walk(group, pages)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return min(timings), peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pages", type=int, nargs="+", default=[40, 200])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for page_count in args.pages:
+        races = -(-page_count * ROWS_PER_PAGE // (1 + 2 * HORSES))
+        pages = synthetic_pages(races, HORSES)[:page_count]
+        words = sum(len(p.words) for p in pages)
+        for page in pages:
+            assert legacy_group_by_row(page.words) == list(iter_rows(page.words))
+
+        old, old_peak = measure(legacy_group_by_row, pages, args.repeat)
+        new, new_peak = measure(iter_rows, pages, args.repeat)
+        print(  # noqa: T201
+            f"{len(pages):>4} páginas, {words} palabras | anterior "
+            f"{old * 1000:6.1f} ms, pico {old_peak / 1024:.0f} KiB | iter_rows "
+            f"{new * 1000:6.1f} ms, pico {new_peak / 1024:.0f} KiB | {old / new:.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
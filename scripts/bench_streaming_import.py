@@ -0,0 +1,112 @@
+"""
+Benchmark de memoria de la importación de un PDF subido, según su tamaño.
+
+Compara la importación anterior (lee el archivo entero en memoria, lo copia a un
+temporal, arma el programa completo con parse_pdf_program y recién entonces lo
+escribe) contra la importación por streaming (copia el archivo en bloques
+calculando el hash, parsea carrera por carrera con iter_program_races y escribe
+de a IMPORT_BATCH_RACES carreras). Mide el pico de memoria de Python
+(tracemalloc, no incluye lo que reserva pdfium) y el tiempo sobre programas
+sintéticos de Palermo (ver bench_pdf_backends) de distinta cantidad de
+carreras, escribiendo en una base SQLite en memoria. Importa turf_backend, así
+que necesita las mismas variables de entorno que la app (ver .env.sample).
+
+Uso:
+  python scripts/bench_streaming_import.py
+  python scripts/bench_streaming_import.py --races 10 40 160 --backend pdfplumber
+"""
+
+import argparse
+import hashlib
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine, func, select
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bench_pdf_backends import synthetic_program
+
+from turf_backend.core.config.settings import settings
+from turf_backend.models.turf import Horse
+from turf_backend.services.palermo.palermo_processing import (
+    iter_program_races,
+    parse_pdf_program,
+)
+from turf_backend.services.palermo.races import (
+    insert_and_create_races,
+    insert_races_in_batches,
+)
+from turf_backend.services.pdf.spool import SPOOL_CHUNK_SIZE, spool_chunks
+
+HORSES = 14
+
+
+def legacy_import(session: Session, pdf_path: str) -> str:
+    """Importación anterior: todo el archivo y todo el programa en memoria."""
+    content = Path(pdf_path).read_bytes()
+    file_hash = hashlib.sha256(content).hexdigest()
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
+        tmp.write(content)
+    try:
+        insert_and_create_races(session, parse_pdf_program(tmp.name))
+    finally:
+        Path(tmp.name).unlink()
+    return file_hash
+
+
+def streaming_import(session: Session, pdf_path: str) -> str:
+    with Path(pdf_path).open("rb") as f:
+        chunks = iter(lambda: f.read(SPOOL_CHUNK_SIZE), b"")
+        with spool_chunks(chunks) as pdf:
+            insert_races_in_batches(session, iter_program_races(pdf.path))
+            return pdf.file_hash
+
+
+def measure(run, pdf_path: str) -> tuple[float, int, int]:
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        tracemalloc.start()
+        start = time.perf_counter()
+        run(session, pdf_path)
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        horses = session.exec(select(func.count()).select_from(Horse)).one()
+    return elapsed, peak, horses
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--races", type=int, nargs="+", default=[10, 40, 160])
+    parser.add_argument("--backend", choices=("pdfplumber", "pdfium"), default="pdfium")
+    args = parser.parse_args()
+    settings.pdf_backend = args.backend
+    settings.pdf_parse_workers = 0
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for races in args.races:
+            pdf_path = Path(tmp_dir) / f"programa_{races}.pdf"
+            pdf_path.write_bytes(synthetic_program(races, HORSES))
+            size = pdf_path.stat().st_size
+
+            old, old_peak, old_horses = measure(legacy_import, str(pdf_path))
+            new, new_peak, new_horses = measure(streaming_import, str(pdf_path))
+            assert old_horses == new_horses, (old_horses, new_horses)
+
+            print(  # noqa: T201
+                f"{races:>4} carreras, {size / 1024:6.0f} KiB | anterior "
+                f"{old:6.2f} s, pico {old_peak / 1024:7.0f} KiB | streaming "
+                f"{new:6.2f} s, pico {new_peak / 1024:7.0f} KiB"
+            )
+
+
+if __name__ == "__main__":
+    main()
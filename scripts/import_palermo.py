@@ -32,17 +32,33 @@ os.environ.setdefault("POSTGRES_DATABASE", _parsed.path.lstrip("/"))
 os.environ.setdefault("POSTGRES_URL", _db_url)
 os.environ.setdefault("OPENAI_API_KEY", "dummy")
 
-from sqlmodel import Session, SQLModel, create_engine, select  # noqa: E402
+from sqlmodel import Session, create_engine, select  # noqa: E402
 
 from turf_backend.models.turf import PdfImport  # noqa: E402
-from turf_backend.services.palermo.palermo_processing import parse_pdf_horses  # noqa: E402
+from turf_backend.services.palermo.palermo_processing import (  # noqa: E402
+    PARSER_VERSION,
+    parse_pdf_program,
+)
 from turf_backend.services.palermo.races import insert_and_create_races  # noqa: E402
+from turf_backend.services.pdf.cache import parse_with_cache  # noqa: E402
+from turf_backend.services.pdf.remote import (  # noqa: E402
+    PdfValidators,
+    RemotePdf,
+    fetch_pdf,
+    last_import,
+    track_source,
+)
+from turf_backend.services.schema import prepare_database  # noqa: E402
+from turf_backend.utils.date import program_race_date  # noqa: E402
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
 logger = logging.getLogger("import_palermo")
 
 BACKEND_URL = os.environ.get("BACKEND_URL", "https://turf-backend-theta.vercel.app")
 
+# Clave de Palermo en PdfImport
+HIPODROMO = "palermo"
+
 
 def get_engine():
     url = _db_url.replace("postgres://", "postgresql://", 1)
@@ -62,25 +78,36 @@ def get_available_pdfs() -> list[dict]:
     return resp.json().get("pdfs", [])
 
 
-def download_pdf_via_backend(pdf_url: str) -> bytes:
-    """Descarga un PDF a través del backend como proxy."""
-    resp = requests.get(
+def download_pdf_via_backend(pdf_url: str, known: PdfValidators | None) -> RemotePdf:
+    """
+    Descarga un PDF a través del backend como proxy, salvo que siga igual al
+    de `known` (el backend responde 304 y no se baja nada).
+    """
+    return fetch_pdf(
+        requests.get,
         f"{BACKEND_URL}/palermo/proxy-pdf",
+        known,
         params={"url": pdf_url},
         timeout=60,
     )
-    resp.raise_for_status()
-    return resp.content
 
 
 def import_pdf(engine, pdf_url: str, filename: str) -> dict:
     try:
-        pdf_content = download_pdf_via_backend(pdf_url)
-        file_hash = compute_hash(pdf_content)
-
         with Session(engine) as session:
+            previous = last_import(session, HIPODROMO, source_url=pdf_url)
+            remote = download_pdf_via_backend(pdf_url, PdfValidators.of(previous))
+            if remote.unchanged:
+                logger.info("Sin cambios: %s", filename)
+                return {"filename": filename, "status": "skipped", "reason": "not modified"}
+
+            pdf_content: bytes = remote.content  # type: ignore[assignment]
+            file_hash = compute_hash(pdf_content)
+
             existing = session.exec(select(PdfImport).where(PdfImport.file_hash == file_hash)).first()
             if existing:
+                session.add(track_source(existing, remote, pdf_url))
+                session.commit()
                 logger.info("Ya importado: %s", filename)
                 return {"filename": filename, "status": "skipped", "reason": "already imported"}
 
@@ -88,16 +115,25 @@ def import_pdf(engine, pdf_url: str, filename: str) -> dict:
                 tmp.write(pdf_content)
                 tmp_path = tmp.name
 
-            horses = parse_pdf_horses(tmp_path)
-
-            if not horses:
-                session.add(PdfImport(file_hash=file_hash, filename=filename, hipodromo="palermo"))
+            program = parse_with_cache(
+                session, file_hash, PARSER_VERSION, parse_pdf_program, tmp_path
+            )
+            pdf_import = track_source(
+                PdfImport(file_hash=file_hash, filename=filename, hipodromo=HIPODROMO),
+                remote,
+                pdf_url,
+            )
+
+            if not program.horses:
+                session.add(pdf_import)
                 session.commit()
                 logger.info("Importado sin caballos: %s", filename)
                 return {"filename": filename, "status": "imported", "inserted": 0}
 
-            total = insert_and_create_races(session, horses, tmp_path)
-            session.add(PdfImport(file_hash=file_hash, filename=filename, hipodromo="palermo"))
+            total = insert_and_create_races(
+                session, program, program_race_date(pdf_content)
+            )
+            session.add(pdf_import)
             session.commit()
             logger.info("Importado: %s — %d caballos", filename, total)
             return {"filename": filename, "status": "imported", "inserted": total}
@@ -109,7 +145,7 @@ def import_pdf(engine, pdf_url: str, filename: str) -> dict:
 
 def main():
     engine = get_engine()
-    SQLModel.metadata.create_all(engine)
+    prepare_database(engine)
 
     logger.info("Buscando PDFs disponibles en palermo.com.ar...")
     pdfs = get_available_pdfs()
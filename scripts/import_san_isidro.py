@@ -4,6 +4,7 @@ Corre directamente en GitHub Actions, conectándose a Neon sin pasar por Vercel.
 
 Uso:
   python scripts/import_san_isidro.py --start 2026-01-01 --end 2026-02-28 --tipo resultados
+  python scripts/import_san_isidro.py --start 2026-01-01 --end 2026-02-28 --tipo resultados --full
   python scripts/import_san_isidro.py --tipo upcoming
 """
 import argparse
@@ -35,16 +36,38 @@ os.environ.setdefault("POSTGRES_DATABASE", _parsed.path.lstrip("/"))
 os.environ.setdefault("POSTGRES_URL", _db_url)
 os.environ.setdefault("OPENAI_API_KEY", "dummy")
 
-from sqlmodel import Session, SQLModel, create_engine, select
+from sqlmodel import Session, create_engine, select
 
 from turf_backend.models.turf import PdfImport
 from turf_backend.services.san_isidro import scraper
+from turf_backend.services.pdf.cache import parse_with_cache
+from turf_backend.services.pdf.remote import (
+    PdfValidators,
+    RemotePdf,
+    fetch_pdf,
+    last_import,
+    track_source,
+)
 from turf_backend.services.san_isidro.races import insert_and_create_races
-from turf_backend.services.san_isidro.sanisidro_processing import parse_pdf_horses
+from turf_backend.services.schema import prepare_database
+from turf_backend.services.sync_state import (
+    advance_watermark,
+    pending_days,
+    record_day,
+    resume_from,
+)
+from turf_backend.services.san_isidro.sanisidro_processing import (
+    PARSER_VERSION,
+    parse_pdf_program,
+)
+from turf_backend.utils.date import calendar_race_date, program_race_date
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
 logger = logging.getLogger("import_san_isidro")
 
+# Clave de San Isidro en PdfImport y en el estado de sincronización
+HIPODROMO = "san_isidro"
+
 
 def get_engine():
     url = os.environ.get("POSTGRES_URL") or os.environ.get("DATABASE_URL")
@@ -62,43 +85,59 @@ def compute_hash(content: bytes) -> str:
     return hashlib.sha256(content).hexdigest()
 
 
-def get_pdf_via_backend(calendario_id: str) -> tuple[bytes, str] | None:
+def get_pdf_via_backend(
+    calendario_id: str, known: PdfValidators | None
+) -> tuple[RemotePdf, str] | None:
     """
     Descarga el PDF del programa oficial a través del backend (Vercel),
     evitando que GitHub Actions llame directamente a hipodromosanisidro.com.
-    Retorna (contenido, filename) o None si no hay PDF.
+    Si sigue igual al de `known` el backend responde 304 y no se baja nada.
+    Retorna (remoto, filename) o None si no hay PDF.
     """
     backend_url = os.environ.get("BACKEND_URL", "https://turf-backend-theta.vercel.app")
 
-    links_resp = requests.get(f"{backend_url}/san-isidro/pdf-links/{calendario_id}", timeout=30)
-    links_resp.raise_for_status()
-    links_data = links_resp.json()
-
-    pdf_url = links_data.get("programa_oficial")
-    if not pdf_url:
-        return None
-
-    pdf_resp = requests.get(f"{backend_url}/san-isidro/download-pdf/{calendario_id}", timeout=60)
-    pdf_resp.raise_for_status()
-
-    filename = pdf_url.split("/")[-1]
-    return pdf_resp.content, filename
+    # download-pdf ya resuelve el link del programa oficial (404 si no hay PDF),
+    # así que no hace falta pedir /pdf-links antes y bajar la página dos veces.
+    try:
+        remote = fetch_pdf(
+            requests.get,
+            f"{backend_url}/san-isidro/download-pdf/{calendario_id}",
+            known,
+            timeout=60,
+        )
+    except requests.HTTPError as e:
+        if e.response is not None and e.response.status_code == 404:
+            return None
+        raise
+
+    filename = f"{calendario_id}.pdf"
+    if remote.source_url:
+        filename = remote.source_url.rsplit("/", 1)[-1]
+    return remote, filename
 
 
 def import_day(engine, fecha: str, calendario_id: str) -> dict:
     """Cada día usa su propia sesión para que un fallo no contamine los siguientes."""
     try:
-        result = get_pdf_via_backend(calendario_id)
-        if result is None:
-            logger.info("Sin PDF: %s (%s)", fecha, calendario_id)
-            return {"fecha": fecha, "status": "skipped", "reason": "no PDF"}
+        with Session(engine) as session:
+            previous = last_import(session, HIPODROMO, calendario_id=calendario_id)
+            result = get_pdf_via_backend(calendario_id, PdfValidators.of(previous))
+            if result is None:
+                logger.info("Sin PDF: %s (%s)", fecha, calendario_id)
+                return {"fecha": fecha, "status": "missing", "reason": "no PDF"}
 
-        pdf_content, filename = result
-        file_hash = compute_hash(pdf_content)
+            remote, filename = result
+            if remote.unchanged:
+                logger.info("Sin cambios: %s", fecha)
+                return {"fecha": fecha, "status": "skipped", "reason": "not modified"}
+
+            pdf_content: bytes = remote.content  # type: ignore[assignment]
+            file_hash = compute_hash(pdf_content)
 
-        with Session(engine) as session:
             existing = session.exec(select(PdfImport).where(PdfImport.file_hash == file_hash)).first()
             if existing:
+                session.add(track_source(existing, remote, None, calendario_id))
+                session.commit()
                 logger.info("Ya importado: %s", fecha)
                 return {"fecha": fecha, "status": "skipped", "reason": "already imported"}
 
@@ -106,16 +145,27 @@ def import_day(engine, fecha: str, calendario_id: str) -> dict:
                 tmp.write(pdf_content)
                 tmp_path = tmp.name
 
-            horses = parse_pdf_horses(tmp_path)
-
-            if not horses:
-                session.add(PdfImport(file_hash=file_hash, filename=filename, hipodromo="san_isidro"))
+            program = parse_with_cache(
+                session, file_hash, PARSER_VERSION, parse_pdf_program, tmp_path
+            )
+            pdf_import = track_source(
+                PdfImport(file_hash=file_hash, filename=filename, hipodromo=HIPODROMO),
+                remote,
+                None,
+                calendario_id,
+            )
+
+            if not program.horses:
+                session.add(pdf_import)
                 session.commit()
                 logger.info("Importado sin caballos: %s", fecha)
                 return {"fecha": fecha, "status": "imported", "inserted": 0}
 
-            total = insert_and_create_races(session, horses, tmp_path)
-            session.add(PdfImport(file_hash=file_hash, filename=filename, hipodromo="san_isidro"))
+            # Mismo orden que SyncPipeline: la fecha del calendario y, si no
+            # hay, la impresa en el PDF
+            race_date = calendar_race_date(fecha) or program_race_date(pdf_content)
+            total = insert_and_create_races(session, program, race_date)
+            session.add(pdf_import)
             session.commit()
             logger.info("Importado: %s — %d caballos", fecha, total)
             return {"fecha": fecha, "status": "imported", "inserted": total}
@@ -148,17 +198,34 @@ def main():
     parser.add_argument("--tipo", choices=["resultados", "upcoming"], required=True)
     parser.add_argument("--start", help="Fecha inicio YYYY-MM-DD (solo para resultados)")
     parser.add_argument("--end", help="Fecha fin YYYY-MM-DD (solo para resultados)")
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Revisar también los días ya sincronizados (solo para resultados)",
+    )
     args = parser.parse_args()
 
     engine = get_engine()
-    SQLModel.metadata.create_all(engine)
+    prepare_database(engine)
 
     if args.tipo == "upcoming":
         days = get_days_via_backend("upcoming")
+        listed = days
     else:
         if not args.start or not args.end:
             parser.error("--start y --end son requeridos para --tipo resultados")
-        days = get_days_via_backend("resultados", args.start, args.end)
+        start, end = date.fromisoformat(args.start), date.fromisoformat(args.end)
+        with Session(engine) as session:
+            # Retoma desde el watermark y saltea los días ya completados
+            if not args.full:
+                start = resume_from(session, HIPODROMO, start)
+            listed = []
+            if start <= end:
+                listed = get_days_via_backend(
+                    "resultados", start.isoformat(), end.isoformat()
+                )
+            days = listed if args.full else pending_days(session, HIPODROMO, listed)
+        logger.info("Días ya sincronizados: %d", len(listed) - len(days))
 
     logger.info("Días a procesar: %d", len(days))
 
@@ -166,11 +233,25 @@ def main():
     for fecha, calendario_id in days:
         result = import_day(engine, fecha, calendario_id)
         results.append(result)
+        if args.tipo == "resultados":
+            with Session(engine) as session:
+                record_day(session, HIPODROMO, calendario_id, result)
+
+    if args.tipo == "resultados" and start <= end:
+        with Session(engine) as session:
+            advance_watermark(session, HIPODROMO, start, end, listed)
 
     imported = sum(1 for r in results if r["status"] == "imported")
     skipped = sum(1 for r in results if r["status"] == "skipped")
+    missing = sum(1 for r in results if r["status"] == "missing")
     errors = sum(1 for r in results if r["status"] == "error")
-    logger.info("Resumen — importados: %d, salteados: %d, errores: %d", imported, skipped, errors)
+    logger.info(
+        "Resumen — importados: %d, salteados: %d, sin PDF: %d, errores: %d",
+        imported,
+        skipped,
+        missing,
+        errors,
+    )
 
     if errors:
         sys.exit(1)
@@ -0,0 +1,54 @@
+"""
+Corre los jobs de importación encolados por la API (sync-all,
+sync-historical, auto-import, upload-pdf de Palermo).
+
+La cola es la tabla import_jobs de la base configurada (ver .env.sample), así
+que no hace falta un broker. Es el worker de los jobs cuando la API corre con
+JOB_WORKERS=0, el default (en Vercel no quedan threads corriendo entre
+requests): se deja corriendo en un host que no se apague o se vacía la cola
+desde un cron.
+
+Uso:
+  python scripts/run_jobs.py            # corre hasta Ctrl+C
+  python scripts/run_jobs.py --once     # corre lo encolado y termina
+  python scripts/run_jobs.py --threads 2
+"""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from turf_backend.core.config.settings import settings
+from turf_backend.database.database import database
+from turf_backend.services import import_jobs  # noqa: F401  (registra los handlers)
+from turf_backend.services.jobs import JobWorker, run_pending
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+logger = logging.getLogger("run_jobs")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--once", action="store_true", help="Salir con la cola vacía")
+    parser.add_argument("--threads", type=int, default=1)
+    args = parser.parse_args()
+
+    if args.once:
+        ran = run_pending(database.engine)
+        logger.info("%d jobs ejecutados", ran)
+        return
+
+    worker = JobWorker(database.engine, args.threads, settings.job_poll_interval)
+    worker.start()
+    logger.info("Esperando jobs (%d threads)...", args.threads)
+    try:
+        worker.join()
+    except KeyboardInterrupt:
+        worker.stop()
+
+
+if __name__ == "__main__":
+    main()
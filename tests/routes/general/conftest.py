@@ -0,0 +1,93 @@
+import uuid
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine
+
+from turf_backend.database import get_connection
+from turf_backend.main import app
+from turf_backend.models.turf import Horse, Race
+from turf_backend.services.meetings import meeting_cache
+from turf_backend.services.search import install_search
+from turf_backend.utils.pagination import table_counter
+
+
+@pytest.fixture
+def session():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    SQLModel.metadata.create_all(engine)
+    install_search(engine)
+    with Session(engine) as session:
+        yield session
+
+
+@pytest.fixture
+def count_queries(session: Session):
+    """Context manager collecting the SQL statements sent while it is open."""
+
+    @contextmanager
+    def counter():
+        statements: list[str] = []
+
+        def before_cursor_execute(*args):
+            statements.append(args[2])
+
+        engine = session.get_bind()
+        event.listen(engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+    return counter
+
+
+@pytest.fixture
+def client(session: Session):
+    def override_get_connection():
+        yield session
+
+    app.dependency_overrides[get_connection] = override_get_connection
+    table_counter.clear()
+    meeting_cache.clear()
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def races_with_horses(session: Session) -> list[Race]:
+    """7 races with 5 horses each; some horses share created_at."""
+    created_at = datetime(2025, 11, 1, 12, 0)
+    races = []
+    for numero in range(1, 8):
+        race = Race(
+            race_id=uuid.uuid4(),
+            numero=numero,
+            nombre=f"PREMIO {numero}",
+            fecha="01/11/2025",
+            race_date=date(2025, 11, 1),
+            hipodromo="San Isidro",
+        )
+        races.append(race)
+        session.add(race)
+        for i in range(1, 6):
+            session.add(
+                Horse(
+                    race_id=race.race_id,
+                    page=numero,
+                    numero=str(i),
+                    nombre=f"CABALLO {numero}-{i}",
+                    jockey="Banegas K." if i % 2 else "Aguirre R.",
+                    created_at=created_at + timedelta(minutes=numero),
+                )
+            )
+    session.commit()
+    return races
@@ -0,0 +1,35 @@
+import uuid
+from datetime import date
+
+from sqlmodel import Session
+
+from turf_backend.models.turf import Horse, Race
+from turf_backend.services.catalog import link_horses
+
+
+def test_history_lists_every_race_of_a_horse(client, session: Session):
+    entries = []
+    for day in (date(2025, 10, 4), date(2025, 11, 1), date(2025, 10, 18)):
+        race = Race(race_id=uuid.uuid4(), numero=3, race_date=day)
+        session.add(race)
+        entries += [
+            Horse(race_id=race.race_id, numero="1", page=day.day, nombre="PASO NEVADO"),
+            Horse(race_id=race.race_id, numero="2", page=day.day, nombre="LUNA ROJA"),
+        ]
+    link_horses(session, entries)
+    session.add_all(entries)
+    session.commit()
+    horse_id = entries[0].catalog_horse_id
+
+    response = client.get(f"/general/horses/{horse_id}/history")
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["horse"]["nombre"] == "PASO NEVADO"
+    assert [e["race"]["race_date"] for e in body["entries"]] == [
+        "2025-11-01",
+        "2025-10-18",
+        "2025-10-04",
+    ]
+    assert {e["horse"]["nombre"] for e in body["entries"]} == {"PASO NEVADO"}
+    assert client.get("/general/horses/999/history").status_code == 404
@@ -0,0 +1,74 @@
+import uuid
+from datetime import date
+
+import pytest
+from sqlmodel import Session
+
+from turf_backend.models.turf import Horse
+from turf_backend.services.pdf.pages import ParsedProgram
+from turf_backend.services.san_isidro.races import insert_and_create_races
+
+URL = "/general/meetings/san-isidro/2025-11-01"
+RACE_DATE = date(2025, 11, 1)
+
+
+def _program(runners: dict[int, list[str]]) -> ParsedProgram:
+    program = ParsedProgram()
+    for numero, names in runners.items():
+        race_id = uuid.uuid4()
+        program.races[race_id] = {
+            "numero": numero,
+            "nombre": f"PREMIO {numero}",
+            "hora": "13:45",
+            "distancia": "1200",
+        }
+        program.horses.extend(
+            Horse(race_id=race_id, numero=str(i), nombre=name, page=numero)
+            for i, name in enumerate(names, start=1)
+        )
+    return program
+
+
+@pytest.mark.usefixtures("races_with_horses")
+def test_meeting_returns_the_whole_card(client):
+    response = client.get(URL)
+
+    assert response.status_code == 200
+    meeting = response.json()
+    assert (meeting["hipodromo"], meeting["fecha"]) == ("San Isidro", "2025-11-01")
+    assert [r["race"]["numero"] for r in meeting["races"]] == list(range(1, 8))
+    assert [len(r["horses"]) for r in meeting["races"]] == [5] * 7
+
+
+@pytest.mark.usefixtures("races_with_horses")
+def test_meeting_is_served_from_cache(client, count_queries):
+    assert client.get(URL).status_code == 200
+
+    with count_queries() as statements:
+        assert client.get(URL).status_code == 200
+
+    assert statements == []
+
+
+def test_import_invalidates_the_cached_meeting(client, session: Session):
+    insert_and_create_races(session, _program({1: ["PASO NEVADO"]}), RACE_DATE)
+    assert len(client.get(URL).json()["races"]) == 1
+
+    insert_and_create_races(
+        session,
+        _program({1: ["PASO NEVADO"], 2: ["LUNA ROJA", "TORMENTA"]}),
+        RACE_DATE,
+    )
+
+    races = client.get(URL).json()["races"]
+    assert [[h["nombre"] for h in r["horses"]] for r in races] == [
+        ["PASO NEVADO"],
+        ["LUNA ROJA", "TORMENTA"],
+    ]
+
+
+@pytest.mark.usefixtures("races_with_horses")
+def test_meeting_not_found(client):
+    assert client.get("/general/meetings/palermo/2025-11-01").status_code == 404
+    assert client.get("/general/meetings/la-plata/2025-11-01").status_code == 404
+    assert client.get("/general/meetings/san-isidro/01-11-2025").status_code == 422
@@ -0,0 +1,80 @@
+from datetime import date
+
+import pytest
+from fastapi.testclient import TestClient
+
+
+def _walk(client: TestClient, url: str, params: dict) -> list[list[dict]]:
+    pages = []
+    response = client.get(url, params=params)
+    while True:
+        assert response.status_code == 200, response.text
+        pages.append(response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            return pages
+        response = client.get(url, params={**params, "cursor": cursor})
+
+
+@pytest.mark.usefixtures("races_with_horses")
+def test_horses_cursor_pages_match_offset_pages(client):
+    params = {"limit": 4}
+    pages = _walk(client, "/general/horses/", params)
+
+    offset_pages = [
+        client.get("/general/horses/", params={**params, "page": n}).json()
+        for n in range(1, len(pages) + 1)
+    ]
+    ids = [h["id"] for page in pages for h in page]
+    assert pages == offset_pages
+    assert len(ids) == len(set(ids)) == 35
+
+
+@pytest.mark.usefixtures("races_with_horses")
+def test_horses_cursor_keeps_filters(client):
+    pages = _walk(client, "/general/horses/", {"limit": 3, "jockey": "aguirre"})
+
+    horses = [h for page in pages for h in page]
+    assert len(horses) == 14
+    assert {h["jockey"] for h in horses} == {"Aguirre R."}
+
+
+def test_races_cursor_walks_every_race_once(client, races_with_horses):
+    body = client.get("/general/races/", params={"limit": 3}).json()
+    assert body["count"] == 7
+    seen = [r["race_id"] for r in body["results"]]
+    while body["next_cursor"] is not None:
+        params = {"limit": 3, "cursor": body["next_cursor"], "total": "none"}
+        body = client.get("/general/races/", params=params).json()
+        seen.extend(r["race_id"] for r in body["results"])
+
+    assert sorted(seen) == sorted(str(r.race_id) for r in races_with_horses)
+    assert len(seen) == 7
+
+
+@pytest.mark.usefixtures("races_with_horses")
+def test_races_total_can_be_skipped(client):
+    body = client.get("/general/races/", params={"total": "none"}).json()
+
+    assert body["count"] is None
+    assert len(body["results"]) == 7
+
+
+def test_invalid_cursor_is_rejected(client):
+    assert client.get("/general/horses/", params={"cursor": "nope"}).status_code == 400
+    assert client.get("/general/races/", params={"cursor": "W10"}).status_code == 400
+
+
+def test_races_filtered_by_hipodromo_and_dates(client, session, races_with_horses):
+    races_with_horses[0].race_date = date(2025, 10, 25)
+    races_with_horses[1].hipodromo = "Palermo"
+    session.add_all(races_with_horses[:2])
+    session.commit()
+
+    params = {"hipodromo": "san-isidro", "desde": "2025-11-01", "hasta": "2025-11-30"}
+    body = client.get("/general/races/", params=params).json()
+
+    assert body["count"] == 5
+    assert sorted(r["numero"] for r in body["results"]) == [3, 4, 5, 6, 7]
+    response = client.get("/general/races/", params={"hipodromo": "la-plata"})
+    assert response.status_code == 400
@@ -0,0 +1,49 @@
+import uuid
+
+
+def test_race_detail_is_one_query(client, count_queries, races_with_horses):
+    race_id = str(races_with_horses[0].race_id)
+
+    with count_queries() as statements:
+        response = client.get(f"/general/races/{race_id}")
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["race"]["race_id"] == race_id
+    assert sorted(h["nombre"] for h in body["horses"]) == [
+        f"CABALLO 1-{i}" for i in range(1, 6)
+    ]
+    assert len(statements) == 1
+
+
+def test_race_detail_not_found(client):
+    response = client.get(f"/general/races/{uuid.uuid4()}")
+
+    assert response.status_code == 404
+
+
+def test_races_details_batch(client, count_queries, races_with_horses):
+    wanted = [races_with_horses[3], races_with_horses[1], races_with_horses[5]]
+    ids = [str(r.race_id) for r in wanted]
+
+    with count_queries() as statements:
+        response = client.get(
+            "/general/races/details", params={"ids": [*ids, str(uuid.uuid4())]}
+        )
+
+    assert response.status_code == 200
+    details = response.json()
+    assert [d["race"]["race_id"] for d in details] == ids
+    assert all(len(d["horses"]) == 5 for d in details)
+    assert all(
+        h["race_id"] == d["race"]["race_id"] for d in details for h in d["horses"]
+    )
+    assert len(statements) == 2
+
+
+def test_races_details_limit(client):
+    ids = [str(uuid.uuid4()) for _ in range(51)]
+
+    response = client.get("/general/races/details", params={"ids": ids})
+
+    assert response.status_code == 400
@@ -0,0 +1,63 @@
+import uuid
+
+import pytest
+from sqlmodel import Session
+
+from turf_backend.models.turf import Horse, Race
+
+RUNNERS = [
+    ("NIÑO OSCURO", "Aguirre R."),
+    ("PASO NEVADO", "Banegas K."),
+    ("PASO FINO", "Muñoz J."),
+    ("LUNA ROJA", "Almada G."),
+]
+
+
+@pytest.fixture
+def horses(session: Session) -> None:
+    race = Race(race_id=uuid.uuid4(), numero=1, fecha="01/11/2025")
+    session.add(race)
+    session.add_all(
+        Horse(race_id=race.race_id, numero=str(i), page=1, nombre=n, jockey=j)
+        for i, (n, j) in enumerate(RUNNERS, start=1)
+    )
+    session.commit()
+
+
+def _names(response) -> list[str]:
+    assert response.status_code == 200, response.text
+    return [h["nombre"] for h in response.json()]
+
+
+@pytest.mark.usefixtures("horses")
+def test_filters_ignore_case_and_accents(client):
+    assert _names(client.get("/general/horses/", params={"nombre": "nino"})) == [
+        "NIÑO OSCURO"
+    ]
+    assert _names(client.get("/general/horses/", params={"jockey": "MUNOZ"})) == [
+        "PASO FINO"
+    ]
+
+
+@pytest.mark.usefixtures("horses")
+def test_filter_wildcards_are_literal(client):
+    assert _names(client.get("/general/horses/", params={"nombre": "%"})) == []
+
+
+@pytest.mark.usefixtures("horses")
+def test_search_ranks_by_similarity(client):
+    response = client.get("/general/horses/search", params={"q": "paso nevao"})
+
+    assert response.status_code == 200
+    results = response.json()
+    assert [r["horse"]["nombre"] for r in results] == ["PASO NEVADO", "PASO FINO"]
+    assert results[0]["score"] > results[1]["score"]
+
+
+@pytest.mark.usefixtures("horses")
+def test_search_by_jockey(client):
+    response = client.get(
+        "/general/horses/search", params={"q": "aguire", "field": "jockey"}
+    )
+
+    assert [r["horse"]["nombre"] for r in response.json()] == ["NIÑO OSCURO"]
@@ -0,0 +1,69 @@
+from pathlib import Path
+from uuid import UUID
+
+from sqlmodel import Session
+
+from tests.services.pdf.conftest import build_pdf
+from turf_backend.core.config.settings import settings
+from turf_backend.models.turf import ImportJob, PdfImport
+from turf_backend.services.import_jobs import PALERMO_UPLOAD
+from turf_backend.services.jobs import run_pending
+
+PDF = build_pdf([[(20, 20, "PROGRAMA OFICIAL")]])
+
+
+def _upload(client, content: bytes = PDF):
+    return client.post(
+        "/palermo/upload-pdf/",
+        files={"file": ("programa.pdf", content, "application/pdf")},
+    )
+
+
+def test_upload_is_spooled_for_the_job(client, session: Session, monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "job_spool_dir", str(tmp_path))
+
+    response = _upload(client)
+
+    assert response.status_code == 202
+    job = response.json()
+    assert job["kind"] == PALERMO_UPLOAD
+    spooled = Path(job["params"]["path"])
+    assert spooled.parent == tmp_path
+    assert spooled.read_bytes() == PDF
+    # The PDF is read from disk by the job, not kept in its row
+    assert session.get(ImportJob, UUID(job["id"])).payload is None
+
+    assert run_pending(session.get_bind()) == 1
+    assert not spooled.exists()
+    assert session.get(PdfImport, 1).filename == "programa.pdf"
+    assert _upload(client).status_code == 409
+    assert not list(tmp_path.iterdir())
+
+
+def test_upload_without_spool_dir_goes_in_the_job_row(
+    client, session: Session, monkeypatch
+):
+    monkeypatch.setattr(settings, "job_spool_dir", "")
+
+    job = _upload(client).json()
+
+    assert "path" not in job["params"]
+    assert session.get(ImportJob, UUID(job["id"])).payload == PDF
+    assert run_pending(session.get_bind()) == 1
+    assert session.get(PdfImport, 1) is not None
+
+
+def test_upload_spooled_out_of_reach_of_the_worker_fails(
+    client, session: Session, monkeypatch, tmp_path
+):
+    monkeypatch.setattr(settings, "job_spool_dir", str(tmp_path))
+    job = _upload(client).json()
+    # As seen from a worker on another host
+    Path(job["params"]["path"]).unlink()
+
+    assert run_pending(session.get_bind()) == 1
+
+    failed = session.get(ImportJob, UUID(job["id"]))
+    session.refresh(failed)
+    assert failed.status == "failed"
+    assert "JOB_SPOOL_DIR" in failed.message
@@ -0,0 +1,30 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine
+
+from turf_backend.database import get_connection
+from turf_backend.main import app
+
+
+@pytest.fixture
+def session():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+
+
+@pytest.fixture
+def client(session: Session):
+    def override_get_connection():
+        yield session
+
+    app.dependency_overrides[get_connection] = override_get_connection
+    # Not entered as a context manager, so the lifespan's job workers stay off
+    yield TestClient(app)
+    app.dependency_overrides.clear()
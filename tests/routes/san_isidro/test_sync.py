@@ -0,0 +1,54 @@
+from sqlmodel import Session
+
+from turf_backend.services.import_jobs import SYNC_ALL, SYNC_HISTORICAL
+from turf_backend.services.jobs import run_pending
+from turf_backend.services.san_isidro import scraper
+
+
+def _job(client, job_id: str) -> dict:
+    response = client.get(f"/jobs/{job_id}")
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_sync_all_queues_a_single_job(client, session: Session, monkeypatch):
+    monkeypatch.setattr(scraper, "get_orange_days", list)
+
+    response = client.post("/san-isidro/sync-all")
+
+    assert response.status_code == 202
+    job = response.json()
+    assert (job["kind"], job["status"]) == (SYNC_ALL, "queued")
+    # Asked again while it is queued, the same job is returned
+    assert client.post("/san-isidro/sync-all").json()["id"] == job["id"]
+
+    assert run_pending(session.get_bind()) == 1
+    assert _job(client, job["id"])["status"] == "done"
+
+
+def test_sync_historical_queues_the_range(client, session: Session, monkeypatch):
+    monkeypatch.setattr(scraper, "get_resultados_days", lambda _start, _end: [])
+
+    response = client.post(
+        "/san-isidro/sync-historical",
+        params={"start": "2025-01-01", "end": "2025-01-31"},
+    )
+
+    assert response.status_code == 202
+    job = response.json()
+    assert job["kind"] == SYNC_HISTORICAL
+    assert job["params"] == {"start": "2025-01-01", "end": "2025-01-31", "full": False}
+
+    run_pending(session.get_bind())
+    done = _job(client, job["id"])
+    assert done["status"] == "done"
+    assert done["message"] == "No se encontraron días de resultados en ese rango"
+
+
+def test_sync_historical_rejects_an_inverted_range(client):
+    response = client.post(
+        "/san-isidro/sync-historical",
+        params={"start": "2025-02-01", "end": "2025-01-01"},
+    )
+
+    assert response.status_code == 400
@@ -0,0 +1,100 @@
+import uuid
+
+import pytest
+
+from turf_backend.services.palermo.palermo_processing import (
+    _bucket_row,
+    _parse_horse_row,
+    extract_horses_from_pages,
+)
+from turf_backend.services.pdf.pages import PdfPage
+
+
+def _word(text: str, x0: float, top: float = 100.0) -> dict:
+    return {"text": text, "x0": x0, "top": top}
+
+
+def _horse_row(numero: int, top: float = 100.0, ultimas=("1A", "2S")) -> list[dict]:
+    x = iter(range(112, 165, 12))
+    return [
+        *(_word(u, next(x), top) for u in ultimas),
+        _word(str(numero), 170, top),
+        _word("LUNA", 190, top),
+        _word("DE", 215, top),
+        _word("ORO", 230, top),
+        _word("56.5", 260, top),
+        _word("97", 280, top),
+        _word("J.", 297, top),
+        _word("PEREZ", 310, top),
+        _word("Z", 385, top),
+        _word("4", 396, top),
+        _word("BAL-", 403, top),
+        _word("LUNERA", 430, top),
+        _word("E.", 496, top),
+        _word("GOMEZ", 510, top),
+    ]
+
+
+def test_words_are_bucketed_by_their_left_edge():
+    columns = _bucket_row(_horse_row(7))
+
+    assert columns[0] == []
+    assert columns[1] == ["1A", "2S"]
+    assert columns[2] == ["7"]
+    assert columns[3] == ["LUNA", "DE", "ORO", "56.5", "97"]
+    assert columns[4] == ["J.", "PEREZ"]
+    assert columns[5:] == [["Z"], ["4"], ["BAL-", "LUNERA"], ["E.", "GOMEZ"]]
+
+
+def test_horse_row_is_decoded_from_its_columns():
+    race_id = uuid.uuid4()
+
+    horse = _parse_horse_row(_horse_row(7, top=135.0), race_id, 2, "LA MADRUGADA")
+
+    assert horse.race_id == race_id
+    assert (horse.page, horse.line_index) == (2, 10)
+    assert horse.ultimas == "1A 2S"
+    assert horse.numero == "7"
+    assert horse.nombre == "LUNA DE ORO"
+    assert horse.peso == 56
+    assert horse.jockey == "J. PEREZ"
+    assert horse.padre_madre == "BAL- LUNERA"
+    assert horse.entrenador == "E. GOMEZ"
+    assert horse.caballeriza == "LA MADRUGADA"
+
+
+@pytest.mark.parametrize(
+    "row",
+    [
+        [],
+        # No ultimas codes
+        _horse_row(7, ultimas=("X",)),
+        # Numero is not a number
+        [_word("DEBUTA", 112), _word("A", 170), _word("LUNA", 190), _word("56", 260)],
+        # No peso
+        [_word("DEBUTA", 112), _word("7", 170), _word("LUNA", 190)],
+    ],
+)
+def test_rows_that_are_not_horses_are_skipped(row):
+    assert _parse_horse_row(row, uuid.uuid4(), 0, None) is None
+
+
+def test_races_split_when_numero_restarts():
+    page = PdfPage(
+        index=0,
+        words=[
+            _word("LA", 20, 86),
+            _word("MADRUGADA", 40, 86),
+            *_horse_row(1, top=100),
+            *_horse_row(2, top=114),
+            _word("1400", 20, 128),
+            _word("mts.", 50, 128),
+            *_horse_row(1, top=142),
+        ],
+    )
+
+    horses = extract_horses_from_pages([page])
+
+    assert [h.numero for h in horses] == ["1", "2", "1"]
+    assert horses[0].race_id == horses[1].race_id != horses[2].race_id
+    assert {h.caballeriza for h in horses} == {"LA MADRUGADA"}
@@ -0,0 +1,186 @@
+from pathlib import Path
+
+import pytest
+
+_PAGE_WIDTH = 842
+_PAGE_HEIGHT = 595
+
+
+def build_pdf(pages: list[list[tuple[float, float, str]]]) -> bytes:
+    """
+    Build a minimal PDF with Helvetica text, one (x0, top, text) tuple per word.
+    Coordinates use pdfplumber's convention (top measured from the page top).
+    """
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"",  # pages tree, filled in once the page ids are known
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica "
+        b"/Encoding /WinAnsiEncoding >>",
+    ]
+    page_ids = []
+    for words in pages:
+        stream = "".join(
+            f"BT /F1 8 Tf {x0} {_PAGE_HEIGHT - top - 8} Td ({text}) Tj ET\n"
+            for x0, top, text in words
+        ).encode("latin-1")
+        contents_id = len(objects) + 1
+        objects.extend((
+            b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream),
+            (
+                "<< /Type /Page /Parent 2 0 R "
+                f"/MediaBox [0 0 {_PAGE_WIDTH} {_PAGE_HEIGHT}] "
+                f"/Resources << /Font << /F1 3 0 R >> >> /Contents {contents_id} 0 R >>"
+            ).encode(),
+        ))
+        page_ids.append(len(objects))
+
+    kids = " ".join(f"{i} 0 R" for i in page_ids)
+    objects[1] = f"<< /Type /Pages /Kids [{kids}] /Count {len(page_ids)} >>".encode()
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1,
+        xref,
+    )
+    return bytes(out)
+
+
+@pytest.fixture
+def sample_pdf(tmp_path: Path) -> str:
+    pages = [
+        [(20, 20 + 14 * line, f"PAGINA {page} LINEA {line}") for line in range(6)]
+        + [(300, 20, "JOCKEY"), (420, 20, "KG")]
+        for page in range(5)
+    ]
+    path = tmp_path / "programa.pdf"
+    path.write_bytes(build_pdf(pages))
+    return str(path)
+
+
+@pytest.fixture
+def program_pdf(tmp_path: Path) -> str:
+    # A cover without the table, then pages with text left and right of it
+    cover = [(20, 40, "PROGRAMA"), (600, 300, "APUESTAS")]
+    table = [
+        (100, 20, "1"),
+        (120, 20, "Premio"),
+        (100, 40, "EJEMP"),
+        (300, 40, "JOCKEY"),
+        (420, 40, "KG"),
+        (100, 54, "01"),
+        (300, 54, "PEREZ"),
+        (420, 54, "56.00"),
+        (20, 54, "BONO"),
+        (650, 200, "POZOS"),
+    ]
+    path = tmp_path / "programa.pdf"
+    path.write_bytes(build_pdf([cover, table, table, table]))
+    return str(path)
+
+
+def _palermo_horse(top: float, numero: int, trainer: str) -> list:
+    return [
+        (20, top - 14, "STUD"),
+        (45, top - 14, "ESTRELLA"),
+        (112, top, "1A"),
+        (126, top, "2S"),
+        (170, top, str(numero)),
+        (190, top, "LUNA"),
+        (215, top, f"N{numero}"),
+        (260, top, "56.5"),
+        (300, top, "J."),
+        (310, top, "PEREZ"),
+        (385, top, "Z"),
+        (396, top, "4"),
+        (405, top, "BAL-LUNERA"),
+        (500, top, "E."),
+        (512, top, trainer),
+    ]
+
+
+@pytest.fixture
+def palermo_program_pdf(tmp_path: Path) -> str:
+    # The "Caballeriza 5 Ultimas" header only heads the left columns
+    pages = []
+    for race in (1, 2):
+        page = [
+            (20, 20, f"{race}ª"),
+            (32, 20, "Carrera"),
+            (20, 34, "Premio:"),
+            (55, 34, f"CLASICO{race}"),
+            (20, 48, "1400"),
+            (45, 48, "metros"),
+            (300, 48, "13:00"),
+            (325, 48, "Hs."),
+            (20, 62, "Caballeriza"),
+            (70, 62, "5"),
+            (78, 62, "Ultimas"),
+            (700, 300, "POZOS"),
+        ]
+        for numero in range(1, 4):
+            page += _palermo_horse(62 + 28 * numero, numero, "ETCHEVERRY")
+        pages.append(page)
+    path = tmp_path / "palermo.pdf"
+    path.write_bytes(build_pdf([[(20, 40, "PROGRAMA")], *pages]))
+    return str(path)
+
+
+def _san_isidro_horse(top: float, numero: int) -> list:
+    return [
+        (30, top, f"{numero:02d}"),
+        (60, top, "PASO"),
+        (90, top, f"N{numero}"),
+        (150, top, "M"),
+        (170, top, "LA"),
+        (185, top, "ESTRELLA"),
+        (320, top, "ALMADA"),
+        (358, top, "G."),
+        (422, top, "56.00"),
+        (460, top, "PEREZ"),
+        (495, top, "J."),
+        (510, top, "4"),
+        (520, top, "BAL-LUNERA"),
+        (680, top, "1A2S"),
+        (734, top, "HARAS"),
+        (766, top, "LA"),
+        (780, top, "PROVIDENCIA"),
+    ]
+
+
+@pytest.fixture
+def san_isidro_program_pdf(tmp_path: Path) -> str:
+    pages = []
+    for race in (1, 2):
+        page = [
+            (30, 20, f"{race}ª"),
+            (42, 20, "-"),
+            (50, 20, "Premio"),
+            (80, 20, f"CLASICO{race}"),
+            (130, 20, "-"),
+            (138, 20, "13:45"),
+            (162, 20, "hs."),
+            (30, 34, "1200"),
+            (52, 34, "metros"),
+            (90, 34, "Pista"),
+            (112, 34, "Arena"),
+            (30, 50, "Nº"),
+            (60, 50, "EJEMPLAR"),
+            (170, 50, "STUD"),
+            (363, 50, "JOCKEY"),
+            (427, 50, "KG"),
+            (460, 50, "ENTRENADOR"),
+            (734, 50, "L.CUIDA"),
+        ]
+        for numero in range(1, 4):
+            page += _san_isidro_horse(50 + 14 * numero, numero)
+        pages.append(page)
+    path = tmp_path / "san_isidro.pdf"
+    path.write_bytes(build_pdf([[(20, 40, "PROGRAMA")], *pages]))
+    return str(path)
@@ -0,0 +1,121 @@
+import io
+from datetime import date
+from pathlib import Path
+
+import pytest
+from pypdf import PdfReader
+
+from tests.services.pdf.conftest import build_pdf
+from turf_backend.core.config.settings import settings
+from turf_backend.services.pdf.backends import open_pdf
+from turf_backend.services.pdf.layout import LayoutProfile
+from turf_backend.services.pdf.pages import iter_pdf_pages
+from turf_backend.utils.date import program_race_date
+
+# pdfium's font boxes sit a fraction of a point higher than pdfminer's
+TOP_TOLERANCE = 0.5
+
+LAYOUT = LayoutProfile(anchors=("JOCKEY", "KG"), left_margin=10, right_margin=40)
+
+
+def _all_words(source, backend, bbox=None) -> list[list[dict]]:
+    with open_pdf(source, backend) as pdf:
+        return [pdf.words(i, bbox) for i in range(len(pdf))]
+
+
+def assert_same_words(expected: list[dict], actual: list[dict]) -> None:
+    assert [w["text"] for w in actual] == [w["text"] for w in expected]
+    for want, got in zip(expected, actual, strict=True):
+        assert set(got) == set(want)
+        assert got["x0"] == pytest.approx(want["x0"], abs=0.01)
+        assert got["x1"] == pytest.approx(want["x1"], abs=0.01)
+        assert got["top"] == pytest.approx(want["top"], abs=TOP_TOLERANCE)
+        assert got["doctop"] == pytest.approx(want["doctop"], abs=TOP_TOLERANCE)
+
+
+@pytest.fixture
+def accents_pdf(tmp_path: Path) -> str:
+    page = [
+        (20, 20, "HIPODROMO DE SAN ISIDRO"),
+        (20, 40, "REUNION Nº 52 Sábado, 1 de Noviembre de 2025."),
+        # A row whose words sit slightly off a common baseline
+        (112, 60, "1A 2S"),
+        (170, 61.5, "7"),
+        (190, 59, "ÑANDÚ"),
+        (215, 60, "56.5"),
+    ]
+    path = tmp_path / "reunion.pdf"
+    path.write_bytes(build_pdf([page, page]))
+    return str(path)
+
+
+@pytest.mark.parametrize("pdf", ["sample_pdf", "program_pdf", "accents_pdf"])
+def test_pdfium_words_match_pdfplumber(pdf, request):
+    path = request.getfixturevalue(pdf)
+
+    expected = _all_words(path, "pdfplumber")
+    actual = _all_words(path, "pdfium")
+
+    assert len(actual) == len(expected)
+    for want, got in zip(expected, actual, strict=True):
+        assert_same_words(want, got)
+
+
+def test_pdfium_crop_box_matches_pdfplumber(program_pdf: str):
+    bbox = (90.0, 0.0, 460.0, 595.0)
+
+    expected = _all_words(program_pdf, "pdfplumber", bbox)
+    actual = _all_words(program_pdf, "pdfium", bbox)
+
+    for want, got in zip(expected, actual, strict=True):
+        assert_same_words(want, got)
+
+
+@pytest.mark.parametrize("workers", [0, 3])
+def test_pages_match_across_backends(program_pdf: str, workers: int):
+    def pages(backend):
+        return list(
+            iter_pdf_pages(program_pdf, 1, workers, layout=LAYOUT, backend=backend)
+        )
+
+    expected, actual = pages("pdfplumber"), pages("pdfium")
+
+    assert [p.index for p in actual] == [p.index for p in expected]
+    for want, got in zip(expected, actual, strict=True):
+        assert_same_words(want.words, got.words)
+        assert got.lines == want.lines
+
+
+def test_pdfium_reads_pdf_content_too(accents_pdf: str):
+    content = Path(accents_pdf).read_bytes()
+
+    with open_pdf(content, "pdfium") as pdf:
+        assert len(pdf) == 2
+        assert pdf.page_size(0) == (842, 595)
+        assert pdf.text(0).splitlines()[1] == (
+            "REUNION Nº 52 Sábado, 1 de Noviembre de 2025."
+        )
+
+
+@pytest.mark.parametrize("backend", ["pdfplumber", "pdfium"])
+def test_program_race_date_reads_the_first_page(accents_pdf: str, backend, monkeypatch):
+    monkeypatch.setattr(settings, "pdf_backend", backend)
+
+    assert program_race_date(Path(accents_pdf).read_bytes()) == date(2025, 11, 1)
+    assert program_race_date(accents_pdf) == date(2025, 11, 1)
+    assert program_race_date(build_pdf([[(20, 20, "PROGRAMA")]])) is None
+    assert program_race_date(b"not a pdf") is None
+
+
+@pytest.mark.parametrize("backend", ["pdfplumber", "pdfium"])
+def test_date_line_matches_the_pypdf_text(accents_pdf: str, backend):
+    content = Path(accents_pdf).read_bytes()
+    # The date used to be read from the text pypdf extracts
+    expected = PdfReader(io.BytesIO(content)).pages[0].extract_text().splitlines()
+
+    with open_pdf(content, backend) as pdf:
+        lines = pdf.text(0).splitlines()
+
+    assert [line for line in lines if line.startswith("REUNION")] == [
+        line for line in expected if line.startswith("REUNION")
+    ]
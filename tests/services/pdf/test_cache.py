@@ -0,0 +1,120 @@
+import uuid
+
+import pytest
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from turf_backend.core.config.settings import settings
+from turf_backend.models.turf import Horse, ParsedPdfCache
+from turf_backend.services.pdf.cache import (
+    deserialize_program,
+    parse_with_cache,
+    serialize_program,
+)
+from turf_backend.services.pdf.pages import ParsedProgram
+
+
+@pytest.fixture
+def session():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+
+
+def _program(n_races: int = 2) -> ParsedProgram:
+    program = ParsedProgram()
+    for numero in range(1, n_races + 1):
+        race_id = uuid.uuid4()
+        program.races[race_id] = {
+            "numero": numero,
+            "nombre": f"PREMIO {numero}",
+            "hora": "13:45",
+            "distancia": "1200",
+            "pista": None,
+            "hipodromo": "San Isidro",
+        }
+        program.horses.extend(
+            Horse(
+                race_id=race_id,
+                page=numero,
+                numero=f"{i:02d}",
+                nombre=f"CABALLO {i}",
+                peso=56,
+            )
+            for i in range(1, 4)
+        )
+    return program
+
+
+def test_serialize_roundtrip_keeps_horses_and_races():
+    program = _program()
+
+    loaded = deserialize_program(serialize_program(program))
+
+    assert [(h.page, h.numero, h.nombre, h.peso) for h in loaded.horses] == [
+        (h.page, h.numero, h.nombre, h.peso) for h in program.horses
+    ]
+    assert list(loaded.races.values()) == list(program.races.values())
+    # Fresh race ids, but horses still grouped under their race
+    assert set(loaded.races).isdisjoint(program.races)
+    assert [h.race_id for h in loaded.horses[:3]] == [next(iter(loaded.races))] * 3
+
+
+def test_parse_with_cache_only_parses_once(session: Session):
+    calls = []
+
+    def parse(pdf_path: str) -> ParsedProgram:
+        calls.append(pdf_path)
+        return _program()
+
+    first = parse_with_cache(session, "abc", "san_isidro-1", parse, "a.pdf")
+    second = parse_with_cache(session, "abc", "san_isidro-1", parse, "a.pdf")
+
+    assert calls == ["a.pdf"]
+    assert len(second.horses) == len(first.horses)
+
+
+def test_parser_version_bump_misses_the_cache(session: Session):
+    calls = []
+
+    def parse(pdf_path: str) -> ParsedProgram:
+        calls.append(pdf_path)
+        return _program()
+
+    parse_with_cache(session, "abc", "san_isidro-1", parse, "a.pdf")
+    parse_with_cache(session, "abc", "san_isidro-2", parse, "a.pdf")
+
+    assert len(calls) == 2
+
+
+def test_cropped_and_full_page_parses_are_cached_apart(session: Session, monkeypatch):
+    calls = []
+
+    def parse(pdf_path: str) -> ParsedProgram:
+        calls.append(pdf_path)
+        return _program()
+
+    for crop in (False, True, False, True):
+        monkeypatch.setattr(settings, "pdf_crop_to_table", crop)
+        parse_with_cache(session, "abc", "san_isidro-3", parse, "a.pdf")
+
+    assert len(calls) == 2
+
+
+def test_least_recently_used_entries_are_evicted(session: Session, monkeypatch):
+    entry_size = len(serialize_program(_program()))
+    monkeypatch.setattr(settings, "parse_cache_max_bytes", entry_size * 2 + 10)
+
+    parse_with_cache(session, "one", "v1", lambda _: _program(), "one.pdf")
+    parse_with_cache(session, "two", "v1", lambda _: _program(), "two.pdf")
+    # Touch "one" so "two" becomes the least recently used entry
+    parse_with_cache(session, "one", "v1", lambda _: _program(), "one.pdf")
+    parse_with_cache(session, "three", "v1", lambda _: _program(), "three.pdf")
+
+    cached = set(session.exec(select(ParsedPdfCache.file_hash)).all())
+    assert cached == {"one", "three"}
@@ -0,0 +1,118 @@
+import pytest
+
+from turf_backend.core.config.settings import settings
+from turf_backend.services.palermo import palermo_processing
+from turf_backend.services.pdf.layout import LayoutProfile, within
+from turf_backend.services.pdf.pages import iter_pdf_pages
+from turf_backend.services.san_isidro import sanisidro_processing
+
+LAYOUT = LayoutProfile(anchors=("JOCKEY", "KG"), left_margin=10, right_margin=40)
+
+
+@pytest.fixture
+def crop(monkeypatch):
+    # Off by default until checked against real programs
+    monkeypatch.setattr(settings, "pdf_crop_to_table", True)
+
+
+def _word(text: str, x0: float, top: float, x1: float | None = None) -> dict:
+    x1 = x0 + 20 if x1 is None else x1
+    return {"text": text, "x0": x0, "x1": x1, "top": top, "bottom": top + 8}
+
+
+def _texts(pages) -> list[list[str]]:
+    return [[w["text"] for w in page.words] for page in pages]
+
+
+def test_table_bbox_spans_the_header_row_and_the_whole_height():
+    words = [
+        _word("PROGRAMA", 20, 10),
+        _word("EJEMP", 100, 40),
+        _word("JOCKEY", 300, 40, 330),
+        _word("KG", 420, 40, 432),
+        _word("PEREZ", 300, 54),
+    ]
+
+    assert LAYOUT.table_bbox(words, 842, 595) == (90, 0, 472, 595)
+
+
+def test_table_bbox_is_clamped_to_the_page():
+    words = [_word("JOCKEY", 5, 40), _word("KG", 820, 40, 835)]
+
+    assert LAYOUT.table_bbox(words, 842, 595) == (0, 0, 842, 595)
+
+
+def test_page_without_header_row_has_no_table():
+    words = [_word("JOCKEY", 300, 40), _word("KG", 420, 80)]
+
+    assert LAYOUT.table_bbox(words, 842, 595) is None
+
+
+def test_within_keeps_only_words_entirely_inside():
+    words = [_word("A", 100, 10), _word("B", 80, 10), _word("C", 200, 10, 260)]
+
+    assert [w["text"] for w in within(words, (90, 0, 250, 595))] == ["A"]
+
+
+@pytest.mark.usefixtures("crop")
+def test_pages_are_cropped_once_the_table_is_found(program_pdf: str):
+    pages = list(iter_pdf_pages(program_pdf, workers=0, layout=LAYOUT))
+
+    assert _texts(pages)[0] == ["PROGRAMA", "APUESTAS"]
+    table = ["1", "Premio", "EJEMP", "JOCKEY", "KG", "01", "PEREZ", "56.00"]
+    assert _texts(pages)[1:] == [table, table, table]
+
+
+@pytest.mark.usefixtures("crop")
+def test_cropped_parallel_extraction_matches_serial(program_pdf: str):
+    serial = list(iter_pdf_pages(program_pdf, 1, workers=0, layout=LAYOUT))
+    parallel = list(iter_pdf_pages(program_pdf, 1, workers=3, layout=LAYOUT))
+
+    assert [p.words for p in parallel] == [p.words for p in serial]
+
+
+def test_cropping_can_be_turned_off(program_pdf: str, monkeypatch):
+    monkeypatch.setattr(settings, "pdf_crop_to_table", False)
+
+    pages = list(iter_pdf_pages(program_pdf, 1, workers=0, layout=LAYOUT))
+
+    assert "POZOS" in _texts(pages)[0]
+
+
+def test_table_bbox_can_end_past_a_fixed_column():
+    layout = LayoutProfile(anchors=("JOCKEY", "KG"), right_edge=500, right_margin=40)
+    words = [_word("JOCKEY", 300, 40, 330), _word("KG", 420, 40, 432)]
+
+    assert layout.table_bbox(words, 842, 595) == (288, 0, 540, 595)
+
+
+def _parsed(parser, pdf_path: str) -> tuple[list[dict], list[dict]]:
+    program = parser.parse_pdf_program(pdf_path, workers=0)
+    horses = [
+        h.model_dump(exclude={"id", "race_id", "created_at"}) for h in program.horses
+    ]
+    return list(program.races.values()), horses
+
+
+@pytest.mark.parametrize("backend", ["pdfplumber", "pdfium"])
+@pytest.mark.parametrize(
+    ("parser", "fixture"),
+    [
+        (palermo_processing, "palermo_program_pdf"),
+        (sanisidro_processing, "san_isidro_program_pdf"),
+    ],
+    ids=["palermo", "san_isidro"],
+)
+def test_cropped_parse_matches_the_full_page(
+    parser, fixture: str, backend: str, request, monkeypatch
+):
+    pdf_path = request.getfixturevalue(fixture)
+    monkeypatch.setattr(settings, "pdf_backend", backend)
+
+    monkeypatch.setattr(settings, "pdf_crop_to_table", False)
+    full_page = _parsed(parser, pdf_path)
+    monkeypatch.setattr(settings, "pdf_crop_to_table", True)
+    cropped = _parsed(parser, pdf_path)
+
+    assert len(full_page[1]) == 6
+    assert cropped == full_page
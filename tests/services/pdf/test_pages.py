@@ -0,0 +1,70 @@
+import uuid
+
+from turf_backend.models.turf import Horse
+from turf_backend.services.pdf.pages import (
+    ParsedProgram,
+    PdfPage,
+    batch_races,
+    iter_pdf_pages,
+    words_to_lines,
+)
+
+
+def _word(text: str, x0: float, top: float) -> dict:
+    return {"text": text, "x0": x0, "top": top}
+
+
+def test_words_to_lines_joins_words_on_the_same_line():
+    words = [
+        _word("1ª", 20, 30.0),
+        _word("-", 32, 30.4),
+        _word("Premio", 40, 29.8),
+        _word("1200", 20, 42.0),
+        _word("mts.", 40, 42.0),
+    ]
+
+    assert words_to_lines(words) == ["1ª - Premio", "1200 mts."]
+
+
+def test_words_to_lines_empty_page():
+    assert not words_to_lines([])
+
+
+def test_pdf_page_lines_are_built_from_its_words():
+    page = PdfPage(index=3, words=[_word("Caballeriza", 20, 10), _word("5", 90, 10)])
+
+    assert page.lines == ["Caballeriza 5"]
+
+
+def test_iter_pdf_pages_extracts_every_page(sample_pdf: str):
+    pages = list(iter_pdf_pages(sample_pdf, workers=0))
+
+    assert [p.index for p in pages] == [0, 1, 2, 3, 4]
+    assert pages[2].lines[0] == "PAGINA 2 LINEA 0 JOCKEY KG"
+
+
+def test_iter_pdf_pages_parallel_matches_serial(sample_pdf: str):
+    serial = list(iter_pdf_pages(sample_pdf, first_page=1, workers=0))
+    parallel = list(iter_pdf_pages(sample_pdf, first_page=1, workers=3))
+
+    assert [p.index for p in parallel] == [1, 2, 3, 4]
+    assert [p.words for p in parallel] == [p.words for p in serial]
+
+
+def _race(numero: int) -> ParsedProgram:
+    race_id = uuid.uuid4()
+    return ParsedProgram(
+        horses=[Horse(race_id=race_id, nombre=f"CABALLO {numero}")],
+        races={race_id: {"numero": numero}},
+    )
+
+
+def test_batch_races_groups_streamed_races_in_order():
+    batches = list(batch_races((_race(n) for n in range(1, 6)), 2))
+
+    assert [[r["numero"] for r in b.races.values()] for b in batches] == [
+        [1, 2],
+        [3, 4],
+        [5],
+    ]
+    assert [len(b.horses) for b in batches] == [2, 2, 1]
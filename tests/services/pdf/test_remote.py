@@ -0,0 +1,83 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine
+
+from turf_backend.models.turf import PdfImport
+from turf_backend.services.pdf.remote import (
+    PdfValidators,
+    RemotePdf,
+    last_import,
+    track_source,
+)
+
+URL = "https://example.com/programa.pdf"
+MODIFIED = "Sat, 01 Nov 2025 10:00:00 GMT"
+
+
+@pytest.fixture
+def session():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+
+
+@pytest.mark.parametrize(
+    ("known", "served", "same"),
+    [
+        (PdfValidators(etag='"a"'), PdfValidators(etag='"a"'), True),
+        (
+            PdfValidators(etag='"a"', last_modified=MODIFIED),
+            PdfValidators('"b"', MODIFIED),
+            False,
+        ),
+        (PdfValidators(None, MODIFIED, 100), PdfValidators(None, MODIFIED, 100), True),
+        (PdfValidators(None, MODIFIED, 100), PdfValidators(None, MODIFIED, 101), False),
+        (PdfValidators(None, MODIFIED, None), PdfValidators(None, MODIFIED, 100), True),
+        (PdfValidators(content_length=100), PdfValidators(content_length=100), False),
+    ],
+)
+def test_validators_match(known, served, same):
+    assert known.matches(served) is same
+
+
+def test_recorded_validators_are_found_by_url_or_calendario_id(session):
+    remote = RemotePdf(b"%PDF", PdfValidators('"v1"', MODIFIED, 4))
+    old = PdfImport(
+        file_hash="old",
+        filename="a.pdf",
+        hipodromo="san_isidro",
+        imported_at=datetime(2025, 10, 1),
+    )
+    session.add(track_source(old, RemotePdf(b"", PdfValidators('"v0"')), URL, "7098"))
+    session.add(
+        track_source(
+            PdfImport(file_hash="new", filename="a.pdf", hipodromo="san_isidro"),
+            remote,
+            URL,
+            "7098",
+        )
+    )
+    session.commit()
+
+    by_url = last_import(session, "san_isidro", source_url=URL)
+    by_id = last_import(session, "san_isidro", calendario_id="7098")
+
+    assert by_url is by_id
+    assert by_url.file_hash == "new"
+    assert PdfValidators.of(by_url) == remote.validators
+    assert last_import(session, "palermo", source_url=URL) is None
+    assert last_import(session, "san_isidro") is None
+
+
+def test_imports_without_validators_have_none():
+    assert PdfValidators.of(None) is None
+    assert (
+        PdfValidators.of(PdfImport(file_hash="x", filename="x", hipodromo="x")) is None
+    )
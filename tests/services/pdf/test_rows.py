@@ -0,0 +1,52 @@
+from turf_backend.services.pdf.rows import iter_rows
+
+
+def _word(text: str, x0: float, top: float) -> dict:
+    return {"text": text, "x0": x0, "top": top}
+
+
+def _texts(rows) -> list[list[str]]:
+    return [[w["text"] for w in row] for row in rows]
+
+
+def test_words_in_reading_order_are_split_into_rows():
+    words = [
+        _word("LA", 20, 86.0),
+        _word("MADRUGADA", 40, 86.2),
+        _word("1A", 112, 100.0),
+        _word("7", 170, 99.4),
+        _word("LUNA", 190, 100.3),
+        _word("1400", 20, 114.0),
+    ]
+
+    assert _texts(iter_rows(words)) == [
+        ["LA", "MADRUGADA"],
+        ["1A", "7", "LUNA"],
+        ["1400"],
+    ]
+
+
+def test_row_ends_when_the_next_word_is_further_right_but_lower():
+    words = [_word("STUD", 20, 86.0), _word("1A", 112, 100.0)]
+
+    assert _texts(iter_rows(words)) == [["STUD"], ["1A"]]
+
+
+def test_skewed_line_stays_in_one_row():
+    # Each word 2pt lower than the previous one: 8pt from the first to the last
+    words = [_word(t, 20 + 40 * i, 100.0 + 2 * i) for i, t in enumerate("ABCDE")]
+
+    assert _texts(iter_rows(words)) == [["A", "B", "C", "D", "E"]]
+
+
+def test_rows_are_yielded_as_they_end():
+    def words():
+        yield _word("A", 20, 100.0)
+        yield _word("B", 20, 114.0)
+        raise AssertionError  # the first row must not need the rest of the page
+
+    assert _texts([next(iter_rows(words()))]) == [["A"]]
+
+
+def test_no_words_no_rows():
+    assert not list(iter_rows([]))
@@ -0,0 +1,74 @@
+import asyncio
+import hashlib
+import io
+from pathlib import Path
+
+import pytest
+from fastapi import UploadFile
+
+from turf_backend.services.pdf import spool
+from turf_backend.services.pdf.spool import spool_chunks, spool_upload, spooled_file
+
+CONTENT = b"%PDF-1.4\n" + bytes(range(256)) * 40
+
+
+@pytest.fixture(autouse=True)
+def small_chunks(monkeypatch):
+    monkeypatch.setattr(spool, "SPOOL_CHUNK_SIZE", 1000)
+
+
+def _upload(content: bytes = CONTENT) -> UploadFile:
+    return UploadFile(io.BytesIO(content), filename="programa.pdf")
+
+
+async def _spool(
+    file: UploadFile, directory: str | None = None, *, detach: bool = False
+) -> tuple[str, str, bytes]:
+    async with spool_upload(file, directory) as upload:
+        content = Path(upload.path).read_bytes()
+        if detach:
+            upload.detach()
+        return upload.path, upload.file_hash, content
+
+
+def test_upload_is_spooled_hashed_and_deleted():
+    path, file_hash, content = asyncio.run(_spool(_upload()))
+
+    assert content == CONTENT
+    assert file_hash == hashlib.sha256(CONTENT).hexdigest()
+    assert not Path(path).exists()
+
+
+def test_detached_upload_is_kept_for_its_new_owner():
+    path, _, _ = asyncio.run(_spool(_upload(), detach=True))
+
+    with spooled_file(path) as pdf:
+        assert pdf.file_hash == hashlib.sha256(CONTENT).hexdigest()
+        assert pdf.size == len(CONTENT)
+    assert not Path(path).exists()
+
+
+def test_failed_upload_leaves_no_file(tmp_path: Path):
+    class BrokenUpload:
+        async def read(self, _size: int) -> bytes:
+            raise ConnectionResetError
+
+    with pytest.raises(ConnectionResetError):
+        asyncio.run(_spool(BrokenUpload(), str(tmp_path)))  # type: ignore[arg-type]
+
+    assert not list(tmp_path.iterdir())
+
+
+def test_spooled_chunks_are_deleted_on_error():
+    paths = []
+
+    def import_pdf():
+        with spool_chunks([CONTENT[:10], CONTENT[10:]]) as pdf:
+            paths.append(pdf.path)
+            assert Path(pdf.path).read_bytes() == CONTENT
+            raise RuntimeError
+
+    with pytest.raises(RuntimeError):
+        import_pdf()
+
+    assert not Path(paths[0]).exists()
@@ -5,11 +5,17 @@ Fixtures:
 - sample_lines: small crafted example to test edge cases
 """
 
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
+from urllib.parse import urlparse
 
 import pdfplumber
 import pytest
 
+from turf_backend.services.san_isidro import scraper
+
 HERE = Path("/Users/tomasvazquez/Develops/turf-backend/tests/services/san_isidro/files")
 PDF_PATH = HERE / "SI_PROGRAMA_OFICIAL_01-11-2025_(MODIFICADO)_7098.pdf"
 
@@ -41,3 +47,113 @@ def sample_lines():
         "1600 mts. - Pista Cesped Codo",
         "Pololo Y Pa (CDIA) 1A-0S-0A-0A  1  NIÑO OSCURO    57.0 Aguirre Ramon",
     ]
+
+
+# -----------------------------
+# STUB HTTP SERVER (hipodromosanisidro.com)
+# -----------------------------
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.server.connections.append(self.client_address)
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        self.server.requests.append(self.path)
+        path = urlparse(self.path).path
+        headers = {}
+        if path.startswith("/wacP/public/programa-oficial/"):
+            calendario_id = path.rsplit("/", 1)[-1]
+            unpublished = calendario_id in self.server.unpublished
+            version = "draft" if unpublished else "v1"
+            headers["ETag"] = f'"{calendario_id}-{version}"'
+            if self.headers.get("If-None-Match") == headers["ETag"]:
+                self.server.not_modified += 1
+                self.send_response(304)
+                self.send_header("ETag", headers["ETag"])
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            programa = f'<a href="/pdfs/SI_PROGRAMA_OFICIAL_{calendario_id}.pdf">'
+            if unpublished:
+                programa = "<a>"
+            body = (
+                "<html><body>"
+                f"{programa}Programa</a>"
+                f'<a href="/pdfs/SI_INSCRIPTOS_{calendario_id}.pdf">Inscriptos</a>'
+                "</body></html>"
+            ).encode()
+            content_type = "text/html"
+        elif path == "/wacP/public/calendario":
+            body = json.dumps([
+                {
+                    "start": "2025-11-01",
+                    "url": "/programas/?calendario_id=7098",
+                    "className": "programa-oficial",
+                },
+                {
+                    "start": "2025-10-25",
+                    "url": "/programas/?calendario_id=7090",
+                    "className": "resultados",
+                },
+            ]).encode()
+            content_type = "application/json"
+        elif path.endswith(".pdf"):
+            body = b"%PDF-1.4 " + path.encode()
+            content_type = "application/pdf"
+            headers["ETag"] = f'"{self.server.pdf_version}"'
+            headers["Last-Modified"] = "Sat, 01 Nov 2025 10:00:00 GMT"
+            if (
+                self.server.honour_conditional
+                and self.headers.get("If-None-Match") == headers["ETag"]
+            ):
+                self.server.not_modified += 1
+                self.send_response(304)
+                self.send_header("ETag", headers["ETag"])
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self.server.pdf_downloads += 1
+        else:
+            self.send_error(404)
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):  # noqa: A002
+        pass
+
+
+@pytest.fixture
+def stub_site(monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+    server.connections = []
+    server.requests = []
+    server.not_modified = 0
+    server.pdf_downloads = 0
+    server.pdf_version = "v1"
+    server.honour_conditional = True
+    # Days whose program page has no PROGRAMA_OFICIAL link yet
+    server.unpublished = set()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    base_url = f"http://127.0.0.1:{server.server_port}"
+    api_url = f"{base_url}/wacP/public"
+    monkeypatch.setattr(scraper, "BASE_URL", base_url)
+    monkeypatch.setattr(scraper, "PROGRAM_API_URL", f"{api_url}/programa-oficial/")
+    monkeypatch.setattr(scraper, "CALENDAR_API_URL", f"{api_url}/calendario")
+    monkeypatch.setattr(scraper, "_http_session", None)
+    monkeypatch.setattr(scraper, "program_pages", scraper.ProgramPageCache())
+
+    yield server
+
+    server.shutdown()
+    server.server_close()
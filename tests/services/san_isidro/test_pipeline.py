@@ -0,0 +1,139 @@
+import uuid
+from pathlib import Path
+
+import pytest
+from sqlmodel import Session, SQLModel, create_engine, func, select
+
+from turf_backend.models.turf import Horse, PdfImport, Race, SyncDay
+from turf_backend.services.pdf.pages import ParsedProgram
+from turf_backend.services.san_isidro import scraper
+from turf_backend.services.san_isidro.pipeline import SyncPipeline
+from turf_backend.services.sync_state import pending_days
+
+DAYS = [
+    ("2025-10-18", "7084"),
+    ("2025-10-25", "7090"),
+    ("2025-11-01", "7098"),
+]
+
+
+def fake_parse(pdf_path: str) -> ParsedProgram:
+    """One race with two horses named after the PDF (module level, so it pickles)."""
+    content = Path(pdf_path).read_bytes()
+    if b"7090" in content:
+        msg = "PDF roto"
+        raise ValueError(msg)
+    name = content.rsplit(b"_", 1)[-1].decode().removesuffix(".pdf")
+    race_id = uuid.uuid4()
+    race = {
+        "numero": 1,
+        "nombre": f"PREMIO {name}",
+        "hora": "13:00",
+        "distancia": "1200",
+        "pista": None,
+        "hipodromo": "San Isidro",
+    }
+    horses = [
+        Horse(race_id=race_id, page=1, numero=str(i), nombre=f"{name} {i}")
+        for i in (1, 2)
+    ]
+    return ParsedProgram(horses=horses, races={race_id: race})
+
+
+@pytest.fixture
+def engine(tmp_path):
+    # A file, not :memory:, since the stages use their own connections
+    engine = create_engine(f"sqlite:///{tmp_path / 'sync.db'}")
+    SQLModel.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+def _by_fecha(results: list[dict]) -> dict[str, dict]:
+    return {r["fecha"]: r for r in results}
+
+
+@pytest.mark.usefixtures("stub_site")
+@pytest.mark.parametrize("workers", [1, 2])
+def test_days_flow_through_every_stage(engine, workers):
+    pipeline = SyncPipeline(
+        engine, parse=fake_parse, parse_workers=workers, queue_size=1, checkpoint=True
+    )
+
+    results = _by_fecha(pipeline.run(DAYS))
+
+    assert results["2025-10-18"] == {
+        "fecha": "2025-10-18",
+        "status": "imported",
+        "inserted": 2,
+    }
+    assert results["2025-10-25"]["status"] == "error"
+    assert results["2025-11-01"]["status"] == "imported"
+    with Session(engine) as session:
+        assert session.exec(select(func.count()).select_from(Race)).one() == 2
+        assert session.exec(select(func.count()).select_from(Horse)).one() == 4
+        imports = session.exec(select(PdfImport)).all()
+        assert {i.calendario_id for i in imports} == {"7084", "7098"}
+        assert all(i.etag == '"v1"' for i in imports)
+        statuses = dict(
+            session.exec(select(SyncDay.calendario_id, SyncDay.status)).all()
+        )
+        assert statuses == {"7084": "imported", "7090": "error", "7098": "imported"}
+
+
+def test_unchanged_pdfs_are_not_downloaded_again(stub_site, engine):
+    SyncPipeline(engine, parse=fake_parse).run(DAYS)
+    downloads = stub_site.pdf_downloads
+
+    results = _by_fecha(SyncPipeline(engine, parse=fake_parse).run(DAYS))
+
+    assert results["2025-10-18"]["reason"] == "not modified"
+    assert results["2025-11-01"]["reason"] == "not modified"
+    # The day that failed to parse has no import to compare against
+    assert results["2025-10-25"]["status"] == "error"
+    assert stub_site.pdf_downloads == downloads + 1
+
+
+def test_day_without_pdf_is_retried(stub_site, engine, monkeypatch):
+    stub_site.unpublished.add("7098")
+    # Revalidate the program page on every run
+    monkeypatch.setattr(scraper.program_pages, "ttl", 0)
+
+    results = _by_fecha(
+        SyncPipeline(engine, parse=fake_parse, checkpoint=True).run(DAYS[2:])
+    )
+
+    assert results["2025-11-01"] == {
+        "fecha": "2025-11-01",
+        "status": "missing",
+        "reason": "no PDF found",
+    }
+    with Session(engine) as session:
+        assert pending_days(session, "san_isidro", DAYS[2:]) == DAYS[2:]
+
+    stub_site.unpublished.clear()
+    SyncPipeline(engine, parse=fake_parse, checkpoint=True).run(DAYS[2:])
+
+    with Session(engine) as session:
+        assert pending_days(session, "san_isidro", DAYS[2:]) == []
+
+
+@pytest.mark.usefixtures("stub_site")
+def test_pdf_imported_before_is_not_parsed_again(engine):
+    SyncPipeline(engine, parse=fake_parse).run(DAYS[:1])
+    with Session(engine) as session:
+        pdf_import = session.exec(select(PdfImport)).one()
+        pdf_import.etag = pdf_import.last_modified = None
+        session.add(pdf_import)
+        session.commit()
+
+    def must_not_parse(pdf_path: str) -> ParsedProgram:
+        raise AssertionError(pdf_path)
+
+    results = SyncPipeline(engine, parse=must_not_parse, parse_workers=1).run(DAYS[:1])
+
+    assert results == [
+        {"fecha": "2025-10-18", "status": "skipped", "reason": "already imported"}
+    ]
+    with Session(engine) as session:
+        assert session.exec(select(PdfImport.etag)).one() == '"v1"'
@@ -0,0 +1,187 @@
+import asyncio
+from datetime import date
+
+from turf_backend.services.san_isidro import scraper
+
+
+def test_get_pdf_links_resolves_relative_urls(stub_site):
+    links = scraper.get_pdf_links("7098")
+
+    base_url = f"http://127.0.0.1:{stub_site.server_port}"
+    assert links.programa_oficial == f"{base_url}/pdfs/SI_PROGRAMA_OFICIAL_7098.pdf"
+    assert links.inscriptos == f"{base_url}/pdfs/SI_INSCRIPTOS_7098.pdf"
+    assert links.depurados is None
+
+
+def test_sync_requests_reuse_one_connection(stub_site):
+    events = scraper.get_calendar_events(date(2025, 10, 1), date(2025, 11, 30))
+    links = scraper.get_pdf_links("7098")
+    content = scraper.download_pdf(links.programa_oficial)
+
+    assert [e.tipo for e in events] == ["programa-oficial", "resultados"]
+    assert content.startswith(b"%PDF")
+    assert len(stub_site.requests) == 3
+    assert len(stub_site.connections) == 1
+
+
+def test_async_variants_are_bounded_and_keep_order(stub_site):
+    calendario_ids = [str(7000 + i) for i in range(12)]
+
+    async def fetch_all():
+        async with scraper.async_client() as client:
+
+            async def fetch(calendario_id: str) -> bytes:
+                links = await scraper.get_pdf_links_async(calendario_id, client)
+                return await scraper.download_pdf_async(links.programa_oficial, client)
+
+            return await scraper.gather_bounded(fetch, calendario_ids, concurrency=3)
+
+    contents = asyncio.run(fetch_all())
+
+    assert [c.decode().rsplit("_", 1)[-1] for c in contents] == [
+        f"{cid}.pdf" for cid in calendario_ids
+    ]
+    assert len(stub_site.requests) == 24
+    assert len(stub_site.connections) <= 3
+
+
+def test_program_page_is_fetched_once_per_ttl(stub_site):
+    scraper.get_pdf_links("7098")
+    scraper.get_pdf_links("7098")
+    scraper.get_program_page("7098")
+
+    assert stub_site.requests == ["/wacP/public/programa-oficial/7098"]
+
+
+def test_expired_program_page_is_revalidated_with_etag(stub_site, monkeypatch):
+    monkeypatch.setattr(scraper.program_pages, "ttl", 0)
+
+    first = scraper.get_pdf_links("7098")
+    second = scraper.get_pdf_links("7098")
+
+    assert len(stub_site.requests) == 2
+    assert stub_site.not_modified == 1
+    assert second == first
+
+
+def test_unchanged_pdf_is_answered_with_304(stub_site):
+    url = scraper.get_pdf_links("7098").programa_oficial
+    first = scraper.fetch_pdf(url, None)
+    second = scraper.fetch_pdf(url, first.validators)
+
+    assert first.content.startswith(b"%PDF")
+    assert first.validators.etag == '"v1"'
+    assert second.unchanged
+    assert second.validators == first.validators
+    assert stub_site.pdf_downloads == 1
+    assert stub_site.not_modified == 1
+
+
+def test_changed_pdf_is_downloaded_again(stub_site):
+    url = scraper.get_pdf_links("7098").programa_oficial
+    first = scraper.fetch_pdf(url, None)
+    stub_site.pdf_version = "v2"
+    second = scraper.fetch_pdf(url, first.validators)
+
+    assert second.content.startswith(b"%PDF")
+    assert second.validators.etag == '"v2"'
+    assert stub_site.pdf_downloads == 2
+
+
+def test_pdf_validators_are_compared_when_conditional_get_is_ignored(stub_site):
+    stub_site.honour_conditional = False
+    url = scraper.get_pdf_links("7098").programa_oficial
+    first = scraper.fetch_pdf(url, None)
+    second = scraper.fetch_pdf(url, first.validators)
+
+    assert second.unchanged
+    assert stub_site.not_modified == 0
+
+
+PROGRAM_HTML = """
+<html><head><script>var x = "1ª - Premio SCRIPT";</script></head><body>
+<div class="container"><div class="programa">
+  <h4>Sábado, 1 de Noviembre de 2025</h4>
+  <div class="carrera">
+    <div class="titulo"><b>1ª</b> - Premio PINBALL WIZARD - 13:00 hs.</div>
+    <div>1200 mts. <span>Pista Arena</span></div>
+    <div>Bolsa Total: $ 4.500.000</div>
+    <table>
+      <tr><th>EJEMP</th><th>Caballo</th><th>KG</th><th>Jockey</th>
+          <th>Entrenador</th></tr>
+      <tr><td>1</td><td><b>PASO</b> NEVADO</td><td>57</td><td>Banegas K. 57</td>
+          <td>Perez J.
+      <tr><td>2</td><td>NIÑO OSCURO</td><td>56</td><td>Aguirre R. 56.5</td>
+          <td>Sosa D.</td></tr>
+    </table>
+  </div>
+  <div class="carrera">
+    <div class="titulo">2ª - Premio COOL DAY</div>
+    <div>1600 mts - Pista Grass</div>
+    <table>
+      <tr><th>EJEMP</th><th>Caballo</th><th>Jockey</th></tr>
+      <tr><td>1</td><td>LUNA ROJA</td><td>Almada G. 55</td></tr>
+      <tr><td>2</td><td>TORMENTA</td><td>Cabrera F. 57</td></tr>
+    </table>
+  </div>
+</div></div>
+</body></html>
+"""
+
+
+def test_extract_race_day_reads_races_and_horses_in_one_pass():
+    day = scraper.extract_race_day(PROGRAM_HTML, "7098")
+
+    assert day.fecha == "1 de Noviembre de 2025"
+    assert [(r.numero, r.nombre, r.hora) for r in day.races] == [
+        (1, "PINBALL WIZARD", "13:00"),
+        (2, "COOL DAY", ""),
+    ]
+    assert [(r.distancia, r.pista, r.bolsa_total) for r in day.races] == [
+        (1200, "Arena", "4.500.000"),
+        (1600, "Grass", ""),
+    ]
+    first, second = day.horses_by_race[1]
+    assert (first.numero, first.nombre, first.peso, first.jockey) == (
+        "1",
+        "PASO NEVADO",
+        57.0,
+        "Banegas K.",
+    )
+    assert first.entrenador == "Perez J."
+    assert second.nombre == "NIÑO OSCURO"
+    assert [h.nombre for h in day.horses_by_race[2]] == ["LUNA ROJA", "TORMENTA"]
+
+
+def test_extract_race_day_reads_headers_without_ordinal_mark():
+    html = """
+    <div class="titulo">1 - Premio PINBALL WIZARD - 13:00 hs.</div>
+    <div class="titulo">2 \u2013 Premio COOL DAY \u2013 13:30 hs.</div>
+    """
+
+    day = scraper.extract_race_day(html, "7098")
+
+    assert [(r.numero, r.nombre, r.hora) for r in day.races] == [
+        (1, "PINBALL WIZARD", "13:00"),
+        (2, "COOL DAY", "13:30"),
+    ]
+
+
+def test_parse_horses_from_table_maps_columns_from_header():
+    rows = [
+        ["Nro", "Caballo", "Jockey", "Entrenador"],
+        ["1", "PASO NEVADO", "Banegas K. 57", "Perez J.", "extra"],
+        ["2", "NIÑO OSCURO", "Aguirre R."],
+        ["SR", "no es un caballo", "x", "y"],
+        ["3", "CORTA"],
+    ]
+
+    horses = scraper.parse_horses_from_table(rows)
+
+    assert [(h.numero, h.nombre, h.jockey, h.entrenador) for h in horses] == [
+        ("1", "PASO NEVADO", "Banegas K.", "Perez J."),
+        ("2", "NIÑO OSCURO", "Aguirre R.", ""),
+    ]
+    # Without a Kg column the last numeric cell is the jockey weight
+    assert [h.peso_jockey for h in horses] == [1.0, 2.0]
+    assert all(h.sexo == "" and h.peso == 0.0 for h in horses)
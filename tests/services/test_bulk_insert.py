@@ -0,0 +1,70 @@
+import uuid
+
+import pytest
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine, func, select
+
+from turf_backend.core.config.settings import settings
+from turf_backend.models.turf import Horse, Race
+from turf_backend.services import bulk_insert
+from turf_backend.services.bulk_insert import write_races_and_horses
+
+
+@pytest.fixture
+def session():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+
+
+def _program(n_races: int, n_horses: int) -> tuple[list[Race], list[Horse]]:
+    races = [
+        Race(race_id=uuid.uuid4(), numero=n, nombre=f"PREMIO {n}", hipodromo="Palermo")
+        for n in range(1, n_races + 1)
+    ]
+    horses = [
+        Horse(
+            race_id=race.race_id,
+            page=race.numero,
+            numero=str(i),
+            nombre=f"CABALLO {race.numero}-{i}",
+            jockey="Banegas K.",
+        )
+        for race in races
+        for i in range(1, n_horses + 1)
+    ]
+    return races, horses
+
+
+def _count(session: Session, model) -> int:
+    return session.exec(select(func.count()).select_from(model)).one()
+
+
+@pytest.mark.parametrize("mode", ["orm", "values", "copy"])
+def test_write_races_and_horses(session, monkeypatch, mode):
+    monkeypatch.setattr(settings, "bulk_insert_mode", mode)
+    races, horses = _program(n_races=3, n_horses=4)
+
+    assert write_races_and_horses(session, races, horses) == 12
+    assert _count(session, Race) == 3
+    assert _count(session, Horse) == 12
+
+
+def test_values_mode_batches_and_skips_duplicate_horses(session, monkeypatch):
+    monkeypatch.setattr(settings, "bulk_insert_mode", "values")
+    monkeypatch.setattr(bulk_insert, "INSERT_BATCH_SIZE", 5)
+    races, horses = _program(n_races=2, n_horses=6)
+    write_races_and_horses(session, races, horses)
+
+    # Same horses again under new races, plus one new runner
+    races, horses = _program(n_races=2, n_horses=7)
+    inserted = write_races_and_horses(session, races, horses)
+
+    assert inserted == 2
+    assert _count(session, Race) == 4
+    assert _count(session, Horse) == 14
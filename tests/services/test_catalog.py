@@ -0,0 +1,83 @@
+import uuid
+
+import pytest
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine, func, select
+
+from turf_backend.models.turf import CatalogHorse, Horse, Jockey, Race
+from turf_backend.services.catalog import backfill_catalog, catalog_key, link_horses
+
+
+@pytest.fixture
+def session():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+
+
+def _entries(session: Session, runners: list[tuple[str, str]]) -> list[Horse]:
+    race = Race(race_id=uuid.uuid4())
+    session.add(race)
+    return [
+        Horse(race_id=race.race_id, numero=str(i), page=1, nombre=n, jockey=j)
+        for i, (n, j) in enumerate(runners, start=1)
+    ]
+
+
+def _count(session: Session, model) -> int:
+    return session.exec(select(func.count()).select_from(model)).one()
+
+
+def test_catalog_key():
+    assert catalog_key("  NIÑO   Oscuro ") == "nino oscuro"
+    assert catalog_key(" ") is None
+    assert catalog_key(None) is None
+
+
+def test_same_names_share_catalogue_ids(session):
+    first = _entries(session, [("NIÑO OSCURO", "Aguirre R."), ("LUNA ROJA", None)])
+    link_horses(session, first)
+    session.add_all(first)
+    session.commit()
+
+    second = _entries(
+        session, [("Niño  Oscuro", "AGUIRRE R."), ("TORMENTA", "Aguirre R.")]
+    )
+    link_horses(session, second)
+
+    assert second[0].catalog_horse_id == first[0].catalog_horse_id
+    assert second[1].catalog_horse_id not in {h.catalog_horse_id for h in first}
+    assert second[0].jockey_id == second[1].jockey_id == first[0].jockey_id
+    assert first[1].jockey_id is None
+    assert _count(session, CatalogHorse) == 3
+    assert _count(session, Jockey) == 1
+    stored = session.get(CatalogHorse, first[0].catalog_horse_id)
+    assert (stored.clave, stored.nombre) == ("nino oscuro", "NIÑO OSCURO")
+
+
+def test_ids_of_a_rolled_back_import_are_not_reused(session):
+    link_horses(session, _entries(session, [("PASO NEVADO", "Banegas K.")]))
+    session.rollback()
+
+    horses = _entries(session, [("PASO NEVADO", "Banegas K.")])
+    link_horses(session, horses)
+    session.add_all(horses)
+    session.commit()
+
+    assert session.get(CatalogHorse, horses[0].catalog_horse_id) is not None
+    assert session.get(Jockey, horses[0].jockey_id) is not None
+
+
+def test_backfill_links_existing_horses(session):
+    horses = _entries(session, [(f"CABALLO {i % 3}", "Banegas K.") for i in range(7)])
+    session.add_all(horses)
+    session.commit()
+
+    assert backfill_catalog(session, batch_size=2) == 7
+    assert backfill_catalog(session) == 0
+    assert len(set(session.exec(select(Horse.catalog_horse_id)).all())) == 3
@@ -0,0 +1,178 @@
+import json
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from sqlmodel import Session, SQLModel, create_engine
+
+from turf_backend.models.turf import ImportJob
+from turf_backend.services import jobs
+from turf_backend.services.jobs import (
+    JOB_HANDLERS,
+    JOB_MAX_ATTEMPTS,
+    JOB_STALE_AFTER,
+    claim_next,
+    describe,
+    enqueue,
+    job_handler,
+    requeue_stale,
+    run_pending,
+)
+
+COUNT = "test.count"
+BROKEN = "test.broken"
+SLOW = "test.slow"
+
+
+@job_handler(COUNT)
+def count(_engine, job, progress):
+    days = json.loads(job.params)["days"]
+    progress.start(len(days))
+    for fecha in days:
+        progress.advance({"fecha": fecha, "status": "imported", "inserted": 2})
+    progress.advance({"fecha": "x", "status": "error", "reason": "PDF roto"})
+    return f"{len(days)} días"
+
+
+@job_handler(BROKEN)
+def broken(_engine, _job, _progress):
+    msg = "sin conexión"
+    raise RuntimeError(msg)
+
+
+@job_handler(SLOW)
+def slow(engine, job, _progress):
+    """Runs without reporting progress until its heartbeat has moved."""
+    with Session(engine) as session:
+        claimed_at = session.get(ImportJob, job.id).heartbeat_at
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        time.sleep(0.02)
+        with Session(engine) as session:
+            if session.get(ImportJob, job.id).heartbeat_at != claimed_at:
+                return "latido"
+    return "sin latido"
+
+
+@pytest.fixture
+def engine(tmp_path):
+    # A file, not :memory:, since progress is saved from sessions of its own
+    engine = create_engine(f"sqlite:///{tmp_path / 'jobs.db'}")
+    SQLModel.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+def _job(engine, job_id) -> ImportJob:
+    with Session(engine) as session:
+        return session.get(ImportJob, job_id)
+
+
+def test_handlers_are_registered_by_kind():
+    assert JOB_HANDLERS[COUNT] is count
+
+
+def test_unique_jobs_are_not_queued_twice(engine):
+    with Session(engine) as session:
+        first = enqueue(session, COUNT, {"days": ["a"]}, unique=True)
+        again = enqueue(session, COUNT, {"days": ["a"]}, unique=True)
+        other = enqueue(session, COUNT, {"days": ["b"]}, unique=True)
+        forced = enqueue(session, COUNT, {"days": ["a"]})
+
+        assert again.id == first.id
+        assert len({first.id, other.id, forced.id}) == 3
+
+
+def test_jobs_are_claimed_once_oldest_first(engine):
+    with Session(engine) as session:
+        first = enqueue(session, COUNT, {"days": []})
+        second = enqueue(session, COUNT, {"days": []})
+
+        assert claim_next(session, "w1").id == first.id
+        claimed = claim_next(session, "w2")
+        assert claim_next(session, "w3") is None
+
+    assert claimed.id == second.id
+    assert (claimed.status, claimed.worker, claimed.attempts) == ("running", "w2", 1)
+
+
+def test_run_pending_records_progress_and_result(engine):
+    with Session(engine) as session:
+        job_id = enqueue(session, COUNT, {"days": ["d1", "d2"]}, b"%PDF").id
+
+    assert run_pending(engine, "w1") == 1
+
+    job = describe(_job(engine, job_id))
+    assert job["status"] == "done"
+    assert job["message"] == "2 días"
+    assert (job["total"], job["done"], job["inserted"], job["errors"]) == (2, 3, 4, 1)
+    assert job["results"][0] == {"fecha": "d1", "status": "imported", "inserted": 2}
+    assert job["finished_at"] is not None
+    assert _job(engine, job_id).payload is None
+
+
+def test_failed_and_unknown_jobs_are_marked_failed(engine):
+    with Session(engine) as session:
+        broken_id = enqueue(session, BROKEN).id
+        unknown_id = enqueue(session, "test.unknown").id
+
+    assert run_pending(engine, "w1") == 2
+
+    assert _job(engine, broken_id).status == "failed"
+    assert _job(engine, broken_id).message == "sin conexión"
+    assert _job(engine, unknown_id).message == "Tipo de job desconocido: test.unknown"
+
+
+def test_stale_running_jobs_are_requeued_until_max_attempts(engine):
+    with Session(engine) as session:
+        job_id = enqueue(session, COUNT, {"days": []}).id
+        claim_next(session, "dead")
+        later = datetime.now() + JOB_STALE_AFTER + timedelta(seconds=1)
+
+        assert requeue_stale(session, datetime.now()) == 0
+        assert requeue_stale(session, later) == 1
+        assert session.get(ImportJob, job_id).status == "queued"
+
+        job = claim_next(session, "dead")
+        job.attempts = JOB_MAX_ATTEMPTS
+        session.add(job)
+        session.commit()
+        requeue_stale(session, later)
+
+        assert session.get(ImportJob, job_id).status == "failed"
+
+
+def test_failed_jobs_delete_their_spooled_file(engine, tmp_path):
+    spooled = tmp_path / "upload.pdf"
+    spooled.write_bytes(b"%PDF")
+    with Session(engine) as session:
+        enqueue(session, BROKEN, {"path": str(spooled)})
+
+    run_pending(engine)
+
+    assert not spooled.exists()
+
+
+def test_abandoned_jobs_delete_their_spooled_file(engine, tmp_path):
+    spooled = tmp_path / "upload.pdf"
+    spooled.write_bytes(b"%PDF")
+    with Session(engine) as session:
+        job_id = enqueue(session, COUNT, {"path": str(spooled)}).id
+        job = claim_next(session, "dead")
+        job.attempts = JOB_MAX_ATTEMPTS
+        session.add(job)
+        session.commit()
+        requeue_stale(session, datetime.now() + JOB_STALE_AFTER * 2)
+
+    assert _job(engine, job_id).status == "failed"
+    assert not spooled.exists()
+
+
+def test_heartbeat_is_saved_while_the_handler_runs(engine, monkeypatch):
+    monkeypatch.setattr(jobs, "JOB_HEARTBEAT_INTERVAL", timedelta(milliseconds=50))
+    with Session(engine) as session:
+        job_id = enqueue(session, SLOW).id
+
+    run_pending(engine, "w1")
+
+    assert _job(engine, job_id).message == "latido"
@@ -0,0 +1,156 @@
+import uuid
+from datetime import date
+
+import pytest
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from turf_backend.models.turf import Horse, Race
+from turf_backend.services.program_sync import (
+    sync_races_and_horses,
+    write_program_in_batches,
+)
+
+RACE_DATE = date(2025, 11, 1)
+
+
+@pytest.fixture
+def session():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+
+
+def _program(
+    runners: dict[int, list[tuple[str, str]]], race_date: date = RACE_DATE
+) -> tuple[list[Race], list[Horse]]:
+    """Races keyed by number, each with (nombre, jockey) runners."""
+    races, horses = [], []
+    for numero, race_runners in runners.items():
+        race = Race(
+            race_id=uuid.uuid4(),
+            numero=numero,
+            nombre=f"PREMIO {numero}",
+            race_date=race_date,
+            hipodromo="San Isidro",
+        )
+        races.append(race)
+        horses.extend(
+            Horse(
+                race_id=race.race_id,
+                page=numero,
+                numero=str(i),
+                nombre=nombre,
+                jockey=jockey,
+            )
+            for i, (nombre, jockey) in enumerate(race_runners, start=1)
+        )
+    return races, horses
+
+
+def _stored(session: Session) -> dict[int, list[tuple[str, str]]]:
+    rows = session.exec(
+        select(Race.numero, Horse.nombre, Horse.jockey)
+        .join(Horse)
+        .order_by(Race.numero, Horse.numero)
+    ).all()
+    stored: dict[int, list[tuple[str, str]]] = {}
+    for numero, nombre, jockey in rows:
+        stored.setdefault(numero, []).append((nombre, jockey))
+    return stored
+
+
+ORIGINAL = {
+    1: [("PASO NEVADO", "Banegas K."), ("NIÑO OSCURO", "Aguirre R.")],
+    2: [("LUNA ROJA", "Almada G."), ("TORMENTA", "Cabrera F.")],
+}
+
+
+def test_first_import_inserts_everything(session):
+    result = sync_races_and_horses(session, *_program(ORIGINAL))
+
+    assert (result.inserted, result.updated, result.scratched) == (4, 0, 0)
+    assert _stored(session) == ORIGINAL
+
+
+def test_modified_program_only_writes_the_delta(session):
+    sync_races_and_horses(session, *_program(ORIGINAL))
+    race_ids = set(session.exec(select(Race.race_id)).all())
+
+    modified = {
+        1: [("PASO NEVADO", "Arregui E."), ("NIÑO OSCURO", "Aguirre R.")],
+        2: [("LUNA ROJA", "Almada G."), ("RAYO VELOZ", "Sosa D.")],
+    }
+    result = sync_races_and_horses(session, *_program(modified))
+
+    assert (result.inserted, result.updated, result.scratched) == (1, 1, 1)
+    assert _stored(session) == modified
+    # Races are kept, so their ids stay valid for clients
+    assert set(session.exec(select(Race.race_id)).all()) == race_ids
+
+
+def test_reimporting_the_same_program_is_a_no_op(session):
+    sync_races_and_horses(session, *_program(ORIGINAL))
+
+    result = sync_races_and_horses(session, *_program(ORIGINAL))
+
+    assert result.written == 0
+    assert result.scratched == 0
+    assert _stored(session) == ORIGINAL
+
+
+def test_other_meetings_are_left_alone(session):
+    sync_races_and_horses(session, *_program(ORIGINAL, race_date=date(2025, 10, 25)))
+
+    result = sync_races_and_horses(session, *_program({1: [("FURIA", "Almada G.")]}))
+
+    assert result.races_removed == 0
+    assert len(session.exec(select(Race)).all()) == 3
+
+
+def test_races_sharing_a_number_are_matched_by_position(session):
+    sync_races_and_horses(session, *_program(ORIGINAL))
+
+    races, horses = _program(ORIGINAL)
+    # Both headers misread as race 1
+    races[1].numero = 1
+    result = sync_races_and_horses(session, races, horses)
+
+    assert (result.scratched, result.races_removed) == (0, 0)
+    assert len(session.exec(select(Horse)).all()) == 4
+
+
+def _batches(runners: dict[int, list[tuple[str, str]]], race_date: date = RACE_DATE):
+    """The program one race per batch, as a streamed import writes it."""
+    for numero, race_runners in runners.items():
+        yield _program({numero: race_runners}, race_date)
+
+
+def test_new_meeting_is_written_batch_by_batch(session):
+    stored_before = []
+
+    def batches():
+        for batch in _batches(ORIGINAL):
+            stored_before.append(len(session.exec(select(Race)).all()))
+            yield batch
+
+    assert write_program_in_batches(session, batches()) == 4
+    # Each batch was committed before the next one was parsed
+    assert stored_before == [0, 1]
+    assert _stored(session) == ORIGINAL
+
+
+def test_stored_meeting_is_synced_with_the_whole_program(session):
+    sync_races_and_horses(session, *_program(ORIGINAL))
+
+    modified = {1: [("PASO NEVADO", "Arregui E."), ("NIÑO OSCURO", "Aguirre R.")]}
+    written = write_program_in_batches(session, _batches(modified))
+
+    assert written == 1
+    # Race 2 is not in the program any more, and only the whole program says so
+    assert _stored(session) == modified
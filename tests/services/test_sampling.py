@@ -0,0 +1,107 @@
+import threading
+import uuid
+from collections import Counter
+
+import pytest
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine, delete
+
+from turf_backend.models.turf import Horse, Race
+from turf_backend.services.sampling import KeyPool, sample_horses
+
+
+@pytest.fixture
+def session():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+
+
+def _add_horses(session: Session, count: int) -> None:
+    race = Race(race_id=uuid.uuid4())
+    session.add(race)
+    session.add_all(
+        Horse(race_id=race.race_id, numero=str(i), page=1, nombre=f"CABALLO {i}")
+        for i in range(count)
+    )
+    session.commit()
+
+
+def test_sample_horses_returns_distinct_rows(session):
+    _add_horses(session, 50)
+
+    sample = sample_horses(session, 10)
+
+    assert len(sample) == 10
+    assert len({h.id for h in sample}) == 10
+
+
+def test_sample_horses_skips_gaps_uniformly(session):
+    _add_horses(session, 40)
+    # Leave only every fourth id
+    session.exec(delete(Horse).where(Horse.id % 4 != 0))  # type: ignore
+    session.commit()
+
+    counts = Counter(h.id for _ in range(500) for h in sample_horses(session, 2))
+
+    assert set(counts) == {i for i in range(1, 41) if i % 4 == 0}
+    # 1000 draws over 10 rows: every row close to 100
+    assert min(counts.values()) > 50
+
+
+def test_sample_horses_small_table(session):
+    assert sample_horses(session, 4) == []
+
+    _add_horses(session, 3)
+
+    assert len(sample_horses(session, 4)) == 3
+
+
+def _add_races(session: Session, count: int) -> list[Race]:
+    races = [Race(race_id=uuid.uuid4()) for _ in range(count)]
+    session.add_all(races)
+    session.commit()
+    return races
+
+
+def test_key_pool_skips_deleted_rows(session):
+    races = _add_races(session, 5)
+    pool = KeyPool(Race)
+    pool.load(session.get_bind())
+    assert len(pool.sample(session, 5)) == 5
+
+    session.exec(delete(Race).where(Race.race_id == races[0].race_id))  # type: ignore
+    session.commit()
+
+    sample = pool.sample(session, 5)
+    pool.wait()
+    assert {r.race_id for r in sample} == {r.race_id for r in races[1:]}
+
+
+def test_key_pool_loads_in_the_background(session, monkeypatch):
+    races = _add_races(session, 3)
+    pool = KeyPool(Race, ttl=0)
+    loaded = threading.Event()
+    load = pool.load
+
+    def slow_load(engine):
+        loaded.wait(5)
+        load(engine)
+
+    monkeypatch.setattr(pool, "load", slow_load)
+
+    # Before the first load ends the rows come from ORDER BY random()
+    assert len(pool.sample(session, 2)) == 2
+    assert pool.keys(session) == []
+
+    loaded.set()
+    pool.wait()
+    assert set(pool.keys(session)) == {r.race_id for r in races}
+    # Expired keys are still served while the next refresh runs
+    assert len(pool.keys(session)) == 3
+    pool.wait()
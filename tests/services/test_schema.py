@@ -0,0 +1,48 @@
+import uuid
+
+from sqlalchemy import inspect
+from sqlmodel import Session, SQLModel, create_engine, select, text
+
+from turf_backend.models.turf import Race
+from turf_backend.services.schema import (
+    create_missing_columns,
+    create_missing_indexes,
+)
+
+# races as created before race_date existed
+OLD_RACES_TABLE = """
+CREATE TABLE races (
+    race_id CHAR(32) PRIMARY KEY,
+    numero INTEGER,
+    nombre VARCHAR,
+    distancia INTEGER,
+    fecha VARCHAR,
+    hipodromo VARCHAR,
+    hour VARCHAR
+)
+"""
+
+
+def test_existing_races_table_is_migrated(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'turf.db'}")
+    with engine.begin() as connection:
+        connection.execute(text(OLD_RACES_TABLE))
+        for fecha in ("01/11/2025", "sin fecha"):
+            connection.execute(
+                text("INSERT INTO races (race_id, fecha) VALUES (:id, :fecha)"),
+                {"id": uuid.uuid4().hex, "fecha": fecha},
+            )
+    SQLModel.metadata.create_all(engine)
+
+    added = create_missing_columns(engine)
+    assert [c.name for c in added] == ["race_date"]
+    create_missing_indexes(engine)
+
+    with Session(engine) as session:
+        rows = session.exec(select(Race.fecha, Race.race_date)).all()
+    # fecha is the import day of these races, not their race day
+    assert sorted(rows, key=str) == [("01/11/2025", None), ("sin fecha", None)]
+    indexes = {i["name"] for i in inspect(engine).get_indexes("races")}
+    assert "ix_races_hipodromo_race_date_numero" in indexes
+    # Running it again on an up to date schema is a no-op
+    assert create_missing_columns(engine) == []
@@ -0,0 +1,28 @@
+import pytest
+
+from turf_backend.services.search import fold, trigram_similarity, trigrams
+
+
+def test_fold():
+    assert fold("NIÑO Oscuro") == "nino oscuro"
+    assert fold("Muñoz J.") == "munoz j."
+    assert fold(None) is None
+
+
+def test_trigrams_are_padded_per_word():
+    assert trigrams("Cat") == {"  c", " ca", "cat", "at "}
+    assert trigrams("a-b") == {"  a", " a ", "  b", " b "}
+
+
+@pytest.mark.parametrize(
+    ("a", "b", "expected"),
+    [
+        # Reference values from PostgreSQL's pg_trgm
+        ("word", "two words", 0.363636),
+        ("paso nevado", "paso nevado", 1.0),
+        ("abc", "xyz", 0.0),
+        ("", "abc", 0.0),
+    ],
+)
+def test_trigram_similarity_matches_pg_trgm(a, b, expected):
+    assert trigram_similarity(a, b) == pytest.approx(expected, abs=1e-6)
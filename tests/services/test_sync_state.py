@@ -0,0 +1,120 @@
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine
+
+from turf_backend.models.turf import SyncDay
+from turf_backend.services.sync_state import (
+    advance_watermark,
+    get_watermark,
+    pending_days,
+    record_day,
+    resume_from,
+)
+
+HIPODROMO = "san_isidro"
+OCTOBER = [
+    ("2025-10-04", "c1"),
+    ("2025-10-11", "c2"),
+    ("2025-10-18", "c3"),
+    ("2025-10-25", "c4"),
+]
+
+
+@pytest.fixture
+def session():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+
+
+def _run(session: Session, statuses: dict[str, str], days=OCTOBER) -> None:
+    for fecha, cid in days:
+        if cid in statuses:
+            record_day(
+                session, HIPODROMO, cid, {"fecha": fecha, "status": statuses[cid]}
+            )
+
+
+def test_completed_days_are_not_pending(session):
+    _run(session, {"c1": "imported", "c2": "skipped", "c3": "error", "c4": "missing"})
+
+    assert pending_days(session, HIPODROMO, OCTOBER) == [OCTOBER[2], OCTOBER[3]]
+    assert pending_days(session, "palermo", OCTOBER) == OCTOBER
+
+
+def test_record_day_counts_attempts(session):
+    _run(session, {"c3": "error"})
+    _run(session, {"c3": "imported"})
+
+    day = session.get(SyncDay, 1)
+    assert (day.status, day.attempts, day.fecha) == ("imported", 2, date(2025, 10, 18))
+
+
+def test_watermark_stops_before_the_first_pending_day(session):
+    _run(session, {"c1": "imported", "c2": "imported", "c3": "error", "c4": "imported"})
+
+    mark = advance_watermark(
+        session, HIPODROMO, date(2025, 10, 1), date(2025, 10, 31), OCTOBER
+    )
+
+    assert (mark.since, mark.fecha, mark.calendario_id) == (
+        date(2025, 10, 1),
+        date(2025, 10, 11),
+        "c2",
+    )
+    # A rerun over October starts after the watermark...
+    assert resume_from(session, HIPODROMO, date(2025, 10, 1)) == date(2025, 10, 12)
+    # ...but one starting before it is not clipped
+    assert resume_from(session, HIPODROMO, date(2025, 9, 1)) == date(2025, 9, 1)
+
+
+def test_resumed_run_extends_the_watermark(session):
+    _run(session, {"c1": "imported", "c2": "imported", "c3": "error"})
+    advance_watermark(
+        session, HIPODROMO, date(2025, 10, 1), date(2025, 10, 31), OCTOBER
+    )
+
+    _run(session, {"c3": "imported", "c4": "imported"})
+    start = resume_from(session, HIPODROMO, date(2025, 10, 1))
+    advance_watermark(session, HIPODROMO, start, date(2025, 10, 31), OCTOBER[2:])
+
+    mark = get_watermark(session, HIPODROMO)
+    assert (mark.since, mark.fecha, mark.calendario_id) == (
+        date(2025, 10, 1),
+        date(2025, 10, 25),
+        "c4",
+    )
+
+
+def test_no_watermark_before_a_failed_first_day(session):
+    _run(session, {"c1": "error", "c2": "imported"})
+
+    mark = advance_watermark(
+        session, HIPODROMO, date(2025, 10, 1), date(2025, 10, 31), OCTOBER
+    )
+
+    assert mark is None
+    assert resume_from(session, HIPODROMO, date(2025, 10, 1)) == date(2025, 10, 1)
+
+
+def test_watermark_does_not_pass_today(session):
+    today = date.today()
+    days = [
+        ((today - timedelta(days=7)).isoformat(), "c1"),
+        ((today + timedelta(days=7)).isoformat(), "c2"),
+    ]
+    _run(session, {"c1": "imported", "c2": "imported"}, days)
+
+    mark = advance_watermark(
+        session, HIPODROMO, today - timedelta(days=30), today + timedelta(days=30), days
+    )
+
+    assert (mark.fecha, mark.calendario_id) == (today - timedelta(days=7), "c1")
+    assert resume_from(session, HIPODROMO, today) == today
@@ -1,3 +1,5 @@
+from typing import Literal
+
 from dotenv import load_dotenv
 from pydantic import Field
 from pydantic_settings import BaseSettings
@@ -14,6 +16,51 @@ class Settings(BaseSettings):
     db_port: int = Field(5432, json_schema_extra={"env": "DB_PORT"})
     postgres_url: str = Field(...)
     openai_api_key: str = Field(..., json_schema_extra={"env": "OPENAI_API_KEY"})
+    # Processes used to extract PDF pages in parallel (0 or 1 parses serially)
+    pdf_parse_workers: int = Field(0, json_schema_extra={"env": "PDF_PARSE_WORKERS"})
+    # Library reading the words of PDF pages: pdfplumber, or pdfium (faster)
+    pdf_backend: Literal["pdfplumber", "pdfium"] = Field(
+        "pdfplumber", json_schema_extra={"env": "PDF_BACKEND"}
+    )
+    # Extract only the entries table of each program page (see LayoutProfile).
+    # Off until its margins are checked against real programs: cropped pages
+    # lose lines, and Palermo finds race headers by line position
+    pdf_crop_to_table: bool = Field(
+        default=False, json_schema_extra={"env": "PDF_CROP_TO_TABLE"}
+    )
+    # Total size of the parsed PDF cache before evicting entries (0 disables it)
+    parse_cache_max_bytes: int = Field(
+        50 * 1024 * 1024, json_schema_extra={"env": "PARSE_CACHE_MAX_BYTES"}
+    )
+
+    # How imports write races and horses: orm, values (multi-row INSERT batches)
+    # or copy (PostgreSQL COPY through a staging table)
+    bulk_insert_mode: Literal["orm", "values", "copy"] = Field(
+        "orm", json_schema_extra={"env": "BULK_INSERT_MODE"}
+    )
+
+    # Races parsed before each write of a streamed import (uploaded PDFs)
+    import_batch_races: int = Field(4, json_schema_extra={"env": "IMPORT_BATCH_RACES"})
+    # Where uploaded Palermo PDFs wait for their import job. Empty keeps them
+    # in the job's row in the database, which every worker can read. A
+    # directory (read from disk by the job instead of held in memory) must be
+    # shared storage mounted on the API and on every job worker
+    job_spool_dir: str = Field("", json_schema_extra={"env": "JOB_SPOOL_DIR"})
+
+    # Historical and upcoming syncs: PDFs downloaded at once, processes parsing
+    # them (0 uses one per core) and days buffered between stages
+    sync_download_concurrency: int = Field(
+        4, json_schema_extra={"env": "SYNC_DOWNLOAD_CONCURRENCY"}
+    )
+    sync_parse_workers: int = Field(0, json_schema_extra={"env": "SYNC_PARSE_WORKERS"})
+    sync_queue_size: int = Field(8, json_schema_extra={"env": "SYNC_QUEUE_SIZE"})
+    # Threads of the API process running queued import jobs and seconds between
+    # polls of the queue. On Vercel the API is frozen between requests, so by
+    # default the jobs are left to scripts/run_jobs.py
+    job_workers: int = Field(0, json_schema_extra={"env": "JOB_WORKERS"})
+    job_poll_interval: float = Field(
+        2.0, json_schema_extra={"env": "JOB_POLL_INTERVAL"}
+    )
 
     model_config = {
         "env_file": ".env",
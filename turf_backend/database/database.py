@@ -1,9 +1,10 @@
 from contextlib import contextmanager
 from typing import Generator
 
-from sqlmodel import Session, SQLModel, create_engine
+from sqlmodel import Session, create_engine
 
 from turf_backend.core.config.settings import database_url, settings
+from turf_backend.services.schema import prepare_database
 
 
 class DatabaseConnection:
@@ -17,7 +18,7 @@ class DatabaseConnection:
             pool_pre_ping=True,
             pool_recycle=300,
         )
-        SQLModel.metadata.create_all(self.engine)
+        prepare_database(self.engine)
 
     @contextmanager
     def get_session(self) -> Generator[Session, None, None]:
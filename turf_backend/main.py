@@ -1,10 +1,31 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
-from turf_backend.routes import general, palermo, san_isidro, users
+from turf_backend.core.config.settings import settings
+from turf_backend.database.database import database
+from turf_backend.routes import general, jobs, palermo, san_isidro, users
+from turf_backend.services.jobs import JobWorker
+from turf_backend.services.sampling import race_pool
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):  # noqa: RUF029
+    # With JOB_WORKERS > 0, imports queued by the routes run here, off the
+    # request threads; by default scripts/run_jobs.py runs them
+    worker = JobWorker(
+        database.engine, settings.job_workers, settings.job_poll_interval
+    )
+    worker.start()
+    # Loaded off the request path, so /general/races/random never waits for it
+    race_pool.refresh(database.engine)
+    yield
+    worker.stop(timeout=5)
+
 
-app = FastAPI(redoc_url="/swagger")
+app = FastAPI(redoc_url="/swagger", lifespan=lifespan)
 
 origins = [
     "http://localhost:5173",
@@ -19,9 +40,11 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 app.include_router(general.router)
+app.include_router(jobs.router)
 app.include_router(palermo.router)
 app.include_router(san_isidro.router)
 app.include_router(users.router)
@@ -1,8 +1,9 @@
-from datetime import datetime
+from datetime import date, datetime
 from enum import Enum
 from typing import Optional
 from uuid import UUID, uuid4
 
+from sqlalchemy import Column, Index, LargeBinary
 from sqlmodel import Field, Relationship, SQLModel, UniqueConstraint
 
 
@@ -14,6 +15,8 @@ class Horse(SQLModel, table=True):
     __tablename__ = "horses"
     __table_args__ = (
         UniqueConstraint("nombre", "numero", "page", name="uq_horse_unique"),
+        # Keyset pagination order of /general/horses/
+        Index("ix_horses_created_at_id", "created_at", "id"),
     )
 
     id: int | None = Field(default=None, primary_key=True)
@@ -30,16 +33,56 @@ class Horse(SQLModel, table=True):
     line_index: int | None = Field(default=None)
     created_at: datetime = Field(default_factory=datetime.now)
     caballeriza: str | None = Field(default=None)
+    # Catalogue entries of the names above (see services/catalog.py)
+    catalog_horse_id: int | None = Field(
+        default=None, foreign_key="catalog_horses.id", index=True
+    )
+    jockey_id: int | None = Field(default=None, foreign_key="jockeys.id", index=True)
+    trainer_id: int | None = Field(default=None, foreign_key="trainers.id", index=True)
+    stud_id: int | None = Field(default=None, foreign_key="studs.id", index=True)
     race: Optional["Race"] = Relationship(back_populates="horses")
 
 
+class CatalogEntry(SQLModel):
+    id: int | None = Field(default=None, primary_key=True)
+    # Case and accent folded name, used to match spellings of the same name
+    clave: str = Field(unique=True, index=True)
+    nombre: str
+
+
+class CatalogHorse(CatalogEntry, table=True):
+    """A horse across every race it was entered in (Horse rows)."""
+
+    __tablename__ = "catalog_horses"
+
+
+class Jockey(CatalogEntry, table=True):
+    __tablename__ = "jockeys"
+
+
+class Trainer(CatalogEntry, table=True):
+    __tablename__ = "trainers"
+
+
+class Stud(CatalogEntry, table=True):
+    __tablename__ = "studs"
+
+
 class Race(SQLModel, table=True):
     __tablename__ = "races"
+    __table_args__ = (
+        # Meetings and date ranges of one hipódromo are index range scans
+        Index(
+            "ix_races_hipodromo_race_date_numero", "hipodromo", "race_date", "numero"
+        ),
+    )
     race_id: UUID = Field(default=uuid4(), primary_key=True, index=True)
     numero: int | None = Field(default=None, index=True)
     nombre: str | None = Field(default=None)
     distancia: int | None = Field(default=None)
     fecha: str | None = Field(default_factory=None)
+    # Race day printed on the program, None when it could not be read
+    race_date: date | None = Field(default=None)
     hipodromo: str | None = Field(default="Palermo")
     hour: str | None = Field(default=None)
 
@@ -53,3 +96,90 @@ class PdfImport(SQLModel, table=True):
     filename: str
     hipodromo: str
     imported_at: datetime = Field(default_factory=datetime.now)
+    # Where the file was downloaded from and the HTTP validators it was served
+    # with, so an unchanged remote file is not downloaded again
+    source_url: str | None = Field(default=None, index=True)
+    calendario_id: str | None = Field(default=None, index=True)
+    etag: str | None = None
+    last_modified: str | None = None
+    content_length: int | None = None
+
+
+class ParsedPdfCache(SQLModel, table=True):
+    __tablename__ = "parsed_pdf_cache"
+    __table_args__ = (
+        UniqueConstraint("file_hash", "parser_version", name="uq_parsed_pdf_cache"),
+    )
+
+    id: int | None = Field(default=None, primary_key=True)
+    file_hash: str = Field(index=True)
+    parser_version: str
+    payload: bytes = Field(sa_column=Column(LargeBinary, nullable=False))
+    size: int
+    last_used_at: datetime = Field(default_factory=datetime.now, index=True)
+
+
+class SyncDay(SQLModel, table=True):
+    """Outcome of importing one calendar day, so re-runs can skip it."""
+
+    __tablename__ = "sync_days"
+    __table_args__ = (
+        UniqueConstraint("hipodromo", "calendario_id", name="uq_sync_day"),
+    )
+
+    id: int | None = Field(default=None, primary_key=True)
+    hipodromo: str
+    calendario_id: str
+    fecha: date | None = Field(default=None, index=True)
+    # imported, skipped (already imported), missing (no PDF yet) or error
+    status: str
+    reason: str | None = Field(default=None)
+    attempts: int = Field(default=0)
+    updated_at: datetime = Field(default_factory=datetime.now)
+
+
+class SyncWatermark(SQLModel, table=True):
+    """Range of days [since, fecha] of a hipódromo whose sync is complete."""
+
+    __tablename__ = "sync_watermarks"
+
+    hipodromo: str = Field(primary_key=True)
+    since: date
+    fecha: date
+    # Last calendar day imported within the range
+    calendario_id: str | None = Field(default=None)
+    updated_at: datetime = Field(default_factory=datetime.now)
+
+
+class ImportJob(SQLModel, table=True):
+    """An import run by the job workers instead of inside a request."""
+
+    __tablename__ = "import_jobs"
+    __table_args__ = (
+        # Workers claim the oldest queued job
+        Index("ix_import_jobs_status_created_at", "status", "created_at"),
+    )
+
+    id: UUID = Field(default_factory=uuid4, primary_key=True)
+    kind: str
+    # JSON arguments of the job, and the uploaded file if there is one
+    params: str = Field(default="{}")
+    payload: bytes | None = Field(
+        default=None, sa_column=Column(LargeBinary, nullable=True)
+    )
+    # queued, running, done or failed
+    status: str = Field(default="queued")
+    attempts: int = Field(default=0)
+    worker: str | None = Field(default=None)
+    # Progress: days (or files) to import, done so far, horses written, failures
+    total: int | None = Field(default=None)
+    done: int = Field(default=0)
+    inserted: int = Field(default=0)
+    errors: int = Field(default=0)
+    # JSON list of the result of every day, and a summary or the failure
+    results: str = Field(default="[]")
+    message: str | None = Field(default=None)
+    created_at: datetime = Field(default_factory=datetime.now)
+    started_at: datetime | None = Field(default=None)
+    heartbeat_at: datetime | None = Field(default=None)
+    finished_at: datetime | None = Field(default=None)
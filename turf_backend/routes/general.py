@@ -1,39 +1,118 @@
 # pylint: disable=duplicate-code
 import logging
+from datetime import date, datetime
+from typing import Literal
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import func
-from sqlmodel import Session, select, text
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import func, tuple_
+from sqlalchemy.orm import joinedload, selectinload
+from sqlmodel import Session, col, select, text
 
 from turf_backend.database import get_connection
-from turf_backend.models.turf import Horse, Race
+from turf_backend.models.turf import CatalogHorse, Horse, Race
+from turf_backend.services.meetings import HIPODROMOS, load_meeting, meeting_cache
+from turf_backend.services.sampling import sample_horses, sample_races
+from turf_backend.services.search import contains, similar
+from turf_backend.utils.pagination import decode_cursor, encode_cursor, table_counter
 
 logger = logging.getLogger("turf")
 logger.setLevel(logging.INFO)
 
 router = APIRouter(prefix="/general", tags=["General"])
 
+# Races per request to /general/races/details
+MAX_DETAIL_IDS = 50
+
 
 @router.get("/horses/", response_model=list[Horse])
 def get_horses(
+    response: Response,
     session: Session = Depends(get_connection),
-    nombre: str | None = Query(None, description="Buscar por nombre (parcial)"),
-    jockey: str | None = Query(None, description="Buscar por jockey (parcial)"),
-    page: int = Query(1, ge=1, description="Número de página"),
+    nombre: str | None = Query(
+        None, description="Buscar por nombre (parcial, sin distinguir acentos)"
+    ),
+    jockey: str | None = Query(
+        None, description="Buscar por jockey (parcial, sin distinguir acentos)"
+    ),
+    page: int = Query(1, ge=1, description="Número de página (sin cursor)"),
     limit: int = Query(
         20, ge=1, le=100, description="Cantidad de resultados por página"
     ),
+    cursor: str | None = Query(
+        None, description="Cursor de la página siguiente (header X-Next-Cursor)"
+    ),
 ):
     query = select(Horse)
 
     if nombre:
-        query = query.where(Horse.nombre.ilike(f"%{nombre}%"))  # type: ignore
+        query = query.where(contains(session, Horse.nombre, nombre))
     if jockey:
-        query = query.where(Horse.jockey.ilike(f"%{jockey}%"))  # type: ignore
+        query = query.where(contains(session, Horse.jockey, jockey))
+
+    # Keyset on (created_at, id): any page costs the same as the first one
+    query = query.order_by(Horse.created_at, Horse.id)  # type: ignore
+    if cursor:
+        try:
+            created_at, horse_id = decode_cursor(cursor, 2)
+            after = (datetime.fromisoformat(created_at), int(horse_id))
+        except (ValueError, TypeError):
+            raise HTTPException(status_code=400, detail="Cursor inválido")  # noqa: B904
+        query = query.where(tuple_(Horse.created_at, Horse.id) > tuple_(*after))
+    else:
+        query = query.offset((page - 1) * limit)
+
+    horses = session.exec(query.limit(limit)).all()
+    if len(horses) == limit:
+        last = horses[-1]
+        response.headers["X-Next-Cursor"] = encode_cursor(
+            last.created_at.isoformat(), last.id
+        )
+    return horses
+
+
+@router.get("/horses/search")
+def search_horses(
+    session: Session = Depends(get_connection),
+    q: str = Query(..., min_length=1, description="Texto a buscar"),
+    field: Literal["nombre", "jockey"] = Query(
+        "nombre", description="Columna donde buscar"
+    ),
+    limit: int = Query(20, ge=1, le=100),
+):
+    """Búsqueda aproximada (por trigramas), ordenada por similitud."""
+    condition, score = similar(session, getattr(Horse, field), q)
+    rows = session.exec(
+        select(Horse, score.label("score"))
+        .where(condition)
+        .order_by(score.desc(), Horse.id)
+        .limit(limit)
+    ).all()
+    return [{"horse": horse, "score": round(s, 3)} for horse, s in rows]
+
+
+@router.get("/horses/{catalog_horse_id}/history")
+def get_horse_history(
+    catalog_horse_id: int,
+    session: Session = Depends(get_connection),
+    limit: int = Query(50, ge=1, le=500),
+):
+    """Carreras de un caballo del catálogo, de la más reciente a la más antigua."""
+    horse = session.get(CatalogHorse, catalog_horse_id)
+    if not horse:
+        raise HTTPException(status_code=404, detail="Caballo no encontrado")
 
-    offset = (page - 1) * limit
-    return session.exec(query.offset(offset).limit(limit)).all()
+    rows = session.exec(
+        select(Horse, Race)
+        .join(Race)
+        .where(Horse.catalog_horse_id == catalog_horse_id)
+        .order_by(col(Race.race_date).desc().nulls_last(), col(Horse.id).desc())
+        .limit(limit)
+    ).all()
+    return {
+        "horse": horse,
+        "entries": [{"race": race, "horse": entry} for entry, race in rows],
+    }
 
 
 @router.get("/horses/count")
@@ -46,7 +125,7 @@ def get_random_horses(
     session: Session = Depends(get_connection),
     count: int = Query(4, ge=1, le=20, description="Cantidad de caballos aleatorios"),
 ):
-    return session.exec(select(Horse).order_by(func.random()).limit(count)).all()
+    return sample_horses(session, count)
 
 
 @router.get("/races/random")
@@ -54,28 +133,118 @@ def get_random_races(
     session: Session = Depends(get_connection),
     count: int = Query(3, ge=1, le=20, description="Cantidad de carreras aleatorias"),
 ):
-    return session.exec(select(Race).order_by(func.random()).limit(count)).all()
+    return sample_races(session, count)
 
 
 @router.get("/races/")
 def get_all_races(
     session: Session = Depends(get_connection),
     limit: int = Query(50, ge=1, le=500),
-    offset: int = Query(0, ge=0),
+    offset: int = Query(0, ge=0, description="Desplazamiento (sin cursor)"),
+    cursor: str | None = Query(None, description="next_cursor de la página anterior"),
+    total: Literal["cached", "estimate", "none"] = Query(
+        "cached",
+        description=(
+            "Total de carreras: contado y cacheado unos segundos, estimado por "
+            "PostgreSQL o no calculado"
+        ),
+    ),
+    hipodromo: str | None = Query(None, description="palermo o san-isidro"),
+    desde: date | None = Query(None, description="Fecha de carrera mínima"),
+    hasta: date | None = Query(None, description="Fecha de carrera máxima"),
+):
+    filters = []
+    if hipodromo is not None:
+        if hipodromo.lower() not in HIPODROMOS:
+            raise HTTPException(status_code=400, detail="Hipódromo desconocido")
+        filters.append(Race.hipodromo == HIPODROMOS[hipodromo.lower()])
+    if desde is not None:
+        filters.append(Race.race_date >= desde)  # type: ignore
+    if hasta is not None:
+        filters.append(Race.race_date <= hasta)  # type: ignore
+
+    query = select(Race).where(*filters).order_by(Race.race_id)  # type: ignore
+    if cursor:
+        try:
+            (race_id,) = decode_cursor(cursor, 1)
+            after = UUID(race_id)
+        except (ValueError, TypeError, AttributeError):
+            raise HTTPException(status_code=400, detail="Cursor inválido")  # noqa: B904
+        query = query.where(Race.race_id > after)
+    else:
+        query = query.offset(offset)
+
+    races = session.exec(query.limit(limit)).all()
+    next_cursor = encode_cursor(races[-1].race_id) if len(races) == limit else None
+
+    count = None
+    if total != "none" and filters:
+        # Served by ix_races_hipodromo_race_date_numero
+        count_query = select(func.count()).select_from(Race).where(*filters)
+        count = session.exec(count_query).one()
+    elif total != "none":
+        count = table_counter.count(session, Race, estimate=total == "estimate")
+    return {"count": count, "results": races, "next_cursor": next_cursor}
+
+
+def _race_detail(race: Race) -> dict:
+    return {"race": race, "horses": race.horses}
+
+
+@router.get("/races/details")
+def get_races_details(
+    session: Session = Depends(get_connection),
+    ids: list[UUID] = Query(
+        ..., description="Ids de las carreras (repetir el parámetro por cada una)"
+    ),
 ):
-    total = session.exec(select(func.count()).select_from(Race)).one()
-    races = session.exec(select(Race).offset(offset).limit(limit)).all()
-    return {"count": total, "results": races}
+    """Detalle de varias carreras con sus caballos, en el orden pedido."""
+    if len(ids) > MAX_DETAIL_IDS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Se pueden pedir hasta {MAX_DETAIL_IDS} carreras por vez",
+        )
+    # One query for the races and one for all their horses
+    races = session.exec(
+        select(Race)
+        .where(col(Race.race_id).in_(ids))
+        .options(selectinload(Race.horses))  # type: ignore
+    ).all()
+    by_id = {race.race_id: race for race in races}
+    return [_race_detail(by_id[i]) for i in dict.fromkeys(ids) if i in by_id]
 
 
 @router.get("/races/{race_id}")
 def get_race_detail(race_id: UUID, session: Session = Depends(get_connection)):
-    race = session.get(Race, race_id)
+    # The race and its horses in one query
+    query = select(Race).where(Race.race_id == race_id)
+    race = session.exec(
+        query.options(joinedload(Race.horses))  # type: ignore
+    ).first()
     if not race:
         raise HTTPException(status_code=404, detail="Carrera no encontrada")
 
-    horses = session.exec(select(Horse).where(Horse.race_id == race_id)).all()
-    return {"race": race, "horses": horses}
+    return _race_detail(race)
+
+
+@router.get("/meetings/{hipodromo}/{fecha}")
+def get_meeting(
+    hipodromo: str,
+    fecha: date,
+    session: Session = Depends(get_connection),
+):
+    """
+    Reunión completa: todas las carreras de un día (fecha YYYY-MM-DD) con sus
+    caballos. Hipódromos: palermo, san-isidro.
+    """
+    nombre = HIPODROMOS.get(hipodromo.lower())
+    if nombre is None:
+        raise HTTPException(status_code=404, detail="Hipódromo desconocido")
+
+    meeting = load_meeting(session, nombre, fecha)
+    if meeting is None:
+        raise HTTPException(status_code=404, detail="Reunión no encontrada")
+    return meeting
 
 
 @router.delete("/reset/")
@@ -85,4 +254,5 @@ def reset_database(session: Session = Depends(get_connection)):
     session.exec(text("DELETE FROM races;"))  # type: ignore
     session.exec(text("DELETE FROM pdf_imports;"))  # type: ignore
     session.commit()
+    meeting_cache.clear()
     return {"message": "💣 Base de datos reseteada correctamente."}
@@ -0,0 +1,19 @@
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlmodel import Session
+
+from turf_backend.database import get_connection
+from turf_backend.models.turf import ImportJob
+from turf_backend.services.jobs import describe
+
+router = APIRouter(prefix="/jobs", tags=["Jobs"])
+
+
+@router.get("/{job_id}")
+def get_job(job_id: UUID, session: Session = Depends(get_connection)):
+    """Status and progress of an import job (days done, horses inserted, errors)."""
+    job = session.get(ImportJob, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job no encontrado")
+    return describe(job)
@@ -1,29 +1,26 @@
 # type: ignore [circular]
 # pylint: disable=too-many-locals
-import hashlib
 import logging
-import tempfile
+from pathlib import Path
 
-from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
+import requests
+from fastapi import APIRouter, Depends, File, HTTPException, Request, UploadFile
 from fastapi.responses import FileResponse, JSONResponse, Response
 from sqlmodel import Session, select
 
 from turf_backend.controllers.pdf_file import PdfFileController
 from turf_backend.controllers.temp_pdf_downloader import DailyPdfUpdater
+from turf_backend.core.config.settings import settings
 from turf_backend.database import get_connection
 from turf_backend.models.turf import AvailableLocations, PdfImport
-from turf_backend.services.palermo.palermo_processing import (
-    parse_pdf_horses,
-)
-from turf_backend.services.palermo.races import insert_and_create_races
+from turf_backend.services.import_jobs import PALERMO_UPLOAD
+from turf_backend.services.jobs import describe, enqueue
+from turf_backend.services.pdf.remote import PdfValidators, fetch_pdf
+from turf_backend.services.pdf.spool import spool_upload
 
 logger = logging.getLogger("uvicorn.error")
 
 
-def compute_file_hash(file_content: bytes) -> str:
-    return hashlib.sha256(file_content).hexdigest()
-
-
 router = APIRouter(prefix="/palermo", tags=["Palermo"])
 
 
@@ -64,60 +61,35 @@ def retrieve_file(
     return FileResponse(file_location, media_type="application/pdf", filename=filename)
 
 
-@router.post("/upload-pdf/")
+@router.post("/upload-pdf/", status_code=202)
 async def upload_pdf(
     file: UploadFile = File(...), session: Session = Depends(get_connection)
 ):
+    """Queue the import of an uploaded program PDF; its progress is at /jobs/{id}."""
     if not file.filename:
         raise HTTPException(status_code=400, detail="Se requiere un archivo PDF")
 
-    file_content = await file.read()
-    file_hash = compute_file_hash(file_content)
-
-    existing_import = session.exec(
-        select(PdfImport).where(PdfImport.file_hash == file_hash)
-    ).first()
-
-    if existing_import:
-        raise HTTPException(
-            status_code=409,
-            detail=f"Este PDF ya fue importado anteriormente el {existing_import.imported_at.strftime('%d/%m/%Y a las %H:%M')}",
-        )
-
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
-        tmp.write(file_content)
-        tmp_path = tmp.name
+    async with spool_upload(file, settings.job_spool_dir or None) as upload:
+        existing_import = session.exec(
+            select(PdfImport).where(PdfImport.file_hash == upload.file_hash)
+        ).first()
 
-    try:
-        horses = parse_pdf_horses(tmp_path)
-    except Exception as e:
-        logger.exception("Error extrayendo PDF")
-        raise HTTPException(status_code=500, detail=f"Error extrayendo PDF: {e}")  # noqa: B904
-
-    if not horses:
-        pdf_import = PdfImport(
-            file_hash=file_hash,
-            filename=file.filename,
-            hipodromo="palermo",
-        )
-        session.add(pdf_import)
-        session.commit()
-        return {
-            "message": "No se encontró información de caballos en el PDF.",
-            "inserted": 0,
-        }
-
-    total_inserted = insert_and_create_races(session, horses, tmp_path)
-
-    pdf_import = PdfImport(
-        file_hash=file_hash,
-        filename=file.filename,
-        hipodromo="palermo",
-    )
-    session.add(pdf_import)
-    session.commit()
+        if existing_import:
+            raise HTTPException(
+                status_code=409,
+                detail=f"Este PDF ya fue importado anteriormente el {existing_import.imported_at.strftime('%d/%m/%Y a las %H:%M')}",
+            )
 
-    return {f"Insertadas: {total_inserted}"}
+        params = {"filename": file.filename}
+        if settings.job_spool_dir:
+            # The job reads the spooled PDF and deletes it once done
+            params["path"] = upload.path
+            job = enqueue(session, PALERMO_UPLOAD, params)
+            upload.detach()
+        else:
+            payload = Path(upload.path).read_bytes()
+            job = enqueue(session, PALERMO_UPLOAD, params, payload=payload)
+    return describe(job)
 
 
 @router.get("/available-pdfs")
@@ -146,16 +118,28 @@ def get_available_pdfs():
 
 
 @router.get("/proxy-pdf")
-def proxy_pdf(url: str):
-    """Download a PDF from palermo.com.ar and return it (proxy for GitHub Actions)."""
+def proxy_pdf(url: str, request: Request):
+    """
+    Download a PDF from palermo.com.ar and return it (proxy for GitHub Actions).
+
+    Conditional requests are forwarded, so an unchanged PDF is a 304.
+    """
     try:
-        updater = DailyPdfUpdater()
-        content = updater._download_pdf(url)
+        remote = fetch_pdf(
+            requests.get, url, PdfValidators.from_request(request.headers), timeout=30
+        )
+        headers = {"Content-Location": url, **remote.validators.response_headers()}
+        if remote.unchanged:
+            return Response(status_code=304, headers=headers)
+
         filename = url.split("/")[-1]
         return Response(
-            content=content,
+            content=remote.content,
             media_type="application/pdf",
-            headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+            headers={
+                **headers,
+                "Content-Disposition": f'attachment; filename="{filename}"',
+            },
         )
     except Exception as e:
         logger.exception("Error proxying PDF")
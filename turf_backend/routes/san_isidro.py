@@ -1,28 +1,39 @@
 # pylint: disable=too-many-locals, duplicate-code
-import hashlib
 import logging
-import tempfile
-from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import date
-
-from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile
+from itertools import chain
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    HTTPException,
+    Query,
+    Request,
+    UploadFile,
+)
 from fastapi.responses import Response
 from sqlmodel import Session, select
 
-from turf_backend.database import database, get_connection
+from turf_backend.database import get_connection
 from turf_backend.models.turf import PdfImport
-from turf_backend.services.san_isidro.races import insert_and_create_races
-from turf_backend.services.san_isidro.sanisidro_processing import parse_pdf_horses
+from turf_backend.services.import_jobs import AUTO_IMPORT, SYNC_ALL, SYNC_HISTORICAL
+from turf_backend.services.jobs import describe, enqueue
+from turf_backend.services.pdf.cache import stream_with_cache
+from turf_backend.services.pdf.remote import PdfValidators
+from turf_backend.services.pdf.spool import spool_upload
+from turf_backend.services.san_isidro.races import insert_races_in_batches
+from turf_backend.services.san_isidro.sanisidro_processing import (
+    PARSER_VERSION,
+    iter_program_races,
+)
 from turf_backend.services.san_isidro import scraper
+from turf_backend.utils.date import program_race_date
 
 logger = logging.getLogger("turf")
 logger.setLevel(logging.INFO)
 
 
-def compute_file_hash(file_content: bytes) -> str:
-    return hashlib.sha256(file_content).hexdigest()
-
-
 router = APIRouter(prefix="/san-isidro", tags=["San Isidro"])
 
 
@@ -34,49 +45,51 @@ async def upload_and_save(
     if not file:
         raise HTTPException(status_code=400, detail="Se requiere un archivo PDF válido")
 
-    file_content = await file.read()
-    file_hash = compute_file_hash(file_content)
-
-    existing_import = session.exec(
-        select(PdfImport).where(PdfImport.file_hash == file_hash)
-    ).first()
-
-    if existing_import:
-        raise HTTPException(
-            status_code=409,
-            detail=f"Este PDF ya fue importado anteriormente el {existing_import.imported_at.strftime('%d/%m/%Y a las %H:%M')}",
-        )
-
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
-        tmp.write(file_content)
-        tmp_path = tmp.name
+    # Spooled to disk in chunks and parsed race by race, so memory does not
+    # grow with the size of the PDF
+    async with spool_upload(file) as upload:
+        existing_import = session.exec(
+            select(PdfImport).where(PdfImport.file_hash == upload.file_hash)
+        ).first()
 
-    try:
-        horses = parse_pdf_horses(tmp_path)
-    except Exception as e:
-        logger.exception("Error extrayendo PDF")
-        raise HTTPException(status_code=500, detail=f"Error extrayendo PDF: {e}")  # noqa: B904
+        if existing_import:
+            raise HTTPException(
+                status_code=409,
+                detail=f"Este PDF ya fue importado anteriormente el {existing_import.imported_at.strftime('%d/%m/%Y a las %H:%M')}",
+            )
 
-    if not horses:
         pdf_import = PdfImport(
-            file_hash=file_hash,
+            file_hash=upload.file_hash,
             filename=file.filename,
             hipodromo="san_isidro",
         )
-        session.add(pdf_import)
-        session.commit()
-        return {
-            "message": "No se encontró información de caballos en el PDF.",
-            "inserted": 0,
-        }
+        try:
+            races = iter(
+                stream_with_cache(
+                    session,
+                    upload.file_hash,
+                    PARSER_VERSION,
+                    iter_program_races,
+                    upload.path,
+                )
+            )
+            first_race = next(races, None)
+            if first_race is None:
+                session.add(pdf_import)
+                session.commit()
+                return {
+                    "message": "No se encontró información de caballos en el PDF.",
+                    "inserted": 0,
+                }
 
-    total_inserted = insert_and_create_races(session, horses, tmp_path)
+            total_inserted = insert_races_in_batches(
+                session, chain([first_race], races), program_race_date(upload.path)
+            )
+        except Exception as e:
+            session.rollback()
+            logger.exception("Error extrayendo PDF")
+            raise HTTPException(status_code=500, detail=f"Error extrayendo PDF: {e}")  # noqa: B904
 
-    pdf_import = PdfImport(
-        file_hash=file_hash,
-        filename=file.filename,
-        hipodromo="san_isidro",
-    )
     session.add(pdf_import)
     session.commit()
 
@@ -213,20 +226,36 @@ def get_pdf_links(calendario_id: str):
 
 
 @router.get("/download-pdf/{calendario_id}")
-def download_programa_oficial(calendario_id: str):
-    """Download the PROGRAMA_OFICIAL PDF for a specific race day."""
+def download_programa_oficial(calendario_id: str, request: Request):
+    """
+    Download the PROGRAMA_OFICIAL PDF for a specific race day.
+
+    Conditional requests (If-None-Match / If-Modified-Since) are forwarded, so
+    an unchanged PDF is answered with a 304 instead of being downloaded.
+    """
     try:
         links = scraper.get_pdf_links(calendario_id)
         if not links.programa_oficial:
             raise HTTPException(status_code=404, detail="No se encontró el PDF del programa oficial")
 
-        pdf_content = scraper.download_pdf(links.programa_oficial)
-        filename = links.programa_oficial.split("/")[-1]
+        remote = scraper.fetch_pdf(
+            links.programa_oficial, PdfValidators.from_request(request.headers)
+        )
+        headers = {
+            "Content-Location": links.programa_oficial,
+            **remote.validators.response_headers(),
+        }
+        if remote.unchanged:
+            return Response(status_code=304, headers=headers)
 
+        filename = links.programa_oficial.split("/")[-1]
         return Response(
-            content=pdf_content,
+            content=remote.content,
             media_type="application/pdf",
-            headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+            headers={
+                **headers,
+                "Content-Disposition": f'attachment; filename="{filename}"',
+            },
         )
     except HTTPException:
         raise
@@ -235,140 +264,51 @@ def download_programa_oficial(calendario_id: str):
         raise HTTPException(status_code=500, detail=f"Error downloading PDF: {e}")
 
 
-@router.post("/auto-import/{calendario_id}")
+@router.post("/auto-import/{calendario_id}", status_code=202)
 def auto_import_pdf(calendario_id: str, session: Session = Depends(get_connection)):
-    """Download PROGRAMA_OFICIAL PDF and import it automatically."""
+    """
+    Queue the download and import of a PROGRAMA_OFICIAL PDF. Returns the job,
+    whose progress is at /jobs/{id}.
+    """
     try:
         links = scraper.get_pdf_links(calendario_id)
-        if not links.programa_oficial:
-            raise HTTPException(status_code=404, detail="No se encontró el PDF del programa oficial")
-
-        pdf_content = scraper.download_pdf(links.programa_oficial)
-        file_hash = compute_file_hash(pdf_content)
-
-        existing_import = session.exec(
-            select(PdfImport).where(PdfImport.file_hash == file_hash)
-        ).first()
-
-        if existing_import:
-            raise HTTPException(
-                status_code=409,
-                detail=f"Este PDF ya fue importado anteriormente el {existing_import.imported_at.strftime('%d/%m/%Y a las %H:%M')}",
-            )
-
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
-            tmp.write(pdf_content)
-            tmp_path = tmp.name
-
-        try:
-            horses = parse_pdf_horses(tmp_path)
-        except Exception as e:
-            logger.exception("Error extrayendo PDF")
-            raise HTTPException(status_code=500, detail=f"Error extrayendo PDF: {e}")  # noqa: B904
-
-        filename = links.programa_oficial.split("/")[-1]
-
-        if not horses:
-            pdf_import = PdfImport(file_hash=file_hash, filename=filename, hipodromo="san_isidro")
-            session.add(pdf_import)
-            session.commit()
-            return {"message": "No se encontró información de caballos en el PDF.", "inserted": 0}
-
-        total_inserted = insert_and_create_races(session, horses, tmp_path)
-
-        pdf_import = PdfImport(file_hash=file_hash, filename=filename, hipodromo="san_isidro")
-        session.add(pdf_import)
-        session.commit()
-
-        return {"message": "Importado correctamente", "inserted": total_inserted, "pdf": filename}
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.exception("Error auto-importing PDF")
-        raise HTTPException(status_code=500, detail=f"Error auto-importing: {e}")
-
-
-def _import_day(session: Session, fecha: str, calendario_id: str) -> dict:
-    """Download and import the PROGRAMA_OFICIAL PDF for a single day. Returns a result dict."""
-    try:
-        links = scraper.get_pdf_links(calendario_id)
-        if not links.programa_oficial:
-            return {"fecha": fecha, "status": "skipped", "reason": "no PDF found"}
-
-        pdf_content = scraper.download_pdf(links.programa_oficial)
-        file_hash = compute_file_hash(pdf_content)
-
-        existing = session.exec(select(PdfImport).where(PdfImport.file_hash == file_hash)).first()
-        if existing:
-            return {"fecha": fecha, "status": "skipped", "reason": "already imported"}
-
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
-            tmp.write(pdf_content)
-            tmp_path = tmp.name
-
-        horses = parse_pdf_horses(tmp_path)
-        filename = links.programa_oficial.split("/")[-1]
-
-        if not horses:
-            session.add(PdfImport(file_hash=file_hash, filename=filename, hipodromo="san_isidro"))
-            session.commit()
-            return {"fecha": fecha, "status": "imported", "inserted": 0}
-
-        total_inserted = insert_and_create_races(session, horses, tmp_path)
-        session.add(PdfImport(file_hash=file_hash, filename=filename, hipodromo="san_isidro"))
-        session.commit()
-        return {"fecha": fecha, "status": "imported", "inserted": total_inserted}
-
     except Exception as e:
-        logger.exception("Error syncing %s", fecha)
-        return {"fecha": fecha, "status": "error", "reason": str(e)}
-
-
-def _import_day_concurrent(fecha: str, calendario_id: str) -> dict:
-    """Versión de _import_day con sesión propia para uso en threads."""
-    with database.get_session() as session:
-        return _import_day(session, fecha, calendario_id)
-
+        logger.exception("Error fetching PDF links")
+        raise HTTPException(status_code=500, detail=f"Error fetching PDF links: {e}")
+    if not links.programa_oficial:
+        raise HTTPException(status_code=404, detail="No se encontró el PDF del programa oficial")
 
-@router.post("/sync-all")
-def sync_all_upcoming():
-    """Download and import PDFs for all upcoming orange days. Called by GitHub Actions cron."""
-    try:
-        orange_days = scraper.get_orange_days()
-    except Exception as e:
-        logger.exception("Error fetching orange days")
-        raise HTTPException(status_code=500, detail=f"Error fetching calendar: {e}")
+    job = enqueue(session, AUTO_IMPORT, {"calendario_id": calendario_id}, unique=True)
+    return describe(job)
 
-    with ThreadPoolExecutor(max_workers=4) as executor:
-        futures = {
-            executor.submit(_import_day_concurrent, fecha, cid): fecha
-            for fecha, cid in orange_days
-        }
-        results = [f.result() for f in as_completed(futures)]
 
-    return {"results": results}
+@router.post("/sync-all", status_code=202)
+def sync_all_upcoming(session: Session = Depends(get_connection)):
+    """
+    Queue the import of the PDFs of all upcoming orange days. Called by
+    GitHub Actions cron; the job's progress is at /jobs/{id}.
+    """
+    return describe(enqueue(session, SYNC_ALL, unique=True))
 
 
-@router.post("/sync-historical")
+@router.post("/sync-historical", status_code=202)
 def sync_historical(
     start: date = Query(..., description="Fecha inicio (YYYY-MM-DD)"),
     end: date = Query(..., description="Fecha fin (YYYY-MM-DD)"),
+    full: bool = Query(  # noqa: FBT001
+        default=False, description="Revisar también los días ya sincronizados"
+    ),
+    session: Session = Depends(get_connection),
 ):
-    """Download and import PDFs for all past race days in a date range."""
-    try:
-        resultados_days = scraper.get_resultados_days(start, end)
-    except Exception as e:
-        logger.exception("Error fetching resultados days")
-        raise HTTPException(status_code=500, detail=f"Error fetching calendar: {e}")
-
-    if not resultados_days:
-        return {"results": [], "message": "No se encontraron días de resultados en ese rango"}
-
-    with ThreadPoolExecutor(max_workers=4) as executor:
-        futures = {
-            executor.submit(_import_day_concurrent, fecha, cid): fecha
-            for fecha, cid in resultados_days
-        }
-        results = [f.result() for f in as_completed(futures)]
-
-    return {"results": results}
+    """
+    Queue the import of the PDFs of all past race days in a date range.
+
+    Days completed by a previous run are skipped before any download, and the
+    range already covered by the watermark is not listed again, so an
+    interrupted backfill resumes where it stopped. The job's progress is at
+    /jobs/{id}.
+    """
+    if start > end:
+        raise HTTPException(status_code=400, detail="La fecha inicio es posterior a la fecha fin")
+    params = {"start": start.isoformat(), "end": end.isoformat(), "full": full}
+    return describe(enqueue(session, SYNC_HISTORICAL, params, unique=True))
@@ -0,0 +1,156 @@
+import io
+import logging
+from collections.abc import Iterable, Sequence
+from typing import Any
+
+from sqlalchemy import insert
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel import Session, SQLModel
+
+from turf_backend.core.config.settings import settings
+from turf_backend.models.turf import Horse, Race
+
+logger = logging.getLogger("turf")
+
+# Rows per multi-row INSERT statement sent by the values mode
+INSERT_BATCH_SIZE = 1000
+# Columns of uq_horse_unique, used as the ON CONFLICT target
+HORSE_CONFLICT_COLUMNS = ("nombre", "numero", "page")
+
+
+def _columns(model: type[SQLModel]) -> list[str]:
+    # Autoincrement ids are left to the database
+    table = model.__table__  # type: ignore[attr-defined]
+    return [c.name for c in table.columns if c.name != "id"]
+
+
+def _rows(objects: Iterable[SQLModel], columns: Sequence[str]) -> list[dict[str, Any]]:
+    return [{c: getattr(obj, c) for c in columns} for obj in objects]
+
+
+def dialect_insert(session: Session, model: type[SQLModel]):
+    dialect = session.get_bind().dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert(model)
+    if dialect == "sqlite":
+        return sqlite.insert(model)
+    return insert(model)
+
+
+def _insert_values(
+    session: Session, model: type[SQLModel], rows: list[dict[str, Any]], **conflict
+) -> int:
+    if not rows:
+        return 0
+    stmt = dialect_insert(session, model)
+    if conflict and hasattr(stmt, "on_conflict_do_nothing"):
+        stmt = stmt.on_conflict_do_nothing(**conflict)
+    # executemany with RETURNING is sent as multi-row VALUES batches
+    # ("insertmanyvalues"), and only the rows actually inserted come back
+    primary_key = model.__table__.primary_key.columns  # type: ignore[attr-defined]
+    result = session.exec(
+        stmt.returning(*primary_key),  # type: ignore
+        params=rows,
+        execution_options={"insertmanyvalues_page_size": INSERT_BATCH_SIZE},
+    )
+    return len(result.all())
+
+
+def _copy_value(value: Any) -> str:
+    if value is None:
+        return "\\N"
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+def _copy_buffer(rows: list[dict[str, Any]], columns: Sequence[str]) -> io.StringIO:
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write("\t".join(_copy_value(row[c]) for c in columns))
+        buffer.write("\n")
+    buffer.seek(0)
+    return buffer
+
+
+def _copy_races_and_horses(
+    session: Session, races: list[Race], horses: list[Horse]
+) -> int:
+    """
+    Stream races straight into their table and horses through a temporary
+    staging table, so uq_horse_unique collisions are skipped by a single
+    INSERT ... SELECT ... ON CONFLICT DO NOTHING.
+    """
+    race_columns = _columns(Race)
+    horse_columns = _columns(Horse)
+    race_cols = ", ".join(race_columns)
+    horse_cols = ", ".join(horse_columns)
+    conflict_cols = ", ".join(HORSE_CONFLICT_COLUMNS)
+
+    cursor = session.connection().connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY {Race.__tablename__} ({race_cols}) FROM STDIN",
+            _copy_buffer(_rows(races, race_columns), race_columns),
+        )
+        cursor.execute(
+            "CREATE TEMP TABLE horses_staging "
+            f"(LIKE {Horse.__tablename__} INCLUDING DEFAULTS) ON COMMIT DROP"
+        )
+        cursor.copy_expert(
+            f"COPY horses_staging ({horse_cols}) FROM STDIN",
+            _copy_buffer(_rows(horses, horse_columns), horse_columns),
+        )
+        cursor.execute(
+            f"INSERT INTO {Horse.__tablename__} ({horse_cols}) "
+            f"SELECT {horse_cols} FROM horses_staging "
+            f"ON CONFLICT ({conflict_cols}) DO NOTHING"
+        )
+        return cursor.rowcount
+    finally:
+        cursor.close()
+
+
+def write_races_and_horses(
+    session: Session, races: list[Race], horses: list[Horse]
+) -> int:
+    """
+    Insert a parsed program's races and horses and commit once.
+
+    BULK_INSERT_MODE picks the writer: "orm" (default) adds the objects to the
+    session; "values" sends multi-row INSERT batches and "copy" streams them
+    with PostgreSQL COPY. Both bulk modes skip horses that collide on
+    uq_horse_unique instead of failing the whole import, and bypass the
+    identity map, so the objects passed in are not refreshed from the database.
+
+    Returns how many horses were inserted.
+    """
+    mode = settings.bulk_insert_mode
+    if mode == "copy" and session.get_bind().dialect.name != "postgresql":
+        logger.warning("BULK_INSERT_MODE=copy needs PostgreSQL, using values")
+        mode = "values"
+
+    if mode == "copy":
+        inserted = _copy_races_and_horses(session, races, horses)
+    elif mode == "values":
+        _insert_values(session, Race, _rows(races, _columns(Race)))
+        inserted = _insert_values(
+            session,
+            Horse,
+            _rows(horses, _columns(Horse)),
+            index_elements=list(HORSE_CONFLICT_COLUMNS),
+        )
+    else:
+        session.add_all(races)
+        session.flush()
+        session.add_all(horses)
+        inserted = len(horses)
+
+    session.commit()
+    if inserted < len(horses):
+        logger.info("Skipped %d duplicate horses", len(horses) - inserted)
+    return inserted
@@ -0,0 +1,153 @@
+import threading
+import weakref
+from collections.abc import Iterable
+
+from sqlalchemy import Engine, event
+from sqlmodel import Session, col, select
+
+from turf_backend.models.turf import (
+    CatalogEntry,
+    CatalogHorse,
+    Horse,
+    Jockey,
+    Stud,
+    Trainer,
+)
+from turf_backend.services.bulk_insert import dialect_insert
+from turf_backend.services.search import fold
+
+# session.info key of the ids created in a transaction that is not committed yet
+_PENDING = "catalog_pending"
+
+
+def catalog_key(name: str | None) -> str | None:
+    """Key a name is matched by: "NIÑO  Oscuro " -> "nino oscuro"."""
+    key = " ".join((fold(name) or "").split())
+    return key or None
+
+
+class NameCatalog:
+    """
+    Catalogue ids by name key for one catalogue table, kept in memory per
+    database engine.
+
+    The whole table is read on first use; names not seen yet are inserted
+    (skipping ones a concurrent import added) in the caller's transaction.
+    Ids created that way are only shared with other sessions once that
+    transaction commits, so a rolled back import cannot leave ids behind
+    that do not exist.
+    """
+
+    def __init__(self, model: type[CatalogEntry]) -> None:
+        self.model = model
+        self._ids: weakref.WeakKeyDictionary[Engine, dict[str, int]] = (
+            weakref.WeakKeyDictionary()
+        )
+        self._lock = threading.Lock()
+
+    def _warm(self, session: Session) -> dict[str, int]:
+        engine = session.get_bind()
+        with self._lock:
+            ids = self._ids.get(engine)  # type: ignore[arg-type]
+            if ids is None:
+                rows = session.exec(select(self.model.clave, self.model.id)).all()
+                ids = self._ids[engine] = dict(rows)  # type: ignore
+            return ids
+
+    def resolve(self, session: Session, names: Iterable[str | None]) -> dict[str, int]:
+        """Ids of `names` by catalog_key, adding the names that are missing."""
+        known = self._warm(session)
+        pending: dict[str, int] = session.info.get(_PENDING, {}).get(self.model, {})
+        wanted: dict[str, str] = {}
+        for name in names:
+            key = catalog_key(name)
+            if key is not None and key not in wanted:
+                wanted[key] = name.strip()  # type: ignore[union-attr]
+
+        ids = {k: known.get(k) or pending.get(k) for k in wanted}
+        missing = [k for k, id_ in ids.items() if id_ is None]
+        if missing:
+            stmt = dialect_insert(session, self.model)
+            if hasattr(stmt, "on_conflict_do_nothing"):
+                stmt = stmt.on_conflict_do_nothing(index_elements=["clave"])
+            session.exec(
+                stmt,  # type: ignore
+                params=[{"clave": k, "nombre": wanted[k]} for k in missing],
+            )
+            created = dict(
+                session.exec(
+                    select(self.model.clave, self.model.id).where(
+                        col(self.model.clave).in_(missing)
+                    )
+                ).all()
+            )
+            session.info.setdefault(_PENDING, {}).setdefault(self.model, {}).update(
+                created
+            )
+            ids.update(created)
+        return ids  # type: ignore[return-value]
+
+    def publish(self, engine: Engine, created: dict[str, int]) -> None:
+        with self._lock:
+            ids = self._ids.get(engine)
+            if ids is not None:
+                ids.update(created)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._ids.clear()
+
+
+catalogs = {
+    model: NameCatalog(model) for model in (CatalogHorse, Jockey, Trainer, Stud)
+}
+
+# Horse name column, catalogue id column and catalogue table of each link
+HORSE_LINKS = (
+    ("nombre", "catalog_horse_id", CatalogHorse),
+    ("jockey", "jockey_id", Jockey),
+    ("entrenador", "trainer_id", Trainer),
+    ("caballeriza", "stud_id", Stud),
+)
+
+
+def link_horses(session: Session, horses: list[Horse]) -> None:
+    """Point every Horse at the catalogue entries of its names."""
+    for name_field, id_field, model in HORSE_LINKS:
+        ids = catalogs[model].resolve(session, (getattr(h, name_field) for h in horses))
+        for h in horses:
+            key = catalog_key(getattr(h, name_field))
+            setattr(h, id_field, ids.get(key) if key is not None else None)
+
+
+def backfill_catalog(session: Session, batch_size: int = 5000) -> int:
+    """Link the Horse rows stored before the catalogue existed, in batches."""
+    linked = 0
+    last_id = 0
+    while True:
+        horses = list(
+            session.exec(
+                select(Horse)
+                .where(col(Horse.catalog_horse_id).is_(None), col(Horse.id) > last_id)
+                .order_by(Horse.id)  # type: ignore
+                .limit(batch_size)
+            ).all()
+        )
+        if not horses:
+            return linked
+        last_id = horses[-1].id  # type: ignore[assignment]
+        link_horses(session, horses)
+        session.add_all(horses)
+        session.commit()
+        linked += len(horses)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_created_ids(session: Session) -> None:
+    for model, created in session.info.pop(_PENDING, {}).items():
+        catalogs[model].publish(session.get_bind(), created)  # type: ignore[arg-type]
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _drop_created_ids(session: Session, _previous_transaction) -> None:
+    session.info.pop(_PENDING, None)
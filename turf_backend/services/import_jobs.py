@@ -0,0 +1,134 @@
+import json
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import date
+from itertools import chain
+from pathlib import Path
+
+from sqlalchemy import Engine
+from sqlmodel import Session, select
+
+from turf_backend.models.turf import ImportJob, PdfImport
+from turf_backend.services.jobs import JobProgress, job_handler
+from turf_backend.services.palermo.palermo_processing import (
+    PARSER_VERSION,
+    iter_program_races,
+)
+from turf_backend.services.palermo.races import insert_races_in_batches
+from turf_backend.services.pdf.cache import stream_with_cache
+from turf_backend.services.pdf.spool import SpooledPdf, spool_chunks, spooled_file
+from turf_backend.services.san_isidro import scraper
+from turf_backend.services.san_isidro.pipeline import HIPODROMO, SyncPipeline
+from turf_backend.services.sync_state import (
+    advance_watermark,
+    pending_days,
+    resume_from,
+)
+from turf_backend.utils.date import program_race_date
+
+# Kinds of ImportJob, one per import the API used to run inside the request
+SYNC_ALL = "san_isidro.sync_all"
+SYNC_HISTORICAL = "san_isidro.sync_historical"
+AUTO_IMPORT = "san_isidro.auto_import"
+PALERMO_UPLOAD = "palermo.upload_pdf"
+
+
+@job_handler(SYNC_ALL)
+def sync_all_upcoming(engine: Engine, _job: ImportJob, progress: JobProgress) -> None:
+    days = scraper.get_orange_days()
+    progress.start(len(days))
+    SyncPipeline(engine, on_result=progress.advance).run(days)
+
+
+@job_handler(SYNC_HISTORICAL)
+def sync_historical(engine: Engine, job: ImportJob, progress: JobProgress) -> str:
+    params = json.loads(job.params)
+    start, end = date.fromisoformat(params["start"]), date.fromisoformat(params["end"])
+    full = params.get("full", False)
+
+    with Session(engine) as session:
+        first = start if full else resume_from(session, HIPODROMO, start)
+        if first > end:
+            progress.start(0)
+            return "Rango ya sincronizado"
+
+        resultados_days = scraper.get_resultados_days(first, end)
+        days = resultados_days
+        if not full:
+            days = pending_days(session, HIPODROMO, resultados_days)
+        progress.start(len(days))
+        SyncPipeline(engine, checkpoint=True, on_result=progress.advance).run(days)
+        advance_watermark(session, HIPODROMO, first, end, resultados_days)
+
+    if not resultados_days:
+        return "No se encontraron días de resultados en ese rango"
+    return f"{len(resultados_days) - len(days)} días ya sincronizados"
+
+
+@job_handler(AUTO_IMPORT)
+def auto_import(engine: Engine, job: ImportJob, progress: JobProgress) -> None:
+    calendario_id = json.loads(job.params)["calendario_id"]
+    progress.start(1)
+    # No calendar date: the race day is read from the PDF
+    SyncPipeline(engine, on_result=progress.advance).run([("", calendario_id)])
+
+
+@contextmanager
+def _upload_pdf(job: ImportJob, params: dict) -> Iterator[SpooledPdf]:
+    """
+    The PDF of a Palermo upload job: the file spooled by the request (see
+    JOB_SPOOL_DIR) or the job's payload written to a temporary file. Either
+    one is deleted when the block exits.
+    """
+    if "path" in params:
+        if not Path(params["path"]).exists():
+            msg = (
+                f"No se encuentra el PDF subido en {params['path']}: JOB_SPOOL_DIR "
+                "tiene que ser un directorio compartido con todos los workers"
+            )
+            raise FileNotFoundError(msg)
+        with spooled_file(params["path"]) as pdf:
+            yield pdf
+    else:
+        with spool_chunks([job.payload or b""]) as pdf:
+            yield pdf
+
+
+@job_handler(PALERMO_UPLOAD)
+def palermo_upload(engine: Engine, job: ImportJob, progress: JobProgress) -> str | None:
+    params = json.loads(job.params)
+    filename = params["filename"]
+    progress.start(1)
+
+    with _upload_pdf(job, params) as pdf, Session(engine) as session:
+        if session.exec(
+            select(PdfImport).where(PdfImport.file_hash == pdf.file_hash)
+        ).first():
+            progress.advance({
+                "filename": filename,
+                "status": "skipped",
+                "reason": "already imported",
+            })
+            return None
+
+        # Parsed race by race and written in batches as the races complete
+        races = iter(
+            stream_with_cache(
+                session, pdf.file_hash, PARSER_VERSION, iter_program_races, pdf.path
+            )
+        )
+        first_race = next(races, None)
+        inserted = 0
+        if first_race is not None:
+            inserted = insert_races_in_batches(
+                session, chain([first_race], races), program_race_date(pdf.path)
+            )
+        session.add(
+            PdfImport(file_hash=pdf.file_hash, filename=filename, hipodromo="palermo")
+        )
+        session.commit()
+
+    progress.advance({"filename": filename, "status": "imported", "inserted": inserted})
+    if first_race is None:
+        return "No se encontró información de caballos en el PDF."
+    return None
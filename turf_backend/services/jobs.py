@@ -0,0 +1,329 @@
+import json
+import logging
+import os
+import socket
+import threading
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import Engine, update
+from sqlmodel import Session, col, select
+
+from turf_backend.models.turf import ImportJob
+
+logger = logging.getLogger("turf")
+
+ACTIVE_STATUSES = ("queued", "running")
+# A running job whose worker has not reported for this long is run again
+JOB_STALE_AFTER = timedelta(minutes=15)
+# Runs of a job (including restarts of stale ones) before it is failed
+JOB_MAX_ATTEMPTS = 3
+# How often a job's heartbeat is saved while its handler runs, so a long step
+# (listing a year of race days, one slow PDF) does not make it look stale
+JOB_HEARTBEAT_INTERVAL = timedelta(minutes=1)
+
+JobHandler = Callable[[Engine, ImportJob, "JobProgress"], str | None]
+
+# Job kind -> function running it; see services/import_jobs.py
+JOB_HANDLERS: dict[str, JobHandler] = {}
+
+# Set by enqueue() so the workers of this process do not wait for their next poll
+_wakeup = threading.Event()
+
+
+def job_handler(kind: str) -> Callable[[JobHandler], JobHandler]:
+    """
+    Register the function running the jobs of `kind`. It gets the engine, the
+    job and its JobProgress, and may return a summary for ImportJob.message.
+    """
+
+    def register(func: JobHandler) -> JobHandler:
+        JOB_HANDLERS[kind] = func
+        return func
+
+    return register
+
+
+def enqueue(
+    session: Session,
+    kind: str,
+    params: dict[str, Any] | None = None,
+    payload: bytes | None = None,
+    *,
+    unique: bool = False,
+) -> ImportJob:
+    """
+    Queue a job and return it. With `unique`, a job of the same kind and
+    params that is still queued or running is returned instead of a new one.
+    """
+    encoded = json.dumps(params or {}, sort_keys=True)
+    if unique:
+        active = session.exec(
+            select(ImportJob).where(
+                ImportJob.kind == kind,
+                ImportJob.params == encoded,
+                col(ImportJob.status).in_(ACTIVE_STATUSES),
+            )
+        ).first()
+        if active is not None:
+            return active
+
+    job = ImportJob(kind=kind, params=encoded, payload=payload)
+    session.add(job)
+    session.commit()
+    session.refresh(job)
+    _wakeup.set()
+    return job
+
+
+def describe(job: ImportJob) -> dict[str, Any]:
+    """What /jobs/{id} reports about a job (everything but the payload)."""
+    return {
+        "id": str(job.id),
+        "kind": job.kind,
+        "status": job.status,
+        "params": json.loads(job.params),
+        "total": job.total,
+        "done": job.done,
+        "inserted": job.inserted,
+        "errors": job.errors,
+        "results": json.loads(job.results),
+        "message": job.message,
+        "attempts": job.attempts,
+        "created_at": job.created_at.isoformat(),
+        "started_at": job.started_at and job.started_at.isoformat(),
+        "finished_at": job.finished_at and job.finished_at.isoformat(),
+    }
+
+
+def requeue_stale(session: Session, now: datetime | None = None) -> int:
+    """Queue again the running jobs whose worker stopped reporting (it died)."""
+    now = now or datetime.now()
+    stale = session.exec(
+        select(ImportJob).where(
+            ImportJob.status == "running",
+            col(ImportJob.heartbeat_at) < now - JOB_STALE_AFTER,
+        )
+    ).all()
+    for job in stale:
+        if job.attempts >= JOB_MAX_ATTEMPTS:
+            job.status, job.finished_at = "failed", now
+            job.message = f"Abandonado tras {job.attempts} intentos"
+            _discard_upload(job)
+        else:
+            job.status = "queued"
+        session.add(job)
+    session.commit()
+    return len(stale)
+
+
+def claim_next(session: Session, worker: str) -> ImportJob | None:
+    """
+    Take the oldest queued job for `worker`. The claim is a conditional UPDATE,
+    so workers in other threads or processes never get the same job.
+    """
+    candidates = session.exec(
+        select(ImportJob.id)
+        .where(ImportJob.status == "queued")
+        .order_by(col(ImportJob.created_at))
+        .limit(5)
+    ).all()
+    for job_id in candidates:
+        now = datetime.now()
+        claimed = session.exec(
+            update(ImportJob)  # type: ignore
+            .where(col(ImportJob.id) == job_id, col(ImportJob.status) == "queued")
+            .values(
+                status="running",
+                worker=worker,
+                attempts=ImportJob.attempts + 1,
+                started_at=now,
+                heartbeat_at=now,
+            )
+        )
+        session.commit()
+        if claimed.rowcount == 1:
+            return session.get(ImportJob, job_id)
+    return None
+
+
+class JobProgress:
+    """
+    Progress of a running job, saved to its row in a session of its own as it
+    advances, so it is visible while the job's own transactions are open.
+    Safe to call from the threads of the job (e.g. the sync pipeline writer).
+    """
+
+    def __init__(self, engine: Engine, job_id: UUID) -> None:
+        self.engine = engine
+        self.job_id = job_id
+        self._lock = threading.Lock()
+
+    def _save(self, change: Callable[[ImportJob], None]) -> None:
+        with self._lock, Session(self.engine) as session:
+            job = session.get(ImportJob, self.job_id)
+            if job is None:
+                return
+            change(job)
+            job.heartbeat_at = datetime.now()
+            session.add(job)
+            session.commit()
+
+    def beat(self) -> None:
+        """Save the heartbeat alone: the worker is alive, the job still runs."""
+        self._save(lambda _job: None)
+
+    def start(self, total: int) -> None:
+        def change(job: ImportJob) -> None:
+            job.total = total
+
+        self._save(change)
+
+    def advance(self, result: dict[str, Any]) -> None:
+        """Count the result dict of one day (or file) of the job."""
+
+        def change(job: ImportJob) -> None:
+            job.done += 1
+            job.inserted += result.get("inserted", 0)
+            job.errors += result.get("status") == "error"
+            job.results = json.dumps([*json.loads(job.results), result], default=str)
+
+        self._save(change)
+
+    def finish(self, status: str, message: str | None = None) -> None:
+        def change(job: ImportJob) -> None:
+            job.status, job.message = status, message
+            job.finished_at = datetime.now()
+            job.payload = None
+
+        self._save(change)
+
+
+@contextmanager
+def _heartbeat(progress: JobProgress) -> Iterator[None]:
+    """Save the job's heartbeat every JOB_HEARTBEAT_INTERVAL while the block runs."""
+    interval = JOB_HEARTBEAT_INTERVAL
+    stop = threading.Event()
+
+    def beat() -> None:
+        while not stop.wait(interval.total_seconds()):
+            try:
+                progress.beat()
+            except Exception:
+                logger.exception("Heartbeat of job %s failed", progress.job_id)
+
+    thread = threading.Thread(
+        target=beat, name=f"job-heartbeat-{progress.job_id}", daemon=True
+    )
+    thread.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        thread.join()
+
+
+def run_job(engine: Engine, job: ImportJob) -> None:
+    progress = JobProgress(engine, job.id)
+    handler = JOB_HANDLERS.get(job.kind)
+    if handler is None:
+        progress.finish("failed", f"Tipo de job desconocido: {job.kind}")
+        _discard_upload(job)
+        return
+    try:
+        with _heartbeat(progress):
+            message = handler(engine, job, progress)
+    except Exception as e:
+        logger.exception("Job %s (%s) failed", job.id, job.kind)
+        progress.finish("failed", str(e))
+        _discard_upload(job)
+    else:
+        progress.finish("done", message)
+
+
+def _discard_upload(job: ImportJob) -> None:
+    """
+    Delete the file spooled for a job (its "path" param, see JOB_SPOOL_DIR)
+    once the job failed for good. A successful run deletes it itself.
+    """
+    path = json.loads(job.params).get("path")
+    if path:
+        Path(path).unlink(missing_ok=True)
+
+
+def run_next(engine: Engine, worker: str) -> ImportJob | None:
+    """Claim and run the oldest queued job, if any. Returns the job run."""
+    with Session(engine) as session:
+        requeue_stale(session)
+        job = claim_next(session, worker)
+    if job is not None:
+        logger.info("Running job %s (%s) on %s", job.id, job.kind, worker)
+        run_job(engine, job)
+    return job
+
+
+def run_pending(engine: Engine, worker: str | None = None) -> int:
+    """Run queued jobs until there are none left. Returns how many ran."""
+    worker = worker or _worker_name()
+    ran = 0
+    while run_next(engine, worker) is not None:
+        ran += 1
+    return ran
+
+
+def _worker_name(index: int = 0) -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{index}"
+
+
+class JobWorker:
+    """
+    Threads running queued jobs in this process. The queue is the import_jobs
+    table, so any number of processes (the API, scripts/run_jobs.py) can work
+    on it without a broker.
+    """
+
+    def __init__(self, engine: Engine, threads: int = 1, poll_interval: float = 2.0):
+        self.engine = engine
+        self.threads = threads
+        self.poll_interval = poll_interval
+        self._stop = threading.Event()
+        self._threads: list[threading.Thread] = []
+
+    def start(self) -> None:
+        for index in range(self.threads):
+            thread = threading.Thread(
+                target=self._loop,
+                args=(_worker_name(index),),
+                name=f"job-worker-{index}",
+                daemon=True,
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: float | None = None) -> None:
+        self._stop.set()
+        _wakeup.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads.clear()
+
+    def join(self) -> None:
+        """Block until the worker is stopped (Ctrl+C still gets through)."""
+        for thread in self._threads:
+            while thread.is_alive():
+                thread.join(1)
+
+    def _loop(self, worker: str) -> None:
+        while not self._stop.is_set():
+            try:
+                job = run_next(self.engine, worker)
+            except Exception:
+                logger.exception("Job worker %s failed to claim a job", worker)
+                job = None
+            if job is None:
+                _wakeup.wait(self.poll_interval)
+                _wakeup.clear()
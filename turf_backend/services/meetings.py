@@ -0,0 +1,116 @@
+import threading
+import time
+from collections import OrderedDict
+from datetime import date
+from typing import Any
+
+from sqlalchemy.orm import selectinload
+from sqlmodel import Session, select
+
+from turf_backend.models.turf import Horse, Race
+
+# Seconds a meeting is served from memory before reading it again
+MEETING_CACHE_TTL = 60
+# Meetings kept in memory; the least recently used are dropped first
+MEETING_CACHE_MAX_ENTRIES = 64
+
+# URL slug of each hipódromo -> Race.hipodromo
+HIPODROMOS = {"palermo": "Palermo", "san-isidro": "San Isidro"}
+
+MeetingKey = tuple[str, date]
+
+
+class MeetingCache:
+    """
+    Serialized meetings by (hipodromo, race_date), reused for `ttl` seconds.
+
+    Entries are plain dicts, so they do not hold on to the session that
+    loaded them. Imports call invalidate() for the meeting they wrote; other
+    worker processes keep their copy until it expires.
+    """
+
+    def __init__(
+        self,
+        ttl: float = MEETING_CACHE_TTL,
+        max_entries: int = MEETING_CACHE_MAX_ENTRIES,
+    ) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: OrderedDict[MeetingKey, tuple[dict[str, Any], float]] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def get(self, key: MeetingKey) -> dict[str, Any] | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if time.monotonic() - entry[1] >= self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def store(self, key: MeetingKey, meeting: dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[key] = (meeting, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, hipodromo: str | None, race_date: date | None) -> None:
+        if hipodromo is None or race_date is None:
+            return
+        with self._lock:
+            self._entries.pop((hipodromo, race_date), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+meeting_cache = MeetingCache()
+
+
+def _horse_order(horse: Horse) -> tuple[int, int, int]:
+    return (horse.page or 0, horse.line_index or 0, horse.id or 0)
+
+
+def load_meeting(
+    session: Session, hipodromo: str, race_date: date
+) -> dict[str, Any] | None:
+    """
+    Every race of a meeting with its horses, ordered by race number, or None
+    if nothing was imported for it. Served from meeting_cache when possible.
+    """
+    key = (hipodromo, race_date)
+    meeting = meeting_cache.get(key)
+    if meeting is not None:
+        return meeting
+
+    races = session.exec(
+        select(Race)
+        .where(Race.hipodromo == hipodromo, Race.race_date == race_date)
+        .options(selectinload(Race.horses))  # type: ignore
+    ).all()
+    if not races:
+        return None
+
+    races = sorted(races, key=lambda r: (r.numero is None, r.numero or 0))
+    meeting = {
+        "hipodromo": hipodromo,
+        "fecha": race_date.isoformat(),
+        "races": [
+            {
+                "race": race.model_dump(mode="json"),
+                "horses": [
+                    h.model_dump(mode="json")
+                    for h in sorted(race.horses, key=_horse_order)
+                ],
+            }
+            for race in races
+        ],
+    }
+    meeting_cache.store(key, meeting)
+    return meeting
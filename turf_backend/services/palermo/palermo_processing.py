@@ -1,14 +1,22 @@
 import logging
 import re
 import uuid
-
-import pdfplumber
+from bisect import bisect_right
+from collections.abc import Iterable, Iterator
 
 from turf_backend.models.turf import Horse
+from turf_backend.services.palermo.races import extract_race_info_from_lines
+from turf_backend.services.pdf.layout import LayoutProfile
+from turf_backend.services.pdf.pages import ParsedProgram, PdfPage, iter_pdf_pages
+from turf_backend.services.pdf.rows import iter_rows
 
 logger = logging.getLogger("turf")
 logger.setLevel(logging.INFO)
 
+# Key of this parser's results in the parsed PDF cache. Bump it whenever
+# _parse_horse_row (or anything else that changes the parsed output) changes.
+PARSER_VERSION = "palermo-5"
+
 # Column x-boundaries (consistent across all Palermo PDFs)
 _ULTIMAS_X_START = 110.0
 _NUMERO_X = 165.0
@@ -19,12 +27,104 @@ _EDAD_X = 394.0     # E column
 _PM_X = 403.0       # Padre-Madre starts here
 _ENTRENADOR_X = 496.0
 
+# Left edges of the columns, in order. bisect_right(_COLUMN_EDGES, x0) is the
+# column of a word starting at x0, with 0 for the caballeriza margin (x < 110)
+_COLUMN_EDGES = (
+    _ULTIMAS_X_START,
+    _NUMERO_X,
+    _NOMBRE_X,
+    _JOCKEY_X,
+    _PELO_X,
+    _EDAD_X,
+    _PM_X,
+    _ENTRENADOR_X,
+)
+(
+    _MARGIN_COL,
+    _ULTIMAS_COL,
+    _NUMERO_COL,
+    _NOMBRE_COL,
+    _JOCKEY_COL,
+    _PELO_COL,
+    _EDAD_COL,
+    _PM_COL,
+    _ENTRENADOR_COL,
+) = range(len(_COLUMN_EDGES) + 1)
+
+_ULTIMA_RE = re.compile(r"^\d[A-Z]")
+_NOMBRE_RE = re.compile(r"^[A-ZÁÉÍÓÚÑ'\-]")
+_PESO_RE = re.compile(r"^\d+\.?\d*$")
+# Race metadata lines in the margin that are not a caballeriza
+_RACE_METADATA_RE = re.compile(r"(?i)\b(kilos?|mts?|metros?|handicap)\b")
+
+# Entries table, found by its "Caballeriza ... 5 Ultimas" header row (the one
+# extract_header_idx looks for). That row only heads the left columns, so the
+# table ends past the entrenador column, whose names run well past its edge.
+LAYOUT = LayoutProfile(
+    anchors=("Caballeriza", "Ultimas"), right_edge=_ENTRENADOR_X, right_margin=120.0
+)
+
 # Approximate line height in pt for converting y -> approximate line_index
 _LINE_HEIGHT_PT = 13.5
 
 
 def parse_pdf_horses(pdf_path: str) -> list[Horse]:
-    rows = extract_horses_from_pdf(pdf_path)
+    return parse_pdf_program(pdf_path).horses
+
+
+def parse_pdf_program(pdf_path: str, workers: int | None = None) -> ParsedProgram:
+    """
+    Parse horses and race headers in a single pass over the PDF.
+
+    The race header is looked up in the text lines rebuilt from the same words
+    used to parse the horses, so no page is laid out twice. With
+    PDF_CROP_TO_TABLE, only the entries table of each page is extracted (see
+    LAYOUT). `workers` > 1 extracts the pages with a process pool (see
+    iter_pdf_pages).
+    """
+    program = ParsedProgram()
+    for race in iter_program_races(pdf_path, workers):
+        program.extend(race)
+    return program
+
+
+def iter_program_races(
+    pdf_path: str, workers: int | None = None
+) -> Iterator[ParsedProgram]:
+    """
+    Yield the program one race at a time, as a ParsedProgram with that race
+    and its horses. A race may continue on the next page, so it is yielded
+    once the first horse of the next race (or the end of the PDF) is reached.
+    Read serially (`workers` <= 1), only the pages of that race are held in
+    memory.
+    """
+    race: ParsedProgram | None = None
+    pages = iter_pdf_pages(pdf_path, workers=workers, layout=LAYOUT)
+    for page, page_horses in _iter_page_horses(pages):
+        for h in _unique_horses(page_horses):
+            if race is None or h.race_id not in race.races:
+                if race is not None:
+                    yield race
+                race = ParsedProgram(races={h.race_id: _race_info(page, h)})
+            race.horses.append(h)
+    if race is not None:
+        yield race
+
+
+def _race_info(page: PdfPage, first_horse: Horse) -> dict:
+    """Header of the race starting with `first_horse`, read from its page."""
+    race_info = extract_race_info_from_lines(page.lines, first_horse.line_index)  # type: ignore[arg-type]
+    if race_info is None:
+        race_info = {
+            "numero": None,
+            "nombre": "Carrera",
+            "distancia": None,
+            "hora": None,
+        }
+    return race_info
+
+
+def _unique_horses(rows: list[Horse]) -> list[Horse]:
     seen: set[tuple] = set()
     unique: list[Horse] = []
     for r in rows:
@@ -35,20 +135,15 @@ def parse_pdf_horses(pdf_path: str) -> list[Horse]:
     return unique
 
 
-def _group_by_row(words: list[dict], y_tol: float = 3.0) -> list[list[dict]]:
-    if not words:
-        return []
-    sorted_w = sorted(words, key=lambda w: (w["top"], w["x0"]))
-    rows: list[list[dict]] = []
-    cur = [sorted_w[0]]
-    for w in sorted_w[1:]:
-        if abs(w["top"] - cur[0]["top"]) <= y_tol:
-            cur.append(w)
-        else:
-            rows.append(sorted(cur, key=lambda w: w["x0"]))
-            cur = [w]
-    rows.append(sorted(cur, key=lambda w: w["x0"]))
-    return rows
+def _bucket_row(row: list[dict]) -> list[list[str]]:
+    """
+    Texts of the words of a row split by column, in a single pass over the row.
+    The row is sorted by x0, so each column keeps its words in reading order.
+    """
+    columns: list[list[str]] = [[] for _ in range(len(_COLUMN_EDGES) + 1)]
+    for w in row:
+        columns[bisect_right(_COLUMN_EDGES, w["x0"])].append(w["text"])
+    return columns
 
 
 def _parse_horse_row(
@@ -59,63 +154,41 @@ def _parse_horse_row(
 ) -> "Horse | None":
     if not row:
         return None
+    columns = _bucket_row(row)
 
     # Horse rows start with ultimas codes (digit+letter) or DEBUTA at x ~ [110, 165)
     ultimas_words = [
-        w for w in row
-        if _ULTIMAS_X_START <= w["x0"] < _NUMERO_X
-        and (re.match(r"^\d[A-Z]", w["text"]) or w["text"] == "DEBUTA")
+        t for t in columns[_ULTIMAS_COL] if t == "DEBUTA" or _ULTIMA_RE.match(t)
     ]
     if not ultimas_words:
         return None
-    ultimas = "DEBUTA" if ultimas_words[0]["text"] == "DEBUTA" else " ".join(w["text"] for w in ultimas_words)
+    ultimas = "DEBUTA" if ultimas_words[0] == "DEBUTA" else " ".join(ultimas_words)
 
-    # Numero: token at x in [_NUMERO_X, _NOMBRE_X)
-    num_words = [w for w in row if _NUMERO_X <= w["x0"] < _NOMBRE_X]
-    if not num_words:
+    # Numero: first token of its column
+    if not columns[_NUMERO_COL]:
         return None
     try:
-        numero = int(num_words[0]["text"])
+        numero = int(columns[_NUMERO_COL][0])
     except ValueError:
         return None
 
-    # Nombre: uppercase alpha tokens at x in [_NOMBRE_X, _JOCKEY_X), excluding numerics
-    nombre_words = [
-        w["text"] for w in row
-        if _NOMBRE_X <= w["x0"] < _JOCKEY_X
-        and re.match(r"^[A-ZÁÉÍÓÚÑ'\-]", w["text"])
-        and not re.match(r"^\d", w["text"])
-    ]
-    nombre = " ".join(nombre_words)
-    if not nombre:
-        return None
-
-    # Peso: first numeric token at x in [_NOMBRE_X, _JOCKEY_X)
+    # Nombre (uppercase alpha tokens) and peso (numeric tokens) share a column.
     # Handicap races: "56.5" + "97" — we only take the actual weight (first token)
-    peso_words = [
-        w for w in row
-        if _NOMBRE_X <= w["x0"] < _JOCKEY_X
-        and re.match(r"^\d+\.?\d*$", w["text"])
-    ]
-    if not peso_words:
+    nombre_words: list[str] = []
+    peso_words: list[str] = []
+    for t in columns[_NOMBRE_COL]:
+        if _NOMBRE_RE.match(t):
+            nombre_words.append(t)
+        elif _PESO_RE.match(t):
+            peso_words.append(t)
+    nombre = " ".join(nombre_words)
+    if not nombre or not peso_words:
         return None
     try:
-        peso = int(float(peso_words[0]["text"]))
+        peso = int(float(peso_words[0]))
     except ValueError:
         return None
 
-    # Jockey (+ Desc codes): words at x in [_JOCKEY_X, _PELO_X)
-    jockey_words = [w["text"] for w in row if _JOCKEY_X <= w["x0"] < _PELO_X]
-    jockey = " ".join(jockey_words)
-
-    # Padre-Madre: words at x in [_PM_X, _ENTRENADOR_X)
-    pm_words = [w["text"] for w in row if _PM_X <= w["x0"] < _ENTRENADOR_X]
-    padre_madre = " ".join(pm_words)
-
-    # Entrenador: words at x >= _ENTRENADOR_X
-    ent_words = [w["text"] for w in row if w["x0"] >= _ENTRENADOR_X]
-    entrenador = " ".join(ent_words)
-
     # Approximate line_index from y position for race header lookup
     line_idx = int(row[0]["top"] / _LINE_HEIGHT_PT)
 
@@ -127,48 +200,59 @@ def _parse_horse_row(
         numero=str(numero),
         nombre=nombre,
         peso=peso,
-        jockey=jockey,
-        padre_madre=padre_madre,
-        entrenador=entrenador,
+        # Jockey (+ Desc codes) up to the P column; the P and E columns are unused
+        jockey=" ".join(columns[_JOCKEY_COL]),
+        padre_madre=" ".join(columns[_PM_COL]),
+        entrenador=" ".join(columns[_ENTRENADOR_COL]),
         raw_rest="",
         caballeriza=caballeriza or "",
     )
 
 
-def extract_horses_from_pdf(pdf_path: str) -> list[Horse]:
-    results: list[Horse] = []
+def _iter_page_horses(
+    pages: Iterable[PdfPage],
+) -> Iterator[tuple[PdfPage, list[Horse]]]:
+    """Yield each page with its horses; races may continue across pages."""
     caballeriza: str | None = None
     last_race_number = 0
     race_id = uuid.uuid4()
 
-    with pdfplumber.open(pdf_path) as pdf:
-        for page_idx, page in enumerate(pdf.pages):
-            words = page.extract_words()
-            if not words:
+    for page in pages:
+        if not page.words:
+            continue
+
+        page_horses: list[Horse] = []
+        for row in iter_rows(page.words):
+            # Caballeriza row: all words at x < 110, short (1-4 words)
+            # Exclude race-metadata lines like "Peso 57 kilos." or "1400 mts."
+            if row and all(w["x0"] < 110 for w in row) and len(row) <= 4:
+                combined = " ".join(w["text"] for w in row)
+                if not _RACE_METADATA_RE.search(combined):
+                    caballeriza = combined
                 continue
 
-            rows = _group_by_row(words)
+            horse = _parse_horse_row(row, race_id, page.index, caballeriza)
+            if horse is None:
+                continue
 
-            for row in rows:
-                # Caballeriza row: all words at x < 110, short (1-4 words)
-                # Exclude race-metadata lines like "Peso 57 kilos." or "1400 mts."
-                if row and all(w["x0"] < 110 for w in row) and len(row) <= 4:
-                    combined = " ".join(w["text"] for w in row)
-                    if not re.search(r"(?i)\b(kilos?|mts?|metros?|handicap)\b", combined):
-                        caballeriza = combined
-                    continue
+            # New race when numero resets (horse numbers restart from 1)
+            num = int(horse.numero)
+            if num < last_race_number:
+                race_id = uuid.uuid4()
+                horse.race_id = race_id
+            last_race_number = num
 
-                horse = _parse_horse_row(row, race_id, page_idx, caballeriza)
-                if horse is None:
-                    continue
+            page_horses.append(horse)
 
-                # New race when numero resets (horse numbers restart from 1)
-                num = int(horse.numero)
-                if num < last_race_number:
-                    race_id = uuid.uuid4()
-                    horse.race_id = race_id
-                last_race_number = num
+        yield page, page_horses
 
-                results.append(horse)
 
+def extract_horses_from_pages(pages: Iterable[PdfPage]) -> list[Horse]:
+    results: list[Horse] = []
+    for _page, page_horses in _iter_page_horses(pages):
+        results.extend(page_horses)
     return results
+
+
+def extract_horses_from_pdf(pdf_path: str) -> list[Horse]:
+    return extract_horses_from_pages(iter_pdf_pages(pdf_path))
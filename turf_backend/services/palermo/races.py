@@ -1,13 +1,18 @@
 # pylint: disable=too-many-locals
 from collections import defaultdict
-from datetime import datetime
+from collections.abc import Iterable
+from datetime import date
 from typing import Any
 from uuid import UUID
 
 import pdfplumber
 from sqlmodel import Session
 
+from turf_backend.core.config.settings import settings
 from turf_backend.models.turf import Horse, Race
+from turf_backend.services.bulk_insert import write_races_and_horses
+from turf_backend.services.catalog import link_horses
+from turf_backend.services.meetings import meeting_cache
 from turf_backend.services.palermo.helper import (
     DISTANCE_RE,
     HOUR_RE,
@@ -15,6 +20,12 @@ from turf_backend.services.palermo.helper import (
     PREMIO_RE,
     RACE_HEADER_RE,
 )
+from turf_backend.services.pdf.pages import ParsedProgram, batch_races
+from turf_backend.services.program_sync import (
+    sync_races_and_horses,
+    write_program_in_batches,
+)
+from turf_backend.utils.date import RACE_DATE_FORMAT
 
 
 def create_race(session: Session, **kwargs) -> Race:
@@ -59,7 +70,7 @@ def extract_race_block(lines, header_index, radius=4):
     return lines[start:end]
 
 
-def _extract_race_info_from_lines(
+def extract_race_info_from_lines(
     lines: list[str], line_index: int
 ) -> dict[str, Any] | None:
     """Extract race info from already-extracted page lines (no file I/O)."""
@@ -75,12 +86,13 @@ def _extract_race_info_from_lines(
     block = extract_race_block(lines, header_idx, radius=4)
     nombre, hora, distancia = extract_name_distance_hour(block)
 
+    header = RACE_HEADER_RE.search(lines[header_idx])
+    numero = header.group("num")  # type: ignore[union-attr]
     if not nombre:
-        header = RACE_HEADER_RE.search(lines[header_idx])
-        numero = header.group("num")
         nombre = f"Carrera {numero}"
 
     return {
+        "numero": int(numero),
         "nombre": nombre,
         "distancia": distancia,
         "hora": hora,
@@ -97,7 +109,7 @@ def extract_race_information(
         page = pdf.pages[horse.page]  # type: ignore
         lines = (page.extract_text() or "").split("\n")
 
-    return _extract_race_info_from_lines(lines, horse.line_index)  # type: ignore
+    return extract_race_info_from_lines(lines, horse.line_index)  # type: ignore
 
 
 def extract_name_distance_hour(block):
@@ -126,50 +138,79 @@ def extract_name_distance_hour(block):
     return nombre, hora, distancia
 
 
-def insert_and_create_races(session, horses, pdf_path: str):
+def insert_and_create_races(
+    session: Session, program: ParsedProgram, race_date: date | None = None
+) -> int:
+    """
+    Store the races and horses of a parsed program.
+
+    `race_date` is the race day, from the PDF or the calendar. When it is
+    known, a program already imported for that day is updated in place with
+    only the changes (see sync_races_and_horses); without it the rows are
+    inserted as a new meeting with no race_date and today as fecha. Returns
+    how many horses were written.
+    """
+    all_races, all_horses = _build_races(session, program, race_date)
+    if race_date is None:
+        written = write_races_and_horses(session, all_races, all_horses)
+    else:
+        written = sync_races_and_horses(session, all_races, all_horses).written
+    # Readers of /general/meetings must see the new card right away
+    meeting_cache.invalidate("Palermo", race_date)
+    return written
+
+
+def insert_races_in_batches(
+    session: Session,
+    races: Iterable[ParsedProgram],
+    race_date: date | None = None,
+    batch_size: int | None = None,
+) -> int:
+    """
+    Same as insert_and_create_races, for a program streamed race by race (see
+    iter_program_races). Races are written in batches of `batch_size`
+    (IMPORT_BATCH_RACES by default) as they are parsed; see
+    write_program_in_batches.
+    """
+    batch_size = batch_size or settings.import_batch_races
+    batches = (
+        _build_races(session, batch, race_date)
+        for batch in batch_races(races, batch_size)
+    )
+    written = write_program_in_batches(session, batches)
+    meeting_cache.invalidate("Palermo", race_date)
+    return written
+
+
+def _build_races(
+    session: Session, program: ParsedProgram, race_date: date | None
+) -> tuple[list[Race], list[Horse]]:
+    """Race rows of a parsed program and its horses, linked to the catalogue."""
     races_dict = defaultdict(list)
-    for h in horses:
+    for h in program.horses:
         races_dict[h.race_id].append(h)
 
     all_races: list[Race] = []
     all_horses: list[Horse] = []
-    fecha_hoy = datetime.now().strftime("%d/%m/%Y")
-
-    # Cache de líneas por página para no re-parsear el mismo texto
-    page_lines_cache: dict[int, list[str]] = {}
-
-    with pdfplumber.open(pdf_path) as pdf:
-        for rid, horses_group in races_dict.items():
-            horse = horses_group[0]
-            page_idx = horse.page  # type: ignore
-
-            if page_idx not in page_lines_cache:
-                page_lines_cache[page_idx] = (
-                    pdf.pages[page_idx].extract_text() or ""
-                ).split("\n")
-
-            lines = page_lines_cache[page_idx]
-            race_info = _extract_race_info_from_lines(lines, horse.line_index)  # type: ignore
-
-            if race_info is None:
-                race_info = {"nombre": "Carrera", "distancia": None, "hora": None}
-
-            all_races.append(Race(
-                race_id=rid,
-                hipodromo="Palermo",
-                fecha=fecha_hoy,
-                numero=None,
-                nombre=race_info["nombre"],
-                distancia=race_info["distancia"],
-                hour=race_info["hora"],
-            ))
-
-            for h in horses_group:
-                h.race_id = rid
-                all_horses.append(h)
-
-    session.add_all(all_races)
-    session.flush()
-    session.add_all(all_horses)
-    session.commit()
-    return len(all_horses)
+    fecha_carrera = (race_date or date.today()).strftime(RACE_DATE_FORMAT)
+
+    for rid, horses_group in races_dict.items():
+        race_info = program.races[rid]
+
+        all_races.append(Race(
+            race_id=rid,
+            hipodromo="Palermo",
+            fecha=fecha_carrera,
+            race_date=race_date,
+            numero=race_info.get("numero"),
+            nombre=race_info["nombre"],
+            distancia=race_info["distancia"],
+            hour=race_info["hora"],
+        ))
+
+        for h in horses_group:
+            h.race_id = rid
+            all_horses.append(h)
+
+    link_horses(session, all_horses)
+    return all_races, all_horses
@@ -0,0 +1,163 @@
+import io
+import math
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from itertools import accumulate
+from typing import Literal
+
+import pdfplumber
+import pypdfium2 as pdfium
+import pypdfium2.raw as pdfium_c
+from pdfplumber.utils.text import WordExtractor
+
+from turf_backend.core.config.settings import settings
+from turf_backend.services.pdf.layout import BBox
+
+PdfBackend = Literal["pdfplumber", "pdfium"]
+PdfSource = str | bytes
+
+# pdfium is not thread-safe, even across documents: every call into it from
+# this process goes through this lock (the API runs imports on several threads)
+_pdfium_lock = threading.RLock()
+
+# Same defaults as pdfplumber's Page.extract_words()
+_words = WordExtractor()
+
+
+class PlumberDocument:
+    """Words of a PDF as pdfplumber lays them out (the reference backend)."""
+
+    def __init__(self, source: PdfSource) -> None:
+        self._pdf = pdfplumber.open(
+            io.BytesIO(source) if isinstance(source, bytes) else source
+        )
+
+    def __len__(self) -> int:
+        return len(self._pdf.pages)
+
+    def page_size(self, index: int) -> tuple[float, float]:
+        page = self._pdf.pages[index]
+        return page.width, page.height
+
+    def words(self, index: int, bbox: BBox | None = None) -> list[dict]:
+        page = self._pdf.pages[index]
+        words = (page if bbox is None else page.within_bbox(bbox)).extract_words()
+        # Drop the page's layout objects; its words are all we keep
+        page.close()
+        return words
+
+    def text(self, index: int) -> str:
+        return self._pdf.pages[index].extract_text() or ""
+
+    def close(self) -> None:
+        self._pdf.close()
+
+
+class PdfiumDocument:
+    """
+    Words of a PDF read with pdfium. Pages are only loaded when asked for, and
+    only their chars are read (no layout objects). The chars are grouped into
+    words by pdfplumber's own WordExtractor, so words come out the same and
+    in the same order as with PlumberDocument.
+    """
+
+    def __init__(self, source: PdfSource) -> None:
+        with _pdfium_lock:
+            self._pdf = pdfium.PdfDocument(source)
+            self._count = len(self._pdf)
+            heights = [self._pdf.get_page_size(i)[1] for i in range(self._count)]
+        # doctop of each page: the height of the pages before it
+        self._offsets = [0.0, *accumulate(heights)]
+
+    def __len__(self) -> int:
+        return self._count
+
+    def page_size(self, index: int) -> tuple[float, float]:
+        with _pdfium_lock:
+            return self._pdf.get_page_size(index)
+
+    def words(self, index: int, bbox: BBox | None = None) -> list[dict]:
+        return _words.extract_words(self._chars(index, bbox))
+
+    def _chars(self, index: int, bbox: BBox | None) -> list[dict]:
+        """Chars of a page with the keys WordExtractor reads from pdfplumber's."""
+        chars = []
+        doctop = self._offsets[index]
+        box = pdfium_c.FS_RECTF()
+        with _pdfium_lock:
+            page = self._pdf[index]
+            textpage = page.get_textpage()
+            try:
+                height = page.get_height()
+                raw = textpage.raw
+                for i in range(pdfium_c.FPDFText_CountChars(raw)):
+                    # Spaces and line breaks pdfium adds between words
+                    if pdfium_c.FPDFText_IsGenerated(raw, i) == 1:
+                        continue
+                    # The loose box spans the font's height, like pdfminer's
+                    pdfium_c.FPDFText_GetLooseCharBox(raw, i, box)
+                    x0, x1 = box.left, box.right
+                    top, bottom = height - box.top, height - box.bottom
+                    # Same test as pdfplumber's within_bbox()
+                    if bbox is not None and not (
+                        x0 >= bbox[0]
+                        and top >= bbox[1]
+                        and x1 <= bbox[2]
+                        and bottom <= bbox[3]
+                    ):
+                        continue
+                    chars.append({
+                        "text": chr(pdfium_c.FPDFText_GetUnicode(raw, i)),
+                        "x0": x0,
+                        "x1": x1,
+                        "top": top,
+                        "bottom": bottom,
+                        "doctop": doctop + top,
+                        "upright": _is_upright(pdfium_c.FPDFText_GetCharAngle(raw, i)),
+                    })
+            finally:
+                textpage.close()
+                page.close()
+        return chars
+
+    def text(self, index: int) -> str:
+        with _pdfium_lock:
+            page = self._pdf[index]
+            textpage = page.get_textpage()
+            try:
+                return textpage.get_text_bounded()
+            finally:
+                textpage.close()
+                page.close()
+
+    def close(self) -> None:
+        with _pdfium_lock:
+            self._pdf.close()
+
+
+PdfDocument = PlumberDocument | PdfiumDocument
+
+
+def _is_upright(angle: float) -> bool:
+    # Radians, or -1 when pdfium cannot tell
+    return angle < 0 or min(angle, 2 * math.pi - angle) < 1e-3
+
+
+@contextmanager
+def open_pdf(
+    source: PdfSource, backend: PdfBackend | None = None
+) -> Iterator[PdfDocument]:
+    """
+    Open a PDF (path or content) with `backend`, PDF_BACKEND by default.
+    "pdfplumber" lays out every page it reads with pdfminer; "pdfium" reads
+    only the chars, which is several times faster for the same words.
+    """
+    backend = backend or settings.pdf_backend
+    pdf: PdfDocument = (
+        PdfiumDocument(source) if backend == "pdfium" else PlumberDocument(source)
+    )
+    try:
+        yield pdf
+    finally:
+        pdf.close()
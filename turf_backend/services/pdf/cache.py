@@ -0,0 +1,177 @@
+import json
+import logging
+import uuid
+import zlib
+from collections.abc import Callable, Iterable
+from datetime import datetime
+
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, col, delete, select
+
+from turf_backend.core.config.settings import settings
+from turf_backend.models.turf import Horse, ParsedPdfCache
+from turf_backend.services.pdf.pages import ParsedProgram
+
+logger = logging.getLogger("turf")
+
+# Horse columns stored in the cache, in this order, one list per horse
+_HORSE_FIELDS = (
+    "page",
+    "line_index",
+    "numero",
+    "nombre",
+    "peso",
+    "jockey",
+    "ultimas",
+    "padre_madre",
+    "entrenador",
+    "raw_rest",
+    "caballeriza",
+)
+
+
+def serialize_program(program: ParsedProgram) -> bytes:
+    """
+    Pack a parsed program as zlib-compressed JSON.
+
+    Horses are stored as rows of values (no repeated keys) pointing to their race
+    by position, so race ids are not persisted and a fresh one is minted on load.
+    """
+    race_ids = list(program.races)
+    race_pos = {rid: pos for pos, rid in enumerate(race_ids)}
+    data = {
+        "races": [program.races[rid] for rid in race_ids],
+        "horses": [
+            [race_pos[h.race_id], *(getattr(h, f) for f in _HORSE_FIELDS)]
+            for h in program.horses
+        ],
+    }
+    raw = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+    return zlib.compress(raw.encode("utf-8"))
+
+
+def deserialize_program(payload: bytes) -> ParsedProgram:
+    data = json.loads(zlib.decompress(payload))
+    race_ids = [uuid.uuid4() for _ in data["races"]]
+    horses = [
+        Horse(race_id=race_ids[pos], **dict(zip(_HORSE_FIELDS, values, strict=True)))
+        for pos, *values in data["horses"]
+    ]
+    races = dict(zip(race_ids, data["races"], strict=True))
+    return ParsedProgram(horses=horses, races=races)
+
+
+def _cache_version(parser_version: str) -> str:
+    # Cropped pages (PDF_CROP_TO_TABLE) may parse differently from full ones
+    return f"{parser_version}+crop" if settings.pdf_crop_to_table else parser_version
+
+
+def get_cached_program(
+    session: Session, file_hash: str, parser_version: str
+) -> ParsedProgram | None:
+    entry = session.exec(
+        select(ParsedPdfCache).where(
+            ParsedPdfCache.file_hash == file_hash,
+            ParsedPdfCache.parser_version == _cache_version(parser_version),
+        )
+    ).first()
+    if entry is None:
+        return None
+
+    program = deserialize_program(entry.payload)
+    entry.last_used_at = datetime.now()
+    session.add(entry)
+    session.commit()
+    return program
+
+
+def store_program(
+    session: Session, file_hash: str, parser_version: str, program: ParsedProgram
+) -> None:
+    payload = serialize_program(program)
+    if len(payload) > settings.parse_cache_max_bytes:
+        return
+
+    session.add(
+        ParsedPdfCache(
+            file_hash=file_hash,
+            parser_version=_cache_version(parser_version),
+            payload=payload,
+            size=len(payload),
+        )
+    )
+    try:
+        session.commit()
+    except IntegrityError:
+        # Another worker cached the same PDF first
+        session.rollback()
+        return
+    _evict_least_recently_used(session, settings.parse_cache_max_bytes)
+
+
+def _evict_least_recently_used(session: Session, max_bytes: int) -> None:
+    total_size = func.coalesce(func.sum(ParsedPdfCache.size), 0)
+    total = session.exec(select(total_size)).one()
+    if total <= max_bytes:
+        return
+
+    evict_ids = []
+    entries = session.exec(
+        select(ParsedPdfCache.id, ParsedPdfCache.size).order_by(
+            col(ParsedPdfCache.last_used_at)
+        )
+    ).all()
+    for entry_id, size in entries:
+        if total <= max_bytes:
+            break
+        evict_ids.append(entry_id)
+        total -= size
+
+    stmt = delete(ParsedPdfCache).where(col(ParsedPdfCache.id).in_(evict_ids))
+    session.exec(stmt)  # type: ignore
+    session.commit()
+    logger.info("Evicted %d parsed PDFs from the cache", len(evict_ids))
+
+
+def parse_with_cache(
+    session: Session,
+    file_hash: str,
+    parser_version: str,
+    parse: Callable[[str], ParsedProgram],
+    pdf_path: str,
+) -> ParsedProgram:
+    """
+    Return the parsed program for `file_hash`, running `parse(pdf_path)` only on
+    a cache miss. Entries are keyed by (file hash, parser version), so bumping a
+    parser's PARSER_VERSION invalidates everything it parsed before.
+    """
+    if settings.parse_cache_max_bytes <= 0:
+        return parse(pdf_path)
+
+    program = get_cached_program(session, file_hash, parser_version)
+    if program is not None:
+        return program
+
+    program = parse(pdf_path)
+    store_program(session, file_hash, parser_version, program)
+    return program
+
+
+def stream_with_cache(
+    session: Session,
+    file_hash: str,
+    parser_version: str,
+    iter_races: Callable[[str], Iterable[ParsedProgram]],
+    pdf_path: str,
+) -> Iterable[ParsedProgram]:
+    """
+    The races of the program for `file_hash`, for a streamed import: the cached
+    parse when there is one, otherwise `iter_races(pdf_path)`. A streamed parse
+    is not stored, as caching it would need the whole program in memory.
+    """
+    if settings.parse_cache_max_bytes > 0:
+        program = get_cached_program(session, file_hash, parser_version)
+        if program is not None:
+            return [program] if program.horses else []
+    return iter_races(pdf_path)
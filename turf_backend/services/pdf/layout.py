@@ -0,0 +1,53 @@
+from dataclasses import dataclass
+
+from turf_backend.services.pdf.rows import iter_rows
+
+# (x0, top, x1, bottom) in pdfplumber page coordinates
+BBox = tuple[float, float, float, float]
+
+
+@dataclass(frozen=True)
+class LayoutProfile:
+    """
+    Where the entries table of a hipódromo's program sits on the page.
+
+    The table is found by its header row, the first row holding every word in
+    `anchors`. Its crop box spans the header row widened by the margins (the
+    content of some columns starts left or ends right of their label) and the
+    full height of the page, so the race headers above each table are kept.
+
+    When the header row does not span the whole table (its labels only head
+    the leftmost columns), `right_edge` is the x where the last column starts
+    and the box ends `right_margin` past it instead.
+    """
+
+    anchors: tuple[str, ...]
+    left_margin: float = 12.0
+    right_margin: float = 60.0
+    right_edge: float | None = None
+
+    def table_bbox(self, words: list[dict], width: float, height: float) -> BBox | None:
+        """Crop box of the table on a page with these words, if it has one."""
+        for row in iter_rows(words):
+            texts = {w["text"] for w in row}
+            if all(anchor in texts for anchor in self.anchors):
+                left = row[0]["x0"] - self.left_margin
+                right = self.right_edge
+                if right is None:
+                    right = max(w.get("x1", w["x0"]) for w in row)
+                right += self.right_margin
+                return (max(0.0, left), 0.0, min(width, right), height)
+        return None
+
+
+def within(words: list[dict], bbox: BBox) -> list[dict]:
+    """The words entirely inside `bbox`, as pdfplumber's within_bbox() keeps them."""
+    x0, top, x1, bottom = bbox
+    return [
+        w
+        for w in words
+        if w["x0"] >= x0
+        and w.get("x1", w["x0"]) <= x1
+        and w["top"] >= top
+        and w.get("bottom", w["top"]) <= bottom
+    ]
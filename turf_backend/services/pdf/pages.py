@@ -0,0 +1,183 @@
+import math
+import multiprocessing
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import cached_property
+from operator import itemgetter
+from typing import Any
+from uuid import UUID
+
+from pdfplumber.utils import cluster_objects
+
+from turf_backend.core.config.settings import settings
+from turf_backend.models.turf import Horse
+from turf_backend.services.pdf.backends import PdfBackend, PdfDocument, open_pdf
+from turf_backend.services.pdf.layout import LayoutProfile, within
+
+# Same tolerance pdfplumber uses to cluster words into lines in extract_text()
+_LINE_Y_TOLERANCE = 3.0
+
+
+def words_to_lines(
+    words: list[dict], y_tolerance: float = _LINE_Y_TOLERANCE
+) -> list[str]:
+    """
+    Rebuild the text lines of a page from its extracted words.
+
+    Mirrors what pdfplumber's non-layout extract_text() does internally, so the
+    result matches `page.extract_text().splitlines()` without paying for a second
+    layout analysis of the page.
+    """
+    lines = cluster_objects(words, itemgetter("top"), y_tolerance, preserve_order=True)
+    return [" ".join(w["text"] for w in line) for line in lines]
+
+
+@dataclass
+class PdfPage:
+    """Words of a single PDF page, extracted once and shared by every parser."""
+
+    index: int
+    words: list[dict]
+
+    @cached_property
+    def lines(self) -> list[str]:
+        return words_to_lines(self.words)
+
+
+@dataclass
+class ParsedProgram:
+    """Result of parsing a program PDF: the horses plus the header of each race."""
+
+    horses: list[Horse] = field(default_factory=list)
+    races: dict[UUID, dict[str, Any]] = field(default_factory=dict)
+
+    def extend(self, other: "ParsedProgram") -> None:
+        """Add the races (and their horses) of another part of the program."""
+        self.horses.extend(other.horses)
+        self.races.update(other.races)
+
+
+def batch_races(races: Iterable[ParsedProgram], size: int) -> Iterator[ParsedProgram]:
+    """
+    Group a program streamed race by race (see the parsers' iter_program_races)
+    into programs of up to `size` races, each yielded as soon as it is full.
+    """
+    batch = ParsedProgram()
+    for race in races:
+        batch.extend(race)
+        if len(batch.races) >= size:
+            yield batch
+            batch = ParsedProgram()
+    if batch.races:
+        yield batch
+
+
+def iter_pdf_pages(
+    pdf_path: str,
+    first_page: int = 0,
+    workers: int | None = None,
+    layout: LayoutProfile | None = None,
+    backend: PdfBackend | None = None,
+) -> Iterator[PdfPage]:
+    """
+    Open the PDF once and yield every page with its words extracted a single time.
+
+    With more than one worker (`PDF_PARSE_WORKERS` by default) the pages are split
+    in contiguous ranges extracted by a process pool, and yielded back in page
+    order, so callers get exactly the same pages as in the serial path.
+
+    With a `layout`, only the entries table of each page is extracted once its
+    header row has been found (see LayoutProfile). Cover art, betting pool boxes
+    and other text outside the table are skipped before their chars are grouped
+    into words. This only happens with `PDF_CROP_TO_TABLE=true`; by default
+    the full pages are read.
+
+    `backend` (`PDF_BACKEND` by default) picks the library reading the pages;
+    both give the same words (see services/pdf/backends.py).
+    """
+    if workers is None:
+        workers = settings.pdf_parse_workers
+    backend = backend or settings.pdf_backend
+
+    if not settings.pdf_crop_to_table:
+        layout = None
+
+    if workers > 1:
+        yield from _iter_pdf_pages_parallel(
+            pdf_path, first_page, workers, layout, backend
+        )
+        return
+
+    with open_pdf(pdf_path, backend) as pdf:
+        yield from _extract_pages(pdf, range(first_page, len(pdf)), layout)
+
+
+def _extract_pages(
+    pdf: PdfDocument, indices: Iterable[int], layout: LayoutProfile | None
+) -> Iterator[PdfPage]:
+    """
+    Extract the words of the pages at `indices`. With a layout, pages are read
+    in full until one has the header row of the entries table; from then on
+    only the table's crop box is read.
+    """
+    bbox = None
+    for page_idx in indices:
+        words = pdf.words(page_idx, bbox)
+        if bbox is None and layout is not None:
+            bbox = layout.table_bbox(words, *pdf.page_size(page_idx))
+            if bbox is not None:
+                # Same words the later pages get from the crop box
+                words = within(words, bbox)
+        yield PdfPage(index=page_idx, words=words)
+
+
+def _page_ranges(
+    first_page: int, page_count: int, chunks: int
+) -> list[tuple[int, int]]:
+    size = max(1, math.ceil((page_count - first_page) / chunks))
+    return [
+        (start, min(start + size, page_count))
+        for start in range(first_page, page_count, size)
+    ]
+
+
+def _extract_page_range(
+    pdf_path: str,
+    start: int,
+    stop: int,
+    layout: LayoutProfile | None,
+    backend: PdfBackend,
+) -> list[PdfPage]:
+    # Index into the full page list so `doctop` matches the serial extraction.
+    # Each range finds the table on its own first pages.
+    with open_pdf(pdf_path, backend) as pdf:
+        return list(_extract_pages(pdf, range(start, stop), layout))
+
+
+def _iter_pdf_pages_parallel(
+    pdf_path: str,
+    first_page: int,
+    workers: int,
+    layout: LayoutProfile | None,
+    backend: PdfBackend,
+) -> Iterator[PdfPage]:
+    with open_pdf(pdf_path, backend) as pdf:
+        page_count = len(pdf)
+
+    ranges = _page_ranges(first_page, page_count, workers)
+    if not ranges:
+        return
+
+    # Spawned, not forked: a child forked while another thread holds the
+    # pdfium lock (see backends.py) would deadlock on it
+    with ProcessPoolExecutor(
+        max_workers=min(workers, len(ranges)),
+        mp_context=multiprocessing.get_context("spawn"),
+    ) as pool:
+        futures = [
+            pool.submit(_extract_page_range, pdf_path, start, stop, layout, backend)
+            for start, stop in ranges
+        ]
+        for future in futures:
+            yield from future.result()
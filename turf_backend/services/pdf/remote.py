@@ -0,0 +1,166 @@
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from typing import Any, Optional
+
+import httpx
+import requests
+from sqlmodel import Session, col, select
+
+from turf_backend.models.turf import PdfImport
+
+
+@dataclass(frozen=True)
+class PdfValidators:
+    """HTTP validators a remote PDF was served with."""
+
+    etag: str | None = None
+    last_modified: str | None = None
+    content_length: int | None = None
+
+    @classmethod
+    def of(cls, pdf_import: PdfImport | None) -> Optional["PdfValidators"]:
+        """Validators recorded with an import, or None if it has none."""
+        if pdf_import is None or not (pdf_import.etag or pdf_import.last_modified):
+            return None
+        return cls(pdf_import.etag, pdf_import.last_modified, pdf_import.content_length)
+
+    @classmethod
+    def from_response(cls, headers: Mapping[str, str]) -> "PdfValidators":
+        length = headers.get("Content-Length")
+        return cls(
+            etag=headers.get("ETag"),
+            last_modified=headers.get("Last-Modified"),
+            content_length=int(length) if length and length.isdigit() else None,
+        )
+
+    @classmethod
+    def from_request(cls, headers: Mapping[str, str]) -> Optional["PdfValidators"]:
+        """Validators sent in a conditional request, for proxies to forward."""
+        etag = headers.get("If-None-Match")
+        last_modified = headers.get("If-Modified-Since")
+        if not (etag or last_modified):
+            return None
+        return cls(etag=etag, last_modified=last_modified)
+
+    def request_headers(self) -> dict[str, str]:
+        """Headers of a conditional GET for the file these validators describe."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def response_headers(self) -> dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers["ETag"] = self.etag
+        if self.last_modified:
+            headers["Last-Modified"] = self.last_modified
+        return headers
+
+    def matches(self, other: "PdfValidators") -> bool:
+        """
+        Whether `other` describes the same file. The ETag decides when both
+        have one; otherwise Last-Modified must match, and Content-Length too
+        when both know it.
+        """
+        if self.etag and other.etag:
+            return self.etag == other.etag
+        if not (self.last_modified and other.last_modified):
+            return False
+        lengths = (self.content_length, other.content_length)
+        if None not in lengths and lengths[0] != lengths[1]:
+            return False
+        return self.last_modified == other.last_modified
+
+
+@dataclass
+class RemotePdf:
+    content: bytes | None  # None when the file did not change
+    validators: PdfValidators
+    # Upstream URL, when a proxy reports it in Content-Location
+    source_url: str | None = None
+
+    @property
+    def unchanged(self) -> bool:
+        return self.content is None
+
+
+def fetch_pdf(
+    get: Callable[..., requests.Response],
+    url: str,
+    known: PdfValidators | None,
+    **kwargs: Any,
+) -> RemotePdf:
+    """
+    Download `url` with `get` (requests.get or a Session's get) unless it still
+    matches the `known` validators.
+
+    The request is a conditional GET, so servers that honour it answer 304.
+    For those that do not, the headers of the 200 are compared before reading
+    the body, and the connection is dropped if they match.
+    """
+    headers = kwargs.pop("headers", {})
+    if known is not None:
+        headers = {**headers, **known.request_headers()}
+    with get(url, headers=headers, stream=True, **kwargs) as response:
+        source_url = response.headers.get("Content-Location")
+        if known is not None and response.status_code == 304:
+            return RemotePdf(None, known, source_url)
+        response.raise_for_status()
+        validators = PdfValidators.from_response(response.headers)
+        if known is not None and known.matches(validators):
+            return RemotePdf(None, known, source_url)
+        return RemotePdf(response.content, validators, source_url)
+
+
+async def fetch_pdf_async(
+    client: httpx.AsyncClient, url: str, known: PdfValidators | None, **kwargs: Any
+) -> RemotePdf:
+    """fetch_pdf() for an httpx AsyncClient."""
+    headers = kwargs.pop("headers", {})
+    if known is not None:
+        headers = {**headers, **known.request_headers()}
+    async with client.stream("GET", url, headers=headers, **kwargs) as response:
+        source_url = response.headers.get("Content-Location")
+        if known is not None and response.status_code == 304:
+            return RemotePdf(None, known, source_url)
+        response.raise_for_status()
+        validators = PdfValidators.from_response(response.headers)
+        if known is not None and known.matches(validators):
+            return RemotePdf(None, known, source_url)
+        return RemotePdf(await response.aread(), validators, source_url)
+
+
+def last_import(
+    session: Session,
+    hipodromo: str,
+    *,
+    source_url: str | None = None,
+    calendario_id: str | None = None,
+) -> PdfImport | None:
+    """Latest import of a remote file, by its URL or its calendario_id."""
+    query = select(PdfImport).where(PdfImport.hipodromo == hipodromo)
+    if source_url is not None:
+        query = query.where(PdfImport.source_url == source_url)
+    elif calendario_id is not None:
+        query = query.where(PdfImport.calendario_id == calendario_id)
+    else:
+        return None
+    return session.exec(query.order_by(col(PdfImport.imported_at).desc())).first()
+
+
+def track_source(
+    pdf_import: PdfImport,
+    remote: RemotePdf,
+    source_url: str | None,
+    calendario_id: str | None = None,
+) -> PdfImport:
+    """Record on `pdf_import` where `remote` came from and its validators."""
+    pdf_import.source_url = source_url or remote.source_url or pdf_import.source_url
+    pdf_import.calendario_id = calendario_id or pdf_import.calendario_id
+    pdf_import.etag = remote.validators.etag
+    pdf_import.last_modified = remote.validators.last_modified
+    pdf_import.content_length = remote.validators.content_length
+    return pdf_import
@@ -0,0 +1,32 @@
+from collections.abc import Iterable, Iterator
+
+# Same tolerance pdfplumber uses to cluster the chars of a page into lines
+ROW_Y_TOLERANCE = 3.0
+
+
+def iter_rows(
+    words: Iterable[dict], y_tolerance: float = ROW_Y_TOLERANCE
+) -> Iterator[list[dict]]:
+    """
+    Group the words of a page into rows, yielded top to bottom with their words
+    sorted by x0.
+
+    The words must come in reading order, as pdfplumber's extract_words() (and
+    so PdfPage.words) returns them: line by line, left to right. Rows are then
+    the runs of consecutive words, so nothing is sorted and each row is yielded
+    as soon as it ends. A row ends when the next word goes back to the left or
+    its top is more than `y_tolerance` away from the previous word's. Comparing
+    with the previous word rather than the first one keeps the words of a
+    skewed line together.
+    """
+    row: list[dict] = []
+    for word in words:
+        if row and (
+            word["x0"] < row[-1]["x0"]
+            or abs(word["top"] - row[-1]["top"]) > y_tolerance
+        ):
+            yield row
+            row = []
+        row.append(word)
+    if row:
+        yield row
@@ -0,0 +1,120 @@
+import hashlib
+import tempfile
+from collections.abc import AsyncIterator, Iterable, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import IO
+
+from fastapi import UploadFile
+
+# Bytes read from an upload (and written to its spool file) at a time
+SPOOL_CHUNK_SIZE = 1024 * 1024
+
+
+@dataclass
+class SpooledPdf:
+    """A PDF written to a temporary file, with the SHA-256 of its content."""
+
+    path: str
+    file_hash: str
+    size: int
+    _detached: bool = field(default=False, repr=False)
+
+    def detach(self) -> str:
+        """
+        Keep the file once its `with` block exits, e.g. to hand it to a job,
+        and return its path. Deleting it is then up to its new owner.
+        """
+        self._detached = True
+        return self.path
+
+
+class _SpoolWriter:
+    """Temporary PDF being written, hashed chunk by chunk."""
+
+    def __init__(self, directory: str | None) -> None:
+        if directory is not None:
+            Path(directory).mkdir(parents=True, exist_ok=True)
+        self._file: IO[bytes] = tempfile.NamedTemporaryFile(  # noqa: SIM115
+            delete=False, suffix=".pdf", dir=directory
+        )
+        self._digest = hashlib.sha256()
+        self._size = 0
+
+    def write(self, chunk: bytes) -> None:
+        self._digest.update(chunk)
+        self._file.write(chunk)
+        self._size += len(chunk)
+
+    def close(self) -> SpooledPdf:
+        self._file.close()
+        return SpooledPdf(self._file.name, self._digest.hexdigest(), self._size)
+
+    def discard(self) -> None:
+        self._file.close()
+        Path(self._file.name).unlink(missing_ok=True)
+
+
+@contextmanager
+def _owned(spooled: SpooledPdf) -> Iterator[SpooledPdf]:
+    try:
+        yield spooled
+    finally:
+        if not spooled._detached:  # noqa: SLF001
+            Path(spooled.path).unlink(missing_ok=True)
+
+
+@asynccontextmanager
+async def spool_upload(
+    file: UploadFile, directory: str | None = None
+) -> AsyncIterator[SpooledPdf]:
+    """
+    Copy an upload to a temporary PDF (in `directory`, the system's temporary
+    directory by default) in chunks of SPOOL_CHUNK_SIZE, hashing it on the way,
+    so the content is never held in memory at once. The file is deleted when
+    the block exits, unless it was detached.
+    """
+    writer = _SpoolWriter(directory)
+    try:
+        while chunk := await file.read(SPOOL_CHUNK_SIZE):
+            writer.write(chunk)
+    except BaseException:
+        writer.discard()
+        raise
+    with _owned(writer.close()) as spooled:
+        yield spooled
+
+
+@contextmanager
+def spool_chunks(
+    chunks: Iterable[bytes], directory: str | None = None
+) -> Iterator[SpooledPdf]:
+    """Same as spool_upload, for content read by this process."""
+    writer = _SpoolWriter(directory)
+    try:
+        for chunk in chunks:
+            writer.write(chunk)
+    except BaseException:
+        writer.discard()
+        raise
+    with _owned(writer.close()) as spooled:
+        yield spooled
+
+
+@contextmanager
+def spooled_file(path: str) -> Iterator[SpooledPdf]:
+    """
+    A PDF spooled earlier (e.g. by a request that detached it), hashed in
+    chunks. The file is deleted when the block exits.
+    """
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with Path(path).open("rb") as f:
+            while chunk := f.read(SPOOL_CHUNK_SIZE):
+                digest.update(chunk)
+                size += len(chunk)
+        yield SpooledPdf(path=path, file_hash=digest.hexdigest(), size=size)
+    finally:
+        Path(path).unlink(missing_ok=True)
@@ -0,0 +1,219 @@
+import logging
+from collections import defaultdict
+from collections.abc import Iterable
+from dataclasses import dataclass
+from uuid import UUID
+
+from sqlmodel import Session, col, select
+
+from turf_backend.models.turf import Horse, Race
+from turf_backend.services.bulk_insert import write_races_and_horses
+
+logger = logging.getLogger("turf")
+
+# Race columns refreshed from a re-published program
+_RACE_FIELDS = ("numero", "nombre", "distancia", "hour")
+# Horse columns compared to decide whether a runner changed
+_HORSE_FIELDS = (
+    "numero",
+    "peso",
+    "jockey",
+    "ultimas",
+    "padre_madre",
+    "entrenador",
+    "raw_rest",
+    "page",
+    "line_index",
+    "caballeriza",
+    "catalog_horse_id",
+    "jockey_id",
+    "trainer_id",
+    "stud_id",
+)
+
+
+@dataclass
+class SyncResult:
+    inserted: int = 0
+    updated: int = 0
+    scratched: int = 0
+    races_added: int = 0
+    races_removed: int = 0
+
+    @property
+    def written(self) -> int:
+        return self.inserted + self.updated
+
+
+def _race_keys(
+    races: list[Race], horses_by_race: dict[UUID, list[Horse]]
+) -> dict[int, Race]:
+    """
+    Key races by their number, or by their position in the program when the
+    parser could not read one or read the same one twice (ordered by where
+    their first horse appears), so no race is dropped.
+    """
+    numbers = [r.numero for r in races]
+    if None not in numbers and len(set(numbers)) == len(numbers):
+        return {r.numero: r for r in races}  # type: ignore[misc]
+
+    def position(race: Race) -> tuple[int, int]:
+        return min(
+            ((h.page or 0, h.line_index or 0) for h in horses_by_race[race.race_id]),
+            default=(0, 0),
+        )
+
+    ordered = sorted(races, key=position)
+    return dict(enumerate(ordered, start=1))
+
+
+def _group_horses(horses: list[Horse]) -> dict[UUID, list[Horse]]:
+    grouped: dict[UUID, list[Horse]] = defaultdict(list)
+    for h in horses:
+        grouped[h.race_id].append(h)
+    return grouped
+
+
+def _update_horse(current: Horse, new: Horse) -> bool:
+    changed = False
+    for field in _HORSE_FIELDS:
+        value = getattr(new, field)
+        if getattr(current, field) != value:
+            setattr(current, field, value)
+            changed = True
+    return changed
+
+
+def sync_races_and_horses(
+    session: Session, races: list[Race], horses: list[Horse]
+) -> SyncResult:
+    """
+    Import a program for one meeting (hipodromo + race_date of its races).
+
+    The first import of a meeting goes through write_races_and_horses. A
+    re-published program for the same meeting (e.g. a "(MODIFICADO)" PDF) is
+    diffed against the stored rows instead: races are matched by number and
+    horses by name, so only changed runners are updated, new ones inserted and
+    scratched ones deleted, all in one commit.
+    """
+    result = SyncResult()
+    if not races:
+        return result
+
+    hipodromo, race_date = races[0].hipodromo, races[0].race_date
+    existing_races = session.exec(
+        select(Race).where(Race.hipodromo == hipodromo, Race.race_date == race_date)
+    ).all()
+    if not existing_races:
+        result.inserted = write_races_and_horses(session, races, horses)
+        result.races_added = len(races)
+        return result
+
+    existing_horses = session.exec(
+        select(Horse).where(col(Horse.race_id).in_([r.race_id for r in existing_races]))
+    ).all()
+    old_horses_by_race = _group_horses(list(existing_horses))
+    new_horses_by_race = _group_horses(horses)
+
+    old_races = _race_keys(list(existing_races), old_horses_by_race)
+    new_races = _race_keys(races, new_horses_by_race)
+
+    # Pair every new race with the stored one it replaces (None if it is new)
+    pairs = [(race, old_races.get(key)) for key, race in new_races.items()]
+    matched = {current.race_id for _, current in pairs if current is not None}
+
+    # Deletes are flushed first, so a runner moved to another race does not
+    # collide with its old row on uq_horse_unique
+    for race in existing_races:
+        if race.race_id not in matched:
+            for h in old_horses_by_race[race.race_id]:
+                session.delete(h)
+                result.scratched += 1
+            session.delete(race)
+            result.races_removed += 1
+
+    for race, current in pairs:
+        if current is None:
+            continue
+        new_names = {h.nombre for h in new_horses_by_race[race.race_id]}
+        for h in old_horses_by_race[current.race_id]:
+            if h.nombre not in new_names:
+                session.delete(h)
+                result.scratched += 1
+    session.flush()
+
+    for race, current in pairs:
+        new_horses = new_horses_by_race[race.race_id]
+        if current is None:
+            session.add(race)
+            session.add_all(new_horses)
+            result.inserted += len(new_horses)
+            result.races_added += 1
+            continue
+
+        for field in _RACE_FIELDS:
+            setattr(current, field, getattr(race, field))
+        session.add(current)
+
+        old_by_name = {h.nombre: h for h in old_horses_by_race[current.race_id]}
+        for h in new_horses:
+            stored = old_by_name.get(h.nombre)
+            if stored is None:
+                h.race_id = current.race_id
+                session.add(h)
+                result.inserted += 1
+            elif _update_horse(stored, h):
+                session.add(stored)
+                result.updated += 1
+
+    session.commit()
+    logger.info(
+        "Synced %s %s: %d new, %d updated, %d scratched horses",
+        hipodromo,
+        race_date,
+        result.inserted,
+        result.updated,
+        result.scratched,
+    )
+    return result
+
+
+def write_program_in_batches(
+    session: Session, batches: Iterable[tuple[list[Race], list[Horse]]]
+) -> int:
+    """
+    Import a program whose races arrive in batches while the PDF is parsed.
+
+    A new meeting (or one without race_date) is written batch by batch, each
+    committed as it arrives, so only one batch of races is held in memory. A
+    meeting already stored needs every race at once to be diffed (races left
+    out of the program are removed), so its batches are gathered and go
+    through sync_races_and_horses. Returns how many horses were written.
+    """
+    written = 0
+    existing: bool | None = None
+    pending_races: list[Race] = []
+    pending_horses: list[Horse] = []
+    for races, horses in batches:
+        if not races:
+            continue
+        if existing is None:
+            hipodromo, race_date = races[0].hipodromo, races[0].race_date
+            existing = race_date is not None and (
+                session.exec(
+                    select(Race.race_id).where(
+                        Race.hipodromo == hipodromo, Race.race_date == race_date
+                    )
+                ).first()
+                is not None
+            )
+        if existing:
+            pending_races.extend(races)
+            pending_horses.extend(horses)
+        else:
+            written += write_races_and_horses(session, races, horses)
+
+    if pending_races:
+        # Nothing was written above: a stored meeting only goes through here
+        written += sync_races_and_horses(session, pending_races, pending_horses).written
+    return written
@@ -0,0 +1,149 @@
+import logging
+import random
+import threading
+import time
+from typing import Any
+
+from sqlalchemy import Engine, func
+from sqlmodel import Session, SQLModel, col, select
+
+from turf_backend.models.turf import Horse, Race
+
+logger = logging.getLogger("turf")
+
+# Rounds of id probing before falling back to ORDER BY random()
+SAMPLE_ATTEMPTS = 4
+# Seconds a key pool is reused before reloading the table's keys
+KEY_POOL_TTL = 300
+
+
+def sample_horses(session: Session, count: int) -> list[Horse]:
+    """
+    Uniformly random horses, by probing random ids between min(id) and max(id).
+
+    Every probe is a primary key lookup, so the cost does not depend on the
+    size of the table. Ids that hit a gap (deleted rows) are simply retried,
+    which keeps the sample uniform. Tables with fewer rows than asked, or
+    with very sparse ids, fall back to ORDER BY random().
+    """
+    # Separate queries: SQLite only reads min/max off the index one at a time
+    low = session.exec(select(func.min(Horse.id))).one()
+    high = session.exec(select(func.max(Horse.id))).one()
+    if low is None:
+        return []
+
+    ids = range(low, high + 1)
+    found: dict[int, Horse] = {}
+    for _ in range(SAMPLE_ATTEMPTS):
+        missing = count - len(found)
+        if missing <= 0:
+            break
+        # Twice as many probes as missing rows absorbs the usual gaps
+        probes = set(random.sample(ids, min(missing * 2, len(ids))))
+        probes -= found.keys()
+        rows = list(session.exec(select(Horse).where(col(Horse.id).in_(probes))).all())
+        random.shuffle(rows)
+        for horse in rows[:missing]:
+            found[horse.id] = horse  # type: ignore[index]
+
+    sample = list(found.values())
+    if len(sample) < count:
+        query = select(Horse).order_by(func.random()).limit(count - len(sample))
+        if found:
+            query = query.where(col(Horse.id).not_in(found.keys()))
+        sample.extend(session.exec(query).all())
+    random.shuffle(sample)
+    return sample
+
+
+class KeyPool:
+    """
+    Primary keys of a table kept in memory and reloaded every `ttl` seconds,
+    for tables without a dense integer id to probe (races use UUIDs).
+
+    Sampling draws from the pool and fetches the rows by key. Loading the keys
+    reads the whole table, so it always runs in a background thread: requests
+    keep drawing from the previous keys meanwhile. Rows missing from the pool
+    (deleted or added since the last load, or all of them before the first
+    load ends) are made up with ORDER BY random().
+    """
+
+    def __init__(self, model: type[SQLModel], ttl: float = KEY_POOL_TTL) -> None:
+        self.model = model
+        self.ttl = ttl
+        self._key = model.__table__.primary_key.columns[0]  # type: ignore[attr-defined]
+        self._keys: list[Any] = []
+        self._loaded_at: float | None = None
+        self._refresher: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    def load(self, engine: Engine) -> None:
+        """Read every key of the table, in a session of its own."""
+        with Session(engine) as session:
+            keys = list(session.exec(select(self._key)).all())
+        with self._lock:
+            self._keys, self._loaded_at = keys, time.monotonic()
+
+    def refresh(self, engine: Engine) -> None:
+        """Reload the keys in a background thread, unless one already is."""
+        with self._lock:
+            if self._refresher is not None and self._refresher.is_alive():
+                return
+            self._refresher = threading.Thread(
+                target=self._refresh,
+                args=(engine,),
+                name=f"key-pool-{self._key.table.name}",
+                daemon=True,
+            )
+            self._refresher.start()
+
+    def _refresh(self, engine: Engine) -> None:
+        try:
+            self.load(engine)
+        except Exception:
+            logger.exception("Loading the keys of %s failed", self._key.table.name)
+
+    def wait(self, timeout: float | None = None) -> None:
+        """Wait for the background refresh, if one is running."""
+        refresher = self._refresher
+        if refresher is not None:
+            refresher.join(timeout)
+
+    def keys(self, session: Session) -> list[Any]:
+        """The keys loaded so far; a refresh is started once they expire."""
+        with self._lock:
+            keys, loaded_at = self._keys, self._loaded_at
+        if loaded_at is None or time.monotonic() - loaded_at >= self.ttl:
+            self.refresh(session.get_bind())  # type: ignore[arg-type]
+        return keys
+
+    def sample(self, session: Session, count: int) -> list[Any]:
+        keys = self.keys(session)
+        drawn = random.sample(keys, min(count, len(keys)))
+        rows = []
+        if drawn:
+            rows = list(
+                session.exec(select(self.model).where(self._key.in_(drawn))).all()
+            )
+        if len(rows) < len(drawn):
+            # Rows were deleted since the pool was loaded
+            self.refresh(session.get_bind())  # type: ignore[arg-type]
+        if len(rows) < count:
+            query = select(self.model).order_by(func.random()).limit(count - len(rows))
+            if rows:
+                found = [getattr(row, self._key.name) for row in rows]
+                query = query.where(self._key.not_in(found))
+            rows.extend(session.exec(query).all())
+        random.shuffle(rows)
+        return rows
+
+    def clear(self) -> None:
+        with self._lock:
+            self._keys, self._loaded_at = [], None
+
+
+race_pool = KeyPool(Race)
+
+
+def sample_races(session: Session, count: int) -> list[Race]:
+    return race_pool.sample(session, count)
@@ -0,0 +1,353 @@
+import asyncio
+import hashlib
+import logging
+import multiprocessing
+import os
+import tempfile
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy import Engine
+from sqlmodel import Session, col, select
+
+from turf_backend.core.config.settings import settings
+from turf_backend.models.turf import PdfImport
+from turf_backend.services.pdf.cache import (
+    deserialize_program,
+    get_cached_program,
+    serialize_program,
+    store_program,
+)
+from turf_backend.services.pdf.pages import ParsedProgram
+from turf_backend.services.pdf.remote import PdfValidators, RemotePdf, track_source
+from turf_backend.services.san_isidro import scraper
+from turf_backend.services.san_isidro.races import insert_and_create_races
+from turf_backend.services.san_isidro.sanisidro_processing import (
+    PARSER_VERSION,
+    parse_pdf_program,
+)
+from turf_backend.services.sync_state import CalendarDay, record_day
+from turf_backend.utils.date import calendar_race_date, program_race_date
+
+logger = logging.getLogger("turf")
+
+# Key of San Isidro in PdfImport and the sync state tables
+HIPODROMO = "san_isidro"
+
+
+@dataclass
+class _Day:
+    """A calendar day on its way through the pipeline."""
+
+    fecha: str
+    calendario_id: str
+    url: str = ""
+    remote: RemotePdf = field(default_factory=lambda: RemotePdf(None, PdfValidators()))
+    file_hash: str = ""
+    # Temp copy of the PDF while it waits for a parse worker
+    pdf_path: str | None = None
+    program: ParsedProgram | None = None
+    cached: bool = False
+    # Set as soon as the day needs no further stage (skipped or failed)
+    result: dict[str, Any] | None = None
+
+    def settle(self, status: str, **fields: Any) -> "_Day":
+        self.result = {"fecha": self.fecha, "status": status, **fields}
+        return self
+
+
+def _parse_to_payload(parse: Callable[[str], ParsedProgram], pdf_path: str) -> bytes:
+    # Runs in a worker process; the serialized program is much cheaper to
+    # send back than the pickled Horse objects
+    return serialize_program(parse(pdf_path))
+
+
+class SyncPipeline:
+    """
+    Import the PROGRAMA_OFICIAL PDFs of many days in three stages joined by
+    bounded queues:
+
+    - download: async, with at most `download_concurrency` PDFs in flight. Each
+      one is a conditional GET against the validators of its last import.
+    - parse: a process pool with one worker per core by default, so pdfplumber
+      is not serialized by the GIL. PDFs already imported or in the parse cache
+      are not parsed again.
+    - write: one thread owning the database session, which imports the days as
+      they come out of the parse stage, taking every day already waiting at
+      once. Each day is still committed on its own, so a failure only loses
+      that day.
+
+    A full queue holds back the stage feeding it, so memory stays bounded by
+    `queue_size` PDFs per stage whatever the length of the range.
+    """
+
+    def __init__(
+        self,
+        engine: Engine,
+        *,
+        parse: Callable[[str], ParsedProgram] = parse_pdf_program,
+        parser_version: str = PARSER_VERSION,
+        download_concurrency: int | None = None,
+        parse_workers: int | None = None,
+        queue_size: int | None = None,
+        checkpoint: bool = False,
+        on_result: Callable[[dict[str, Any]], None] | None = None,
+    ) -> None:
+        self.engine = engine
+        self.parse = parse
+        self.parser_version = parser_version
+        self.download_concurrency = (
+            download_concurrency or settings.sync_download_concurrency
+        )
+        self.parse_workers = (
+            parse_workers or settings.sync_parse_workers or os.cpu_count() or 1
+        )
+        self.queue_size = queue_size or settings.sync_queue_size
+        # Record every day's result in sync_days (see services/sync_state.py)
+        self.checkpoint = checkpoint
+        # Called from the writer thread with each day's result (job progress)
+        self.on_result = on_result
+
+    def run(self, days: list[CalendarDay]) -> list[dict[str, Any]]:
+        """Import `days` and return one result dict per day, as they finish."""
+        if not days:
+            return []
+        with Session(self.engine) as session:
+            known = self._known_validators(session, days)
+        return asyncio.run(self._run(days, known))
+
+    def _known_validators(
+        self, session: Session, days: list[CalendarDay]
+    ) -> dict[str, PdfValidators]:
+        """Validators of the last import of each PDF URL of these days."""
+        imports = session.exec(
+            select(PdfImport)
+            .where(
+                PdfImport.hipodromo == HIPODROMO,
+                col(PdfImport.calendario_id).in_([cid for _, cid in days]),
+            )
+            .order_by(col(PdfImport.imported_at))
+        ).all()
+        known = {}
+        for pdf_import in imports:
+            validators = PdfValidators.of(pdf_import)
+            if pdf_import.source_url and validators is not None:
+                known[pdf_import.source_url] = validators
+        return known
+
+    async def _run(
+        self, days: list[CalendarDay], known: dict[str, PdfValidators]
+    ) -> list[dict[str, Any]]:
+        downloaded: asyncio.Queue[_Day | None] = asyncio.Queue(self.queue_size)
+        parsed: asyncio.Queue[_Day | None] = asyncio.Queue(self.queue_size)
+        workers = min(self.parse_workers, len(days))
+        # Spawned, not forked: this runs on job worker threads, and a child
+        # forked while another thread holds the pdfium lock would deadlock
+        spawn = multiprocessing.get_context("spawn")
+        parse_pool: Executor = (
+            ProcessPoolExecutor(workers, mp_context=spawn)
+            if workers > 1
+            else ThreadPoolExecutor(1)
+        )
+        writer = ThreadPoolExecutor(1, thread_name_prefix="sync-writer")
+        with parse_pool, writer, Session(self.engine) as session:
+            *_, results = await asyncio.gather(
+                self._download(days, known, downloaded),
+                self._parse(downloaded, parsed, parse_pool, workers),
+                self._write(parsed, writer, session),
+            )
+        return results
+
+    async def _download(
+        self,
+        days: list[CalendarDay],
+        known: dict[str, PdfValidators],
+        out: "asyncio.Queue[_Day | None]",
+    ) -> None:
+        async with scraper.async_client() as client:
+
+            async def download(day: CalendarDay) -> None:
+                await out.put(await self._download_day(day, known, client))
+
+            await scraper.gather_bounded(download, days, self.download_concurrency)
+        await out.put(None)
+
+    async def _download_day(
+        self, day: CalendarDay, known: dict[str, PdfValidators], client
+    ) -> _Day:
+        item = _Day(*day)
+        try:
+            links = await scraper.get_pdf_links_async(item.calendario_id, client)
+            if not links.programa_oficial:
+                return item.settle("missing", reason="no PDF found")
+            item.url = links.programa_oficial
+            item.remote = await scraper.fetch_pdf_async(
+                item.url, known.get(item.url), client
+            )
+            if item.remote.unchanged:
+                return item.settle("skipped", reason="not modified")
+            item.file_hash = hashlib.sha256(item.remote.content).hexdigest()
+        except Exception as e:
+            logger.exception("Error downloading %s", item.fecha)
+            item.settle("error", reason=str(e))
+        return item
+
+    async def _parse(
+        self,
+        inbox: "asyncio.Queue[_Day | None]",
+        out: "asyncio.Queue[_Day | None]",
+        pool: Executor,
+        workers: int,
+    ) -> None:
+        loop = asyncio.get_running_loop()
+        free = asyncio.Semaphore(workers)
+        parsing: set[asyncio.Task] = set()
+
+        async def parse(item: _Day) -> None:
+            try:
+                item.program = await asyncio.to_thread(self._lookup, item)
+                item.cached = item.program is not None
+                if item.pdf_path is not None:
+                    item.program = deserialize_program(
+                        await loop.run_in_executor(
+                            pool, _parse_to_payload, self.parse, item.pdf_path
+                        )
+                    )
+            except Exception as e:
+                logger.exception("Error parsing %s", item.fecha)
+                item.settle("error", reason=str(e))
+            finally:
+                _discard_temp_file(item)
+                free.release()
+            await out.put(item)
+
+        while (item := await inbox.get()) is not None:
+            if item.result is not None:
+                await out.put(item)
+                continue
+            await free.acquire()
+            task = asyncio.create_task(parse(item))
+            parsing.add(task)
+            task.add_done_callback(parsing.discard)
+        await asyncio.gather(*parsing)
+        await out.put(None)
+
+    def _lookup(self, item: _Day) -> ParsedProgram | None:
+        """
+        Program of the day's PDF from the parse cache. Otherwise the PDF is
+        written to a temp file for the parse workers, unless it was already
+        imported.
+        """
+        with Session(self.engine) as session:
+            if session.exec(
+                select(PdfImport.id).where(PdfImport.file_hash == item.file_hash)
+            ).first():
+                # Left to the writer, which records where it came from this time
+                return None
+            if settings.parse_cache_max_bytes > 0:
+                program = get_cached_program(
+                    session, item.file_hash, self.parser_version
+                )
+                if program is not None:
+                    return program
+
+        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
+            tmp.write(item.remote.content)  # type: ignore[arg-type]
+        item.pdf_path = tmp.name
+        return None
+
+    async def _write(
+        self,
+        inbox: "asyncio.Queue[_Day | None]",
+        writer: Executor,
+        session: Session,
+    ) -> list[dict[str, Any]]:
+        loop = asyncio.get_running_loop()
+        results: list[dict[str, Any]] = []
+        finished = False
+        while not finished:
+            batch = [await inbox.get()]
+            while not inbox.empty():
+                batch.append(inbox.get_nowait())
+            # The parse stage sends None once, after every day
+            if batch[-1] is None:
+                batch.pop()
+                finished = True
+            results.extend(
+                await loop.run_in_executor(
+                    writer,
+                    self._write_batch,
+                    session,
+                    batch,  # type: ignore[arg-type]
+                )
+            )
+        return results
+
+    def _write_batch(self, session: Session, batch: list[_Day]) -> list[dict[str, Any]]:
+        results = []
+        for item in batch:
+            try:
+                result = self._write_day(session, item)
+            except Exception as e:
+                logger.exception("Error importing %s", item.fecha)
+                session.rollback()
+                result = {"fecha": item.fecha, "status": "error", "reason": str(e)}
+            if self.checkpoint:
+                record_day(session, HIPODROMO, item.calendario_id, result)
+            if self.on_result is not None:
+                self.on_result(result)
+            results.append(result)
+        return results
+
+    def _write_day(self, session: Session, item: _Day) -> dict[str, Any]:
+        if item.result is not None:
+            return item.result
+
+        existing = session.exec(
+            select(PdfImport).where(PdfImport.file_hash == item.file_hash)
+        ).first()
+        if existing:
+            # Same file under a new URL or validators: remember them for next time
+            session.add(
+                track_source(existing, item.remote, item.url, item.calendario_id)
+            )
+            session.commit()
+            return {
+                "fecha": item.fecha,
+                "status": "skipped",
+                "reason": "already imported",
+            }
+
+        program: ParsedProgram = item.program  # type: ignore[assignment]
+        if not item.cached and settings.parse_cache_max_bytes > 0:
+            store_program(session, item.file_hash, self.parser_version, program)
+
+        pdf_import = track_source(
+            PdfImport(
+                file_hash=item.file_hash,
+                filename=item.url.split("/")[-1],
+                hipodromo=HIPODROMO,
+            ),
+            item.remote,
+            item.url,
+            item.calendario_id,
+        )
+        inserted = 0
+        if program.horses:
+            # The calendar already knows the race day; the PDF is the fallback
+            race_date = calendar_race_date(item.fecha) or program_race_date(
+                item.remote.content  # type: ignore[arg-type]
+            )
+            inserted = insert_and_create_races(session, program, race_date)
+        session.add(pdf_import)
+        session.commit()
+        return {"fecha": item.fecha, "status": "imported", "inserted": inserted}
+
+
+def _discard_temp_file(item: _Day) -> None:
+    if item.pdf_path is not None:
+        Path(item.pdf_path).unlink()
+        item.pdf_path = None
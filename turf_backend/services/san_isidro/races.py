@@ -1,18 +1,28 @@
 from collections import defaultdict
-from datetime import datetime
+from collections.abc import Iterable
+from datetime import date
 from typing import Any
 from uuid import UUID
 
-import pdfplumber
 from sqlmodel import Session
 
+from turf_backend.core.config.settings import settings
 from turf_backend.models.turf import Horse, Race
+from turf_backend.services.bulk_insert import write_races_and_horses
+from turf_backend.services.catalog import link_horses
+from turf_backend.services.meetings import meeting_cache
+from turf_backend.services.pdf.pages import ParsedProgram, batch_races
+from turf_backend.services.program_sync import (
+    sync_races_and_horses,
+    write_program_in_batches,
+)
 from turf_backend.services.san_isidro.helper import (
     DISTANCE_RE,
     HOUR_RE,
     PISTA_RE,
     RACE_HEADER_RE,
 )
+from turf_backend.utils.date import RACE_DATE_FORMAT
 
 
 def create_race(session: Session, **kwargs) -> Race:
@@ -43,22 +53,6 @@ def assign_horses_to_race(session: Session, race_id: UUID, horses: list[Horse])
     return inserted
 
 
-def _bulk_insert_races_and_horses(
-    session: Session,
-    races: list[Race],
-    all_horses: list[Horse],
-) -> int:
-    """
-    Inserta todas las carreras y caballos en un solo flush + commit.
-    Mucho más eficiente que hacer commit por cada carrera/grupo.
-    """
-    session.add_all(races)
-    session.flush()
-    session.add_all(all_horses)
-    session.commit()
-    return len(all_horses)
-
-
 def parse_race_header_from_page(lines: list[str]) -> dict[str, Any]:
     """
     Parse race metadata from a page's lines.
@@ -217,44 +211,86 @@ def extract_all_races_from_lines(lines: list[str]) -> list[dict[str, Any]]:
 
 # ---------------------------------------------------------------------------
 
-def insert_and_create_races(session: Session, horses: list[Horse], pdf_path: str) -> int:
+def insert_and_create_races(
+    session: Session, program: ParsedProgram, race_date: date | None = None
+) -> int:
+    """
+    Store the races and horses of a parsed program.
+
+    `race_date` is the race day, from the PDF or the calendar. When it is
+    known, a program already imported for that day is updated in place with
+    only the changes (see sync_races_and_horses); without it the rows are
+    inserted as a new meeting with no race_date and today as fecha. Returns
+    how many horses were written.
+    """
+    all_races, all_horses = _build_races(session, program, race_date)
+    if race_date is None:
+        written = write_races_and_horses(session, all_races, all_horses)
+    else:
+        written = sync_races_and_horses(session, all_races, all_horses).written
+    # Readers of /general/meetings must see the new card right away
+    meeting_cache.invalidate("San Isidro", race_date)
+    return written
+
+
+def insert_races_in_batches(
+    session: Session,
+    races: Iterable[ParsedProgram],
+    race_date: date | None = None,
+    batch_size: int | None = None,
+) -> int:
+    """
+    Same as insert_and_create_races, for a program streamed race by race (see
+    iter_program_races). Races are written in batches of `batch_size`
+    (IMPORT_BATCH_RACES by default) as they are parsed; see
+    write_program_in_batches.
+    """
+    batch_size = batch_size or settings.import_batch_races
+    batches = (
+        _build_races(session, batch, race_date)
+        for batch in batch_races(races, batch_size)
+    )
+    written = write_program_in_batches(session, batches)
+    meeting_cache.invalidate("San Isidro", race_date)
+    return written
+
+
+def _build_races(
+    session: Session, program: ParsedProgram, race_date: date | None
+) -> tuple[list[Race], list[Horse]]:
+    """Race rows of a parsed program and its horses, linked to the catalogue."""
     races_dict: dict[UUID, list[Horse]] = defaultdict(list)
-    for h in horses:
+    for h in program.horses:
         races_dict[h.race_id].append(h)
 
     all_races: list[Race] = []
     all_horses: list[Horse] = []
-    fecha_hoy = datetime.now().strftime("%d/%m/%Y")
-
-    with pdfplumber.open(pdf_path) as pdf:
-        for temporary_race_id, horses_group in races_dict.items():
-            first_horse = horses_group[0]
-            page_idx = first_horse.page
-
-            page = pdf.pages[page_idx]
-            lines = (page.extract_text() or "").splitlines()
-
-            race_info = parse_race_header_from_page(lines)
-
-            distancia_val = None
-            if race_info["distancia"] is not None:
-                try:
-                    distancia_val = int(race_info["distancia"])
-                except (ValueError, TypeError):
-                    distancia_val = None
-
-            all_races.append(Race(
-                race_id=temporary_race_id,
-                hipodromo="San Isidro",
-                fecha=fecha_hoy,
-                hour=race_info["hora"],
-                nombre=race_info["nombre"],
-                distancia=distancia_val,
-                numero=race_info["numero"],
-            ))
-
-            for h in horses_group:
-                h.race_id = temporary_race_id
-                all_horses.append(h)
-
-    return _bulk_insert_races_and_horses(session, all_races, all_horses)
+    fecha_carrera = (race_date or date.today()).strftime(RACE_DATE_FORMAT)
+
+    for temporary_race_id, horses_group in races_dict.items():
+        race_info = program.races[temporary_race_id]
+
+        distancia_val = None
+        if race_info["distancia"] is not None:
+            try:
+                distancia_val = int(race_info["distancia"])
+            except (ValueError, TypeError):
+                distancia_val = None
+
+        all_races.append(Race(
+            race_id=temporary_race_id,
+            hipodromo="San Isidro",
+            fecha=fecha_carrera,
+            race_date=race_date,
+            hour=race_info["hora"],
+            nombre=race_info["nombre"],
+            distancia=distancia_val,
+            numero=race_info["numero"],
+        ))
+
+        for h in horses_group:
+            h.race_id = temporary_race_id
+            all_horses.append(h)
+
+    link_horses(session, all_horses)
+    return all_races, all_horses
@@ -1,22 +1,71 @@
 import logging
 import re
 import uuid
-
-import pdfplumber
+from collections.abc import Iterable, Iterator
 
 from turf_backend.models.turf import Horse
+from turf_backend.services.pdf.layout import LayoutProfile
+from turf_backend.services.pdf.pages import ParsedProgram, PdfPage, iter_pdf_pages
+from turf_backend.services.pdf.rows import iter_rows
 from turf_backend.services.san_isidro.helper import (
     parse_post_peso,
     parse_weight,
 )
+from turf_backend.services.san_isidro.races import parse_race_header_from_page
 
 logger = logging.getLogger("turf")
 logger.setLevel(logging.INFO)
 
+# Key of this parser's results in the parsed PDF cache. Bump it whenever
+# _parse_horse_row (or anything else that changes the parsed output) changes.
+PARSER_VERSION = "san_isidro-4"
+
+# Entries table, found by the header row _get_col_bounds reads the columns from.
+# L.CUIDA is the last column and its caballeriza names run well past the label.
+LAYOUT = LayoutProfile(anchors=("JOCKEY", "KG", "L.CUIDA"), right_margin=120.0)
 
-def parse_pdf_horses(pdf_path: str) -> list[Horse]:
-    rows = extract_horses_from_pdf(pdf_path)
 
+def parse_pdf_horses(pdf_path: str) -> list[Horse]:
+    return parse_pdf_program(pdf_path).horses
+
+
+def parse_pdf_program(pdf_path: str, workers: int | None = None) -> ParsedProgram:
+    """
+    Parse horses and race headers in a single pass over the PDF.
+
+    Every page is opened and its words extracted only once; the race header of
+    each page is read from the same words instead of re-opening the file. With
+    PDF_CROP_TO_TABLE, only the entries table of each page is extracted (see
+    LAYOUT). `workers` > 1 extracts the pages with a process pool (see
+    iter_pdf_pages).
+    """
+    program = ParsedProgram()
+    for race in iter_program_races(pdf_path, workers):
+        program.extend(race)
+    return program
+
+
+def iter_program_races(
+    pdf_path: str, workers: int | None = None
+) -> Iterator[ParsedProgram]:
+    """
+    Yield the program one race at a time, as a ParsedProgram with that race
+    and its horses, while the pages are being read. Read serially (`workers`
+    <= 1), only the page of the race being parsed is held in memory.
+    """
+    pages = iter_pdf_pages(pdf_path, first_page=1, workers=workers, layout=LAYOUT)
+    for page in pages:
+        page_horses = _unique_horses(_extract_horses_from_page(page))
+        if page_horses:
+            # Each page is a single race, so its header lives in the same words
+            race_id = page_horses[0].race_id
+            yield ParsedProgram(
+                horses=page_horses,
+                races={race_id: parse_race_header_from_page(page.lines)},
+            )
+
+
+def _unique_horses(rows: list[Horse]) -> list[Horse]:
     seen = set()
     unique_rows = []
     for r in rows:
@@ -53,23 +102,6 @@ def _get_col_bounds(words: list[dict]) -> dict:
     return bounds
 
 
-def _group_by_row(words: list[dict], y_tol: float = 3.0) -> list[list[dict]]:
-    """Group words into rows by their top (y) coordinate."""
-    if not words:
-        return []
-    sorted_w = sorted(words, key=lambda w: (w["top"], w["x0"]))
-    rows: list[list[dict]] = []
-    cur = [sorted_w[0]]
-    for w in sorted_w[1:]:
-        if abs(w["top"] - cur[0]["top"]) <= y_tol:
-            cur.append(w)
-        else:
-            rows.append(sorted(cur, key=lambda w: w["x0"]))
-            cur = [w]
-    rows.append(sorted(cur, key=lambda w: w["x0"]))
-    return rows
-
-
 def _parse_horse_row(
     row: list[dict],
     race_id: uuid.UUID,
@@ -152,33 +184,35 @@ def _parse_horse_row(
     )
 
 
-def extract_horses_from_pdf(pdf_path: str) -> list[Horse]:
-    results = []
-
-    with pdfplumber.open(pdf_path) as pdf:
-        for page_idx, page in enumerate(pdf.pages):
-            # Page 0 is the cover — skip it
-            if page_idx == 0:
-                continue
+def _extract_horses_from_page(page: PdfPage) -> list[Horse]:
+    if not page.words:
+        return []
 
-            words = page.extract_words()
-            if not words:
-                continue
+    col = _get_col_bounds(page.words)
 
-            col = _get_col_bounds(words)
-            rows = _group_by_row(words)
+    race_id = uuid.uuid4()
 
-            race_id = uuid.uuid4()
+    results = []
+    for row in iter_rows(page.words):
+        horse = _parse_horse_row(
+            row,
+            race_id,
+            page.index,
+            jockey_x=col["jockey"],
+            kg_x=col["kg"],
+        )
+        if horse is not None:
+            results.append(horse)
+    return results
 
-            for row in rows:
-                horse = _parse_horse_row(
-                    row,
-                    race_id,
-                    page_idx,
-                    jockey_x=col["jockey"],
-                    kg_x=col["kg"],
-                )
-                if horse is not None:
-                    results.append(horse)
 
+def extract_horses_from_pages(pages: Iterable[PdfPage]) -> list[Horse]:
+    results = []
+    for page in pages:
+        results.extend(_extract_horses_from_page(page))
     return results
+
+
+def extract_horses_from_pdf(pdf_path: str) -> list[Horse]:
+    # Page 0 is the cover — skip it
+    return extract_horses_from_pages(iter_pdf_pages(pdf_path, first_page=1))
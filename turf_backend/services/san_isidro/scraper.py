@@ -1,11 +1,27 @@
+import asyncio
 import logging
 import re
+import sys
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Iterable
+from contextlib import suppress
 from dataclasses import dataclass
 from datetime import date, timedelta
-from typing import Optional
+from functools import cached_property
+from html.parser import HTMLParser
+from operator import itemgetter
+from typing import Optional, TypeVar
 
+import httpx
 import requests
 from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+
+from turf_backend.services.pdf.remote import PdfValidators, RemotePdf
+from turf_backend.services.pdf.remote import fetch_pdf as _fetch_pdf
+from turf_backend.services.pdf.remote import fetch_pdf_async as _fetch_pdf_async
 
 logger = logging.getLogger("turf")
 
@@ -14,6 +30,78 @@ CALENDAR_URL = f"{BASE_URL}/programas/"
 PROGRAM_API_URL = f"{BASE_URL}/wacP/public/programa-oficial/"
 CALENDAR_API_URL = f"{BASE_URL}/wacP/public/calendario"
 
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
+    "Accept-Language": "es-ES,es;q=0.9,en;q=0.8",
+}
+_JSON_HEADERS = {"Accept": "application/json"}
+REQUEST_TIMEOUT = 30
+
+# Open connections kept per host; extra requests wait for a free connection
+MAX_CONNECTIONS_PER_HOST = 8
+# Requests in flight at once in the async helpers
+DEFAULT_CONCURRENCY = 4
+
+# Seconds a fetched program page is reused before revalidating it with the server
+PROGRAM_PAGE_TTL = 300
+PROGRAM_PAGE_MAX_ENTRIES = 64
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+_http_session: requests.Session | None = None
+
+
+def get_http_session() -> requests.Session:
+    """Shared keep-alive session, so consecutive requests reuse TCP+TLS connections."""
+    global _http_session  # pylint: disable=global-statement
+    if _http_session is None:
+        session = requests.Session()
+        session.headers.update(HEADERS)
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=MAX_CONNECTIONS_PER_HOST,
+            pool_block=True,
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        _http_session = session
+    return _http_session
+
+
+def async_client() -> httpx.AsyncClient:
+    """
+    Keep-alive async client with the scraper headers and connection limits.
+
+    Use it as `async with async_client() as client:` and pass `client` to the
+    `*_async` functions; it is bound to the running event loop, so it is not
+    shared at module level like the sync session.
+    """
+    return httpx.AsyncClient(
+        headers=HEADERS,
+        timeout=REQUEST_TIMEOUT,
+        limits=httpx.Limits(
+            max_connections=MAX_CONNECTIONS_PER_HOST,
+            max_keepalive_connections=MAX_CONNECTIONS_PER_HOST,
+        ),
+    )
+
+
+async def gather_bounded(
+    func: Callable[[T], Awaitable[R]],
+    items: Iterable[T],
+    concurrency: int = DEFAULT_CONCURRENCY,
+) -> list[R]:
+    """Run `func` over `items` with at most `concurrency` calls in flight, in order."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(item: T) -> R:
+        async with semaphore:
+            return await func(item)
+
+    return await asyncio.gather(*(run(item) for item in items))
+
 
 @dataclass
 class RaceInfo:
@@ -53,12 +141,13 @@ class DayRaces:
 
 
 def fetch_page(url: str) -> BeautifulSoup:
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-        "Accept-Language": "es-ES,es;q=0.9,en;q=0.8",
-    }
-    response = requests.get(url, headers=headers, timeout=30)
+    response = get_http_session().get(url, timeout=REQUEST_TIMEOUT)
+    response.raise_for_status()
+    return BeautifulSoup(response.text, "html.parser")
+
+
+async def fetch_page_async(url: str, client: httpx.AsyncClient) -> BeautifulSoup:
+    response = await client.get(url)
     response.raise_for_status()
     return BeautifulSoup(response.text, "html.parser")
 
@@ -72,15 +161,26 @@ class CalendarEvent:
 
 def get_calendar_events(start: date, end: date) -> list[CalendarEvent]:
     """Fetch all calendar events for a date range from the official API."""
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-    }
     params = {"start": start.isoformat(), "end": end.isoformat()}
-    response = requests.get(CALENDAR_API_URL, headers=headers, params=params, timeout=30)
+    response = get_http_session().get(
+        CALENDAR_API_URL, params=params, headers=_JSON_HEADERS, timeout=REQUEST_TIMEOUT
+    )
+    response.raise_for_status()
+    return _parse_calendar_events(response.json())
+
+
+async def get_calendar_events_async(
+    start: date, end: date, client: httpx.AsyncClient
+) -> list[CalendarEvent]:
+    params = {"start": start.isoformat(), "end": end.isoformat()}
+    response = await client.get(CALENDAR_API_URL, params=params, headers=_JSON_HEADERS)
     response.raise_for_status()
+    return _parse_calendar_events(response.json())
 
+
+def _parse_calendar_events(items: list[dict]) -> list[CalendarEvent]:
     events = []
-    for item in response.json():
+    for item in items:
         url = item.get("url", "")
         class_name = item.get("className", "")
         match = re.search(r"calendario_id=(\d+)", url)
@@ -129,102 +229,195 @@ def get_upcoming_orange_day() -> Optional[tuple[str, str]]:
 
 def scrape_race_day(calendario_id: str) -> DayRaces:
     """Scrape all races from a specific day using the API."""
-    url = f"{PROGRAM_API_URL}{calendario_id}"
-    soup = fetch_page(url)
+    return extract_race_day(get_program_page(calendario_id).html, calendario_id)
+
+
+_RACE_HEADER_RE = re.compile(
+    r"(\d+)\s*[ªº]?\s*[-\u2013]\s*Premio[:\s]+([^-\u2013]+?)\s*"
+    r"(?:[-\u2013]\s*(\d{1,2}:\d{2})\s*hs?|[-\u2013]|$)",
+    re.IGNORECASE,
+)
+_FECHA_RE = re.compile(r"\d{1,2}\s+de\s+\w+\s+de\s+\d{4}")
+_DISTANCIA_RE = re.compile(r"(\d{3,4})\s*mts?", re.IGNORECASE)
+_PISTA_RE = re.compile(r"Pista\s+(Arena|Tierra|Cemento|Grass)", re.IGNORECASE)
+_BOLSA_RE = re.compile(r"Bolsa\s*Total[:\s]*\$?\s*([\d\.]+)", re.IGNORECASE)
+
+# Tags that start a new text block; inline tags (b, span, a...) stay in the block
+_BLOCK_TAGS = frozenset({
+    "div", "table", "tr", "td", "th", "p", "li", "ul", "ol", "section",
+    "article", "header", "footer", "h1", "h2", "h3", "h4", "h5", "h6", "br",
+})
+_SKIP_TAGS = frozenset({"script", "style"})
+
+
+class _ProgramPageParser(HTMLParser):
+    """
+    Single pass over a program page.
+
+    Collects the text of every block element in document order and the cell
+    texts of every table, so races and horses are read off flat lists instead
+    of re-serializing nested subtrees with BeautifulSoup.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.blocks: list[str] = []
+        self.tables: list[list[list[str]]] = []
+        self.fecha_text = ""
+        self._text: list[str] = []
+        self._skip = 0
+        self._h4: list[str] | None = None
+        # Open tables, innermost last: (rows, open row, open cell)
+        self._open_tables: list[list] = []
+
+    def handle_starttag(self, tag, attrs):  # noqa: ARG002
+        if tag in _SKIP_TAGS:
+            self._skip += 1
+        elif tag == "h4" and not self.fecha_text:
+            self._h4 = []
+
+        if tag not in _BLOCK_TAGS:
+            return
+        self._flush_block()
+        if tag == "table":
+            rows: list[list[str]] = []
+            self.tables.append(rows)
+            self._open_tables.append([rows, None, None])
+        elif self._open_tables:
+            table = self._open_tables[-1]
+            if tag == "tr":
+                self._close_row(table)
+                table[1] = []
+            elif tag in {"td", "th"}:
+                self._close_cell(table)
+                if table[1] is None:
+                    table[1] = []
+                table[2] = []
+
+    def handle_endtag(self, tag):
+        if tag in _SKIP_TAGS:
+            self._skip = max(0, self._skip - 1)
+        elif tag == "h4" and self._h4 is not None:
+            self.fecha_text = " ".join(self._h4)
+            self._h4 = None
+
+        if tag not in _BLOCK_TAGS:
+            return
+        self._flush_block()
+        if not self._open_tables:
+            return
+        table = self._open_tables[-1]
+        if tag in {"td", "th"}:
+            self._close_cell(table)
+        elif tag == "tr":
+            self._close_row(table)
+        elif tag == "table":
+            self._close_row(table)
+            self._open_tables.pop()
+
+    def handle_data(self, data):
+        if self._skip:
+            return
+        text = data.strip()
+        if not text:
+            return
+        self._text.append(text)
+        if self._h4 is not None:
+            self._h4.append(text)
+        # Text of a nested table also belongs to the enclosing cells
+        for table in self._open_tables:
+            if table[2] is not None:
+                table[2].append(text)
+
+    def close(self):
+        super().close()
+        self._flush_block()
+        while self._open_tables:
+            self._close_row(self._open_tables.pop())
+
+    def _flush_block(self) -> None:
+        if self._text:
+            self.blocks.append(" ".join(self._text))
+            self._text = []
+
+    @staticmethod
+    def _close_cell(table: list) -> None:
+        if table[2] is not None:
+            table[1].append(" ".join(table[2]))
+            table[2] = None
+
+    @classmethod
+    def _close_row(cls, table: list) -> None:
+        cls._close_cell(table)
+        if table[1] is not None:
+            table[0].append(table[1])
+            table[1] = None
+
+
+def extract_race_day(html: str, calendario_id: str) -> DayRaces:
+    """
+    Read the races and their horses from a program page in one linear walk.
+
+    A race starts at every text block matching "Nª - Premio ..."; its distance,
+    track and purse come from the blocks up to the next race. Horse tables are
+    paired with the races in order, as they appear on the page.
+    """
+    parser = _ProgramPageParser()
+    parser.feed(html)
+    parser.close()
+
+    fecha_match = _FECHA_RE.search(parser.fecha_text)
+    fecha = fecha_match.group(0) if fecha_match else ""
 
     races = []
     horses_by_race = {}
-
-    fecha_elem = soup.find("h4")
-    fecha = ""
-    if fecha_elem:
-        fecha_text = fecha_elem.get_text(strip=True)
-        fecha_match = re.search(r"\d{1,2}\s+de\s+\w+\s+de\s+\d{4}", fecha_text)
-        if fecha_match:
-            fecha = fecha_match.group(0)
-
-    tables = soup.find_all("table")
-
-    all_elements = soup.find_all(["div", "table"])
-
-    race_divs = []
-    for elem in all_elements:
-        text = elem.get_text(strip=True)
-        if re.search(r"\d+\s*ª\s*[-–]\s*Premio", text):
-            race_divs.append(elem)
-
     current_race_info = None
 
-    for i, div in enumerate(race_divs):
-        div_text = div.get_text(strip=True)
+    for text in parser.blocks:
+        race_match = _RACE_HEADER_RE.search(text)
+        if race_match:
+            current_race_info = RaceInfo(
+                numero=int(race_match.group(1)),
+                nombre=race_match.group(2).strip(),
+                hora=race_match.group(3) or "",
+                distancia=0,
+                pista="",
+                condicion="",
+                bolsa_total="",
+                premios={},
+            )
+            races.append(current_race_info)
+            horses_by_race[current_race_info.numero] = []
+            text = text[race_match.end():]
 
-        race_match = re.search(
-            r"(\d+)\s*(?:ª|º)?\s*[-–]\s*Premio[:\s]+([^-]+?)(?:\s*-\s*(\d{1,2}:\d{2})\s*hs?)?",
-            div_text,
-            re.I,
-        )
-        if not race_match:
+        if current_race_info is None:
             continue
 
-        numero = int(race_match.group(1))
-        nombre = race_match.group(2).strip()
-        hora = race_match.group(3) or ""
-
-        distancia = 0
-        pista = ""
-        bolsa = ""
-
-        for j in range(i, min(i + 10, len(all_elements))):
-            if all_elements[j] == div:
-                continue
-            elem_text = all_elements[j].get_text(strip=True)
-
-            dist_match = re.search(r"(\d{3,4})\s*mts?", elem_text, re.I)
-            if dist_match and distancia == 0:
-                distancia = int(dist_match.group(1))
+        if not current_race_info.distancia:
+            dist_match = _DISTANCIA_RE.search(text)
+            if dist_match:
+                current_race_info.distancia = int(dist_match.group(1))
 
-            pista_match = re.search(
-                r"Pista\s+(Arena|Tierra|Cemento|Grass)", elem_text, re.I
-            )
+        if not current_race_info.pista:
+            pista_match = _PISTA_RE.search(text)
             if pista_match:
-                pista = pista_match.group(1)
+                current_race_info.pista = pista_match.group(1)
 
-            bolsa_match = re.search(r"Bolsa\s*Total[:\s]*\$?([\d\.]+)", elem_text, re.I)
+        if not current_race_info.bolsa_total:
+            bolsa_match = _BOLSA_RE.search(text)
             if bolsa_match:
-                bolsa = bolsa_match.group(1)
-
-        current_race_info = RaceInfo(
-            numero=numero,
-            nombre=nombre,
-            hora=hora,
-            distancia=distancia,
-            pista=pista,
-            condicion="",
-            bolsa_total=bolsa,
-            premios={},
+                current_race_info.bolsa_total = bolsa_match.group(1)
+
+    horse_tables = (
+        rows
+        for rows in parser.tables
+        if len(rows) >= 3
+        and any(
+            "EJEMP" in cell or "caballo" in cell.lower() for row in rows for cell in row
         )
-        races.append(current_race_info)
-        horses_by_race[numero] = []
-
-    table_idx = 0
-    for race in races:
-        while table_idx < len(tables):
-            table = tables[table_idx]
-            text = table.get_text(strip=True)
-
-            if "EJEMP" not in text and "caballo" not in text.lower():
-                table_idx += 1
-                continue
-
-            rows = table.find_all("tr")
-            if len(rows) < 3:
-                table_idx += 1
-                continue
-
-            horses = parse_horses_from_table(rows)
-            horses_by_race[race.numero].extend(horses)
-            table_idx += 1
-            break
+    )
+    for race, rows in zip(races, horse_tables, strict=False):
+        horses_by_race[race.numero].extend(parse_horses_from_table(rows))
 
     return DayRaces(
         fecha=fecha,
@@ -234,26 +427,35 @@ def scrape_race_day(calendario_id: str) -> DayRaces:
     )
 
 
-def parse_horses_from_table(rows) -> list[HorseInfo]:
-    horses = []
+_PESO_RE = re.compile(r"(\d+(?:\.\d+)?)")
+_JOCKEY_PESO_RE = re.compile(r"(.+?)\s*(\d+(?:\.\d+)?)\s*$")
+_NUMERIC_CELL_RE = re.compile(r"[\d\.]+\s*$")
 
-    if len(rows) < 2:
-        return horses
+# HorseInfo text fields copied straight from their column, in decode order
+_TEXT_COLUMNS = (
+    "nombre",
+    "sexo",
+    "stud",
+    "entrenador",
+    "padre_madre",
+    "ultimas",
+    "edad",
+    "cuidado",
+)
 
-    header_row = rows[0]
-    header_cells = header_row.find_all(["th", "td"])
-    header_texts = [c.get_text(strip=True).lower() for c in header_cells]
 
-    col_map = {}
-    for i, h in enumerate(header_texts):
+def _map_header_columns(header: list[str]) -> dict[str, int]:
+    col_map: dict[str, int] = {}
+    for i, text in enumerate(header):
+        h = text.lower()
         if "ejemp" in h or "nro" in h:
-            col_map["num"] = i
+            col_map["numero"] = i
         elif "caballo" in h or "nombre" in h:
             col_map["nombre"] = i
         elif "sexo" in h:
             col_map["sexo"] = i
         elif "kg" in h and "peso" not in col_map:
-            if "jockey" not in h.lower():
+            if "jockey" not in h:
                 col_map["peso"] = i
         elif "stud" in h:
             col_map["stud"] = i
@@ -262,121 +464,102 @@ def parse_horses_from_table(rows) -> list[HorseInfo]:
         elif "entrenador" in h:
             col_map["entrenador"] = i
         elif "padre" in h or "madre" in h:
-            col_map["padre"] = i
+            col_map["padre_madre"] = i
         elif "últimas" in h or "ultimas" in h:
             col_map["ultimas"] = i
         elif "edad" in h:
             col_map["edad"] = i
         elif "cuida" in h:
             col_map["cuidado"] = i
-
-    for row in rows[1:]:
-        cells = row.find_all(["td", "th"])
-        if len(cells) < 3:
-            continue
-
-        def get_text(c):
-            return c.get_text(strip=True)
+    return col_map
+
+
+class HorseRowDecoder:
+    """
+    Turns the rows of one horses table into HorseInfo.
+
+    The header is mapped to column indexes once per table, so decoding a row
+    is plain indexing plus the module-level compiled patterns.
+    """
+
+    def __init__(self, header: list[str]) -> None:
+        col_map = _map_header_columns(header)
+        # Rows are padded with blanks so short rows read "" past their last cell,
+        # and missing columns point at the final padding blank (index -1)
+        width = max(col_map.values(), default=-1) + 1
+        self._padding = [""] * (width + 1)
+        self.numero = col_map.get("numero", sys.maxsize)
+        self.peso = col_map.get("peso", sys.maxsize)
+        self.jockey = col_map.get("jockey", sys.maxsize)
+        self._texts = itemgetter(*(col_map.get(name, -1) for name in _TEXT_COLUMNS))
+        # Without a Kg column the jockey weight is the last numeric cell
+        self.scan_numeric_cells = "peso" not in col_map
+
+    def decode(self, cells: list[str]) -> HorseInfo | None:
+        n = len(cells)
+        if n < 3:
+            return None
 
         numero = ""
-        if "num" in col_map and col_map["num"] < len(cells):
-            numero = get_text(cells[col_map["num"]])
+        if self.numero < n:
+            numero = cells[self.numero]
             if not numero.isdigit():
-                continue
-
-        nombre = (
-            get_text(cells[col_map["nombre"]])
-            if "nombre" in col_map and col_map["nombre"] < len(cells)
-            else ""
-        )
-
-        sexo = (
-            get_text(cells[col_map["sexo"]])
-            if "sexo" in col_map and col_map["sexo"] < len(cells)
-            else ""
-        )
+                return None
 
         peso = 0.0
-        if "peso" in col_map and col_map["peso"] < len(cells):
-            peso_text = get_text(cells[col_map["peso"]])
-            peso_match = re.search(r"([\d\.]+)", peso_text)
+        if self.peso < n:
+            peso_match = _PESO_RE.search(cells[self.peso])
             if peso_match:
                 peso = float(peso_match.group(1))
 
-        stud = (
-            get_text(cells[col_map["stud"]])
-            if "stud" in col_map and col_map["stud"] < len(cells)
-            else ""
-        )
-
         jockey = ""
         peso_jockey = 0.0
-        if "jockey" in col_map and col_map["jockey"] < len(cells):
-            jtext = get_text(cells[col_map["jockey"]])
-            jmatch = re.match(r"(.+?)\s*([\d\.]+)\s*$", jtext)
+        if self.jockey < n:
+            jtext = cells[self.jockey]
+            jmatch = _JOCKEY_PESO_RE.match(jtext)
             if jmatch:
                 jockey = jmatch.group(1).strip()
                 peso_jockey = float(jmatch.group(2))
             else:
                 jockey = jtext
 
-        if "peso" not in col_map:
-            for c in cells:
-                ctext = get_text(c)
-                if re.match(r"[\d\.]+\s*$", ctext):
-                    try:
+        if self.scan_numeric_cells:
+            for ctext in cells:
+                if _NUMERIC_CELL_RE.match(ctext):
+                    with suppress(ValueError):
                         peso_jockey = float(ctext)
-                    except:
-                        pass
 
-        entrenador = (
-            get_text(cells[col_map["entrenador"]])
-            if "entrenador" in col_map and col_map["entrenador"] < len(cells)
-            else ""
+        nombre, sexo, stud, entrenador, padre_madre, ultimas, edad, cuidado = (
+            self._texts(cells + self._padding)
         )
-
-        padre_madre = (
-            get_text(cells[col_map["padre"]])
-            if "padre" in col_map and col_map["padre"] < len(cells)
-            else ""
-        )
-
-        ultimas = (
-            get_text(cells[col_map["ultimas"]])
-            if "ultimas" in col_map and col_map["ultimas"] < len(cells)
-            else ""
-        )
-
-        edad = (
-            get_text(cells[col_map["edad"]])
-            if "edad" in col_map and col_map["edad"] < len(cells)
-            else ""
+        return HorseInfo(
+            numero=numero,
+            nombre=nombre,
+            sexo=sexo,
+            peso=peso,
+            herraje="",
+            stud=stud,
+            jockey=jockey,
+            peso_jockey=peso_jockey,
+            entrenador=entrenador,
+            padre_madre=padre_madre,
+            ultimas=ultimas,
+            edad=edad,
+            cuidado=cuidado,
         )
 
-        cuidado = (
-            get_text(cells[col_map["cuidado"]])
-            if "cuidado" in col_map and col_map["cuidado"] < len(cells)
-            else ""
-        )
 
-        horses.append(
-            HorseInfo(
-                numero=numero,
-                nombre=nombre,
-                sexo=sexo,
-                peso=peso,
-                herraje="",
-                stud=stud,
-                jockey=jockey,
-                peso_jockey=peso_jockey,
-                entrenador=entrenador,
-                padre_madre=padre_madre,
-                ultimas=ultimas,
-                edad=edad,
-                cuidado=cuidado,
-            )
-        )
+def parse_horses_from_table(rows: list[list[str]]) -> list[HorseInfo]:
+    """Build the horses of a race from its table rows, given as cell texts."""
+    if len(rows) < 2:
+        return []
 
+    decoder = HorseRowDecoder(rows[0])
+    horses = []
+    for cells in rows[1:]:
+        horse = decoder.decode(cells)
+        if horse is not None:
+            horses.append(horse)
     return horses
 
 
@@ -396,11 +579,130 @@ class PdfLinks:
     depurados: Optional[str]
 
 
+@dataclass
+class ProgramPage:
+    html: str
+    etag: str | None
+    last_modified: str | None
+    fetched_at: float
+
+    @cached_property
+    def soup(self) -> BeautifulSoup:
+        return BeautifulSoup(self.html, "html.parser")
+
+    @cached_property
+    def links(self) -> PdfLinks:
+        return _parse_pdf_links(self.soup)
+
+
+class ProgramPageCache:
+    """
+    Program pages by calendario_id, reused for `ttl` seconds.
+
+    Once an entry expires it is revalidated with a conditional GET (ETag /
+    Last-Modified), so an unchanged page costs a 304 instead of a download and
+    a new parse. The least recently used pages are dropped past `max_entries`.
+    """
+
+    def __init__(
+        self, ttl: float = PROGRAM_PAGE_TTL, max_entries: int = PROGRAM_PAGE_MAX_ENTRIES
+    ) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, ProgramPage] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, calendario_id: str) -> ProgramPage | None:
+        with self._lock:
+            entry = self._entries.get(calendario_id)
+            if entry is not None:
+                self._entries.move_to_end(calendario_id)
+            return entry
+
+    def is_fresh(self, entry: ProgramPage) -> bool:
+        return time.monotonic() - entry.fetched_at < self.ttl
+
+    @staticmethod
+    def conditional_headers(entry: ProgramPage | None) -> dict[str, str]:
+        headers = {}
+        if entry is not None and entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry is not None and entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def store(
+        self,
+        calendario_id: str,
+        entry: ProgramPage | None,
+        response: requests.Response | httpx.Response,
+    ) -> ProgramPage:
+        """Save a program page response, or refresh `entry` if it was a 304."""
+        if entry is not None and response.status_code == 304:
+            entry.fetched_at = time.monotonic()
+            return entry
+
+        response.raise_for_status()
+        entry = ProgramPage(
+            html=response.text,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+            fetched_at=time.monotonic(),
+        )
+        with self._lock:
+            self._entries[calendario_id] = entry
+            self._entries.move_to_end(calendario_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+program_pages = ProgramPageCache()
+
+
+def get_program_page(calendario_id: str) -> ProgramPage:
+    entry = program_pages.get(calendario_id)
+    if entry is not None and program_pages.is_fresh(entry):
+        return entry
+
+    response = get_http_session().get(
+        f"{PROGRAM_API_URL}{calendario_id}",
+        headers=program_pages.conditional_headers(entry),
+        timeout=REQUEST_TIMEOUT,
+    )
+    return program_pages.store(calendario_id, entry, response)
+
+
+async def get_program_page_async(
+    calendario_id: str, client: httpx.AsyncClient
+) -> ProgramPage:
+    entry = program_pages.get(calendario_id)
+    if entry is not None and program_pages.is_fresh(entry):
+        return entry
+
+    response = await client.get(
+        f"{PROGRAM_API_URL}{calendario_id}",
+        headers=program_pages.conditional_headers(entry),
+    )
+    return program_pages.store(calendario_id, entry, response)
+
+
 def get_pdf_links(calendario_id: str) -> PdfLinks:
     """Extract PDF download links from a program page."""
-    url = f"{PROGRAM_API_URL}{calendario_id}"
-    soup = fetch_page(url)
+    return get_program_page(calendario_id).links
+
 
+async def get_pdf_links_async(
+    calendario_id: str, client: httpx.AsyncClient
+) -> PdfLinks:
+    return (await get_program_page_async(calendario_id, client)).links
+
+
+def _parse_pdf_links(soup: BeautifulSoup) -> PdfLinks:
     programa_oficial = None
     inscriptos = None
     depurados = None
@@ -426,9 +728,23 @@ def get_pdf_links(calendario_id: str) -> PdfLinks:
 
 def download_pdf(pdf_url: str) -> bytes:
     """Download a PDF from a URL and return its content."""
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-    }
-    response = requests.get(pdf_url, headers=headers, timeout=30)
+    response = get_http_session().get(pdf_url, timeout=REQUEST_TIMEOUT)
+    response.raise_for_status()
+    return response.content
+
+
+def fetch_pdf(pdf_url: str, known: PdfValidators | None) -> RemotePdf:
+    """Download a PDF unless it still matches the validators of a previous import."""
+    return _fetch_pdf(get_http_session().get, pdf_url, known, timeout=REQUEST_TIMEOUT)
+
+
+async def download_pdf_async(pdf_url: str, client: httpx.AsyncClient) -> bytes:
+    response = await client.get(pdf_url)
     response.raise_for_status()
     return response.content
+
+
+async def fetch_pdf_async(
+    pdf_url: str, known: PdfValidators | None, client: httpx.AsyncClient
+) -> RemotePdf:
+    return await _fetch_pdf_async(client, pdf_url, known)
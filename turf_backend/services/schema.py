@@ -0,0 +1,55 @@
+from sqlalchemy import Column, Engine, inspect
+from sqlmodel import SQLModel, text
+
+from turf_backend.services.search import install_search
+
+
+def create_missing_columns(engine: Engine) -> list[Column]:
+    """
+    create_all() does not alter existing tables, so nullable columns added to a
+    model later are added here. Returns the columns that were added.
+    """
+    inspector = inspect(engine)
+    added = []
+    with engine.begin() as connection:
+        for table in SQLModel.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {c["name"] for c in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing or not column.nullable:
+                    continue
+                column_type = column.type.compile(engine.dialect)
+                connection.execute(
+                    text(
+                        f"ALTER TABLE {table.name} "
+                        f"ADD COLUMN {column.name} {column_type}"
+                    )
+                )
+                added.append(column)
+    return added
+
+
+def create_missing_indexes(engine: Engine) -> None:
+    """
+    create_all() skips tables that already exist, so indexes added to a model
+    later are created here on existing databases.
+    """
+    for table in SQLModel.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(engine, checkfirst=True)
+
+
+def prepare_database(engine: Engine) -> None:
+    """
+    Bring the schema of `engine` up to date with the models: new tables,
+    columns and indexes, and the search setup.
+
+    Races stored before race_date existed keep it NULL: their fecha is the
+    day they were imported, not the race day, and a wrong race_date would
+    match them against the programs of unrelated meetings.
+    """
+    SQLModel.metadata.create_all(engine)
+    create_missing_columns(engine)
+    create_missing_indexes(engine)
+    install_search(engine)
@@ -0,0 +1,131 @@
+import logging
+import re
+import sqlite3
+import unicodedata
+import weakref
+
+from sqlalchemy import Engine, event, func, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlmodel import Session
+
+logger = logging.getLogger("turf")
+
+# Same default as pg_trgm.similarity_threshold, used by the % operator
+SIMILARITY_THRESHOLD = 0.3
+# Columns of the horses table with a trigram index on their folded text
+TRIGRAM_COLUMNS = ("nombre", "jockey")
+
+_WORD_RE = re.compile(r"[^\W_]+")
+
+# Engines where turf_fold() and similarity() can be called
+_search_engines: weakref.WeakSet[Engine] = weakref.WeakSet()
+
+_POSTGRES_SETUP = (
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE EXTENSION IF NOT EXISTS unaccent",
+    # unaccent() is only STABLE, so it is wrapped to be usable in an index
+    """
+    CREATE OR REPLACE FUNCTION turf_fold(text) RETURNS text AS $$
+        SELECT lower(public.unaccent('public.unaccent'::regdictionary, $1))
+    $$ LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+    """,
+    *(
+        f"CREATE INDEX IF NOT EXISTS ix_horses_{column}_trgm "
+        f"ON horses USING gin (turf_fold({column}) gin_trgm_ops)"
+        for column in TRIGRAM_COLUMNS
+    ),
+)
+
+
+def fold(value: str | None) -> str | None:
+    """Case-folded text without accents: "NIÑO Oscuro" -> "nino oscuro"."""
+    if value is None:
+        return None
+    decomposed = unicodedata.normalize("NFKD", value.lower())
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def trigrams(value: str) -> set[str]:
+    """Trigrams of every word, padded the way pg_trgm does."""
+    grams = set()
+    for word in _WORD_RE.findall(value.lower()):
+        padded = f"  {word} "
+        grams.update(padded[i : i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def trigram_similarity(a: str | None, b: str | None) -> float:
+    """Pure-Python equivalent of pg_trgm's similarity()."""
+    if a is None or b is None:
+        return 0.0
+    grams_a, grams_b = trigrams(a), trigrams(b)
+    if not grams_a or not grams_b:
+        return 0.0
+    shared = len(grams_a & grams_b)
+    return shared / (len(grams_a) + len(grams_b) - shared)
+
+
+def _register_sqlite_functions(dbapi_connection, _connection_record=None) -> None:
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        dbapi_connection.create_function("turf_fold", 1, fold, deterministic=True)
+        dbapi_connection.create_function(
+            "similarity", 2, trigram_similarity, deterministic=True
+        )
+
+
+def install_search(engine: Engine) -> bool:
+    """
+    Make turf_fold() and similarity() available on `engine`.
+
+    On PostgreSQL this installs pg_trgm and unaccent and indexes the folded
+    horse names and jockeys with trigram GIN indexes, which serve both
+    LIKE '%x%' and the % similarity operator. On SQLite both functions are
+    registered in Python on every connection. Returns False if the database
+    refused the setup, in which case searches fall back to ILIKE.
+    """
+    dialect = engine.dialect.name
+    if dialect == "sqlite":
+        event.listen(engine, "connect", _register_sqlite_functions)
+        # Connections already in the pool missed the listener
+        with engine.connect() as connection:
+            _register_sqlite_functions(connection.connection.dbapi_connection)
+    elif dialect == "postgresql":
+        try:
+            with engine.begin() as connection:
+                for statement in _POSTGRES_SETUP:
+                    connection.execute(text(statement))
+        except SQLAlchemyError as e:
+            logger.warning("Trigram search unavailable, using ILIKE: %s", e)
+            return False
+    else:
+        return False
+
+    _search_engines.add(engine)
+    return True
+
+
+def search_enabled(session: Session) -> bool:
+    return session.get_bind() in _search_engines
+
+
+def contains(session: Session, column, value: str):
+    """Accent and case insensitive substring filter on `column`."""
+    if not search_enabled(session):
+        return column.ilike(f"%{value}%")
+    pattern = re.sub(r"([\\%_])", r"\\\1", fold(value) or "")
+    return func.turf_fold(column).like(f"%{pattern}%", escape="\\")
+
+
+def similar(session: Session, column, value: str):
+    """
+    Filter and score for a fuzzy match of `value` against `column`.
+
+    Returns a (condition, score) pair. On PostgreSQL the condition is the %
+    operator, so the trigram index is used.
+    """
+    folded = func.turf_fold(column)
+    query = fold(value)
+    score = func.similarity(folded, query)
+    if session.get_bind().dialect.name == "postgresql":
+        return folded.op("%")(query), score
+    return score >= SIMILARITY_THRESHOLD, score
@@ -0,0 +1,126 @@
+import logging
+from datetime import date, datetime, timedelta
+
+from sqlmodel import Session, col, select
+
+from turf_backend.models.turf import SyncDay, SyncWatermark
+from turf_backend.utils.date import calendar_race_date
+
+logger = logging.getLogger("turf")
+
+# Statuses of a day that does not need to be imported again. Days that failed
+# ("error") or whose PDF is not published yet ("missing") are retried.
+DONE_STATUSES = ("imported", "skipped")
+
+CalendarDay = tuple[str, str]  # (YYYY-MM-DD, calendario_id)
+
+
+def get_watermark(session: Session, hipodromo: str) -> SyncWatermark | None:
+    return session.get(SyncWatermark, hipodromo)
+
+
+def resume_from(session: Session, hipodromo: str, start: date) -> date:
+    """
+    First day a sync starting at `start` still has to look at: the day after
+    the watermark when `start` falls inside the completed range.
+    """
+    mark = get_watermark(session, hipodromo)
+    if mark is not None and mark.since <= start <= mark.fecha:
+        return mark.fecha + timedelta(days=1)
+    return start
+
+
+def pending_days(
+    session: Session, hipodromo: str, days: list[CalendarDay]
+) -> list[CalendarDay]:
+    """The days not completed by a previous run, found before any download."""
+    done = set(
+        session.exec(
+            select(SyncDay.calendario_id).where(
+                SyncDay.hipodromo == hipodromo,
+                col(SyncDay.calendario_id).in_([cid for _, cid in days]),
+                col(SyncDay.status).in_(DONE_STATUSES),
+            )
+        ).all()
+    )
+    return [day for day in days if day[1] not in done]
+
+
+def record_day(
+    session: Session, hipodromo: str, calendario_id: str, result: dict
+) -> None:
+    """Checkpoint the result dict of importing one day."""
+    day = session.exec(
+        select(SyncDay).where(
+            SyncDay.hipodromo == hipodromo, SyncDay.calendario_id == calendario_id
+        )
+    ).first()
+    if day is None:
+        day = SyncDay(
+            hipodromo=hipodromo,
+            calendario_id=calendario_id,
+            fecha=calendar_race_date(result["fecha"]),
+            status=result["status"],
+        )
+    day.status = result["status"]
+    day.reason = result.get("reason")
+    day.attempts += 1
+    day.updated_at = datetime.now()
+    session.add(day)
+    session.commit()
+
+
+def advance_watermark(
+    session: Session, hipodromo: str, start: date, end: date, days: list[CalendarDay]
+) -> SyncWatermark | None:
+    """
+    Extend the watermark with a run over [start, end].
+
+    `days` are all the calendar days of the run, including those skipped as
+    already done. The run completed [start, last day done before the first
+    day still pending], never past today even when `end` is later: the days
+    after it may still get races or a PDF. That range is merged with the
+    stored one when they touch.
+    """
+    statuses = dict(
+        session.exec(
+            select(SyncDay.calendario_id, SyncDay.status).where(
+                SyncDay.hipodromo == hipodromo,
+                col(SyncDay.calendario_id).in_([cid for _, cid in days]),
+            )
+        ).all()
+    )
+    last_day = min(end, date.today())
+    done_until, last_id = None, None
+    for fecha, calendario_id in sorted(days):
+        day = calendar_race_date(fecha)
+        if statuses.get(calendario_id) not in DONE_STATUSES:
+            break
+        if day is None or day > last_day:
+            break
+        done_until, last_id = day, calendario_id
+
+    mark = get_watermark(session, hipodromo)
+    if done_until is None or done_until < start:
+        return mark
+
+    one_day = timedelta(days=1)
+    if mark is None:
+        mark = SyncWatermark(hipodromo=hipodromo, since=start, fecha=done_until)
+    elif start <= mark.fecha + one_day and done_until >= mark.since - one_day:
+        mark.since = min(mark.since, start)
+        if done_until <= mark.fecha:
+            last_id = mark.calendario_id
+        mark.fecha = max(mark.fecha, done_until)
+    elif done_until > mark.fecha:
+        # Disjoint and later: the newer range wins
+        mark.since, mark.fecha = start, done_until
+    else:
+        return mark
+
+    mark.calendario_id = last_id or mark.calendario_id
+    mark.updated_at = datetime.now()
+    session.add(mark)
+    session.commit()
+    logger.info("Sync watermark %s: %s -> %s", hipodromo, mark.since, mark.fecha)
+    return mark
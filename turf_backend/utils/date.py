@@ -1,7 +1,13 @@
 import re
-from io import BytesIO
+from datetime import date
 
-from pypdf import PdfReader
+from pdfplumber.utils.exceptions import PdfminerException
+from pypdfium2 import PdfiumError
+
+from turf_backend.services.pdf.backends import PdfSource, open_pdf
+
+# Format of Race.fecha
+RACE_DATE_FORMAT = "%d/%m/%Y"
 
 month_mapping = {
     "Enero": "01",
@@ -19,11 +25,10 @@ month_mapping = {
 }
 
 
-def extract_date(pdf_content: bytes) -> str:  # pylint: disable=too-many-locals
-    pdf_file = BytesIO(pdf_content)
-    reader = PdfReader(pdf_file)
-
-    text = reader.pages[0].extract_text()
+def extract_date(pdf_content: PdfSource) -> str:  # pylint: disable=too-many-locals
+    # Only the first page is read, with PDF_BACKEND like the program's pages
+    with open_pdf(pdf_content) as pdf:
+        text = pdf.text(0)
 
     pattern = r"REUNION Nº\s*\d+\s*(?:◇\s*)?(.+?)\s*\."
     match = re.search(pattern, text)
@@ -63,3 +68,19 @@ def convert_to_date(date_str: str) -> str:
         return f"{year}-{month}-{day.zfill(2)}"
     msg_error = "Invalid date format"
     raise ValueError(msg_error)
+
+
+def calendar_race_date(fecha: str) -> date | None:
+    """Date of a calendar event's YYYY-MM-DD fecha, or None if it is not one."""
+    try:
+        return date.fromisoformat(fecha[:10])
+    except ValueError:
+        return None
+
+
+def program_race_date(pdf: PdfSource) -> date | None:
+    """Race day printed on a program PDF (path or content), or None if not found."""
+    try:
+        return date.fromisoformat(extract_date(pdf))
+    except (ValueError, IndexError, PdfiumError, PdfminerException):
+        return None
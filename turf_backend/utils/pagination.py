@@ -0,0 +1,79 @@
+import base64
+import binascii
+import json
+import threading
+import time
+from typing import Any
+
+from sqlalchemy import func
+from sqlmodel import Session, SQLModel, select, text
+
+# Seconds a table count is reused before counting again
+COUNT_CACHE_TTL = 60
+
+
+def encode_cursor(*values: Any) -> str:
+    """Opaque token for the sort key of the last row of a page."""
+    raw = json.dumps(values, default=str, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str, size: int) -> list[Any]:
+    """Values packed by encode_cursor. Raises ValueError on a malformed token."""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        values = json.loads(raw)
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError) as e:
+        msg_error = "Invalid cursor"
+        raise ValueError(msg_error) from e
+    if not isinstance(values, list) or len(values) != size:
+        msg_error = "Invalid cursor"
+        raise ValueError(msg_error)
+    return values
+
+
+class TableCounter:
+    """
+    Row counts per table, reused for `ttl` seconds.
+
+    On PostgreSQL `estimate=True` reads the planner's row estimate from
+    pg_class instead of scanning the table; elsewhere it falls back to an
+    exact count(*).
+    """
+
+    def __init__(self, ttl: float = COUNT_CACHE_TTL) -> None:
+        self.ttl = ttl
+        self._counts: dict[tuple[str, bool], tuple[int, float]] = {}
+        self._lock = threading.Lock()
+
+    def count(
+        self, session: Session, model: type[SQLModel], *, estimate: bool = False
+    ) -> int:
+        key = (model.__tablename__, estimate)  # type: ignore[attr-defined]
+        now = time.monotonic()
+        with self._lock:
+            cached = self._counts.get(key)
+        if cached is not None and now - cached[1] < self.ttl:
+            return cached[0]
+
+        total = None
+        if estimate and session.get_bind().dialect.name == "postgresql":
+            total = session.exec(
+                text("SELECT reltuples::bigint FROM pg_class WHERE relname = :name"),
+                params={"name": key[0]},
+            ).first()
+            # reltuples is -1 until the table is first analyzed
+            total = total[0] if total is not None and total[0] >= 0 else None
+        if total is None:
+            total = session.exec(select(func.count()).select_from(model)).one()
+
+        with self._lock:
+            self._counts[key] = (total, now)
+        return total
+
+    def clear(self) -> None:
+        with self._lock:
+            self._counts.clear()
+
+
+table_counter = TableCounter()